@@ -0,0 +1,133 @@
+import json
+import re
+from .schema import coerce_like, order_key
+
+AGGREGATE_PATTERN = re.compile(r'\s*(COUNT|SUM|AVG|MIN|MAX)\s*\(\s*(\*|[^\s()*]+)\s*\)\s*(?:,|$)', re.IGNORECASE)
+
+
+def parse_aggregates(text):
+    """Parse "COUNT(*), AVG(salary)" into [("COUNT", "*"), ("AVG", "salary")]."""
+    aggregates, pos = [], 0
+    text = text.strip()
+    while pos < len(text):
+        match = AGGREGATE_PATTERN.match(text, pos)
+        if not match:
+            raise SyntaxError(f"Invalid aggregate near: {text[pos:]!r}")
+        func, field = match.group(1).upper(), match.group(2)
+        if field == "*" and func != "COUNT":
+            raise SyntaxError(f"{func}(*) is not supported; name a field.")
+        aggregates.append((func, field))
+        pos = match.end()
+    if not aggregates:
+        raise SyntaxError("Expected at least one aggregate, e.g. COUNT(*)")
+    return aggregates
+
+
+def column_name(func, field):
+    return f"{func}({field})"
+
+
+def _number(value):
+    # Numbers count as they are; text from before values were typed counts if it parses
+    if value.__class__ in (int, float):
+        return value
+    if isinstance(value, str):
+        return coerce_like(value, 0)
+    return None
+
+
+def _group_value(value):
+    # Lists and dicts can't be dict keys; group them by their JSON text
+    return json.dumps(value, sort_keys=True) if isinstance(value, (list, dict)) else value
+
+
+class Count:
+    def __init__(self, field):
+        self.field = field
+        self.count = 0
+
+    def add(self, attributes):
+        if self.field == "*" or attributes.get(self.field) is not None:
+            self.count += 1
+
+    def result(self):
+        return self.count
+
+
+class Sum:
+    def __init__(self, field):
+        self.field = field
+        self.total = 0
+        self.count = 0
+
+    def add(self, attributes):
+        value = _number(attributes.get(self.field))
+        if value is not None:
+            self.total += value
+            self.count += 1
+
+    def result(self):
+        return self.total if self.count else None
+
+
+class Avg(Sum):
+    def result(self):
+        return self.total / self.count if self.count else None
+
+
+class Min:
+    """Smallest present value, in the same cross-type order results are sorted in."""
+
+    def __init__(self, field):
+        self.field = field
+        self.best = None
+
+    def better(self, value):
+        return order_key(value) < order_key(self.best)
+
+    def add(self, attributes):
+        value = attributes.get(self.field)
+        if value is not None and (self.best is None or self.better(value)):
+            self.best = value
+
+    def result(self):
+        return self.best
+
+
+class Max(Min):
+    def better(self, value):
+        return order_key(value) > order_key(self.best)
+
+
+ACCUMULATORS = {"COUNT": Count, "SUM": Sum, "AVG": Avg, "MIN": Min, "MAX": Max}
+
+
+class GroupTable:
+    """
+    Hash-based grouping: one set of accumulators per distinct combination of
+    the GROUP BY fields, fed straight from each record's attributes.
+    """
+
+    def __init__(self, group_by, aggregates):
+        self.group_by = list(group_by)
+        self.aggregates = list(aggregates)
+        self.groups = {}
+
+    def add(self, attributes):
+        key = tuple(_group_value(attributes.get(field)) for field in self.group_by)
+        accumulators = self.groups.get(key)
+        if accumulators is None:
+            accumulators = [ACCUMULATORS[func](field) for func, field in self.aggregates]
+            self.groups[key] = accumulators
+        for accumulator in accumulators:
+            accumulator.add(attributes)
+
+    def rows(self):
+        if not self.groups and not self.group_by:
+            # An ungrouped aggregate over no records still has one row (COUNT 0)
+            self.groups[()] = [ACCUMULATORS[func](field) for func, field in self.aggregates]
+        for key, accumulators in self.groups.items():
+            row = dict(zip(self.group_by, key))
+            for (func, field), accumulator in zip(self.aggregates, accumulators):
+                row[column_name(func, field)] = accumulator.result()
+            yield row
@@ -0,0 +1,307 @@
+"""
+Clients for Backend.server. Every call returns what process_query would
+have returned in-process (the {"message": ..., "records": [...]} dicts for
+most statements) and raises what it would have raised: SyntaxError,
+ValueError, DeadlockError, and so on.
+
+    pool = ConnectionPool(size=8, database="University")
+    pool.query("SHOW Student RECORDS WHERE age>20")
+    with pool.connection() as conn:            # A transaction stays on one connection
+        conn.pipeline(["BEGIN", "UPDATE Student SET age=21 WHERE ID=...", "COMMIT"])
+
+    conn = await AsyncConnection.connect(database="University")
+    await asyncio.gather(*(conn.query(f"SHOW Student RECORDS WHERE ID={i}") for i in ids))
+
+Each connection is one server session, so USE DATABASE and transactions
+carry over from one call on it to the next.
+"""
+import asyncio
+import builtins
+import itertools
+import queue
+import socket
+import threading
+from contextlib import contextmanager
+from .locking import DeadlockError
+from .protocol import DEFAULT_PORT, ProtocolError, encode, read_message, recv_message
+
+# Error types the server reports that aren't builtins
+ERRORS = {"DeadlockError": DeadlockError, "ProtocolError": ProtocolError}
+
+
+class ServerError(Exception):
+    """An error raised on the server whose type has no counterpart here."""
+
+
+def _unwrap(response):
+    error = response.get("error")
+    if error is None:
+        return response.get("result")
+    name, message = error.get("type", ""), error.get("message", "")
+    cls = ERRORS.get(name) or getattr(builtins, name, None)
+    if not (isinstance(cls, type) and issubclass(cls, Exception)):
+        raise ServerError(f"{name}: {message}")
+    raise cls(message)
+
+
+def _results(responses, raise_errors):
+    """Results of several statements. An error stands in its statement's place, or, with raise_errors, the first one is raised."""
+    results = []
+    for response in responses:
+        try:
+            results.append(_unwrap(response))
+        except Exception as e:
+            if raise_errors:
+                raise
+            results.append(e)
+    return results
+
+
+def _batch_responses(response):
+    if "results" not in response:
+        _unwrap(response)  # A batch the server refused as a whole
+        raise ProtocolError("Batch response without results.")
+    return response["results"]
+
+
+def _transaction_state(statements, in_transaction):
+    """Whether a session is inside a transaction after these statements."""
+    for statement in statements:
+        command = statement.split(None, 1)[0].lower() if statement.strip() else ""
+        if command == "begin":
+            in_transaction = True
+        elif command in ("commit", "rollback"):
+            in_transaction = False
+    return in_transaction
+
+
+class Connection:
+    """
+    A blocking connection, i.e. one server session. Not to be shared between
+    threads; take one from a ConnectionPool per thread instead.
+    """
+
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT, socket_path=None, timeout=None, database=None):
+        if socket_path:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.settimeout(timeout)
+            self.sock.connect(socket_path)
+        else:
+            self.sock = socket.create_connection((host, port), timeout)
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)  # Small requests shouldn't wait on Nagle
+        self.file = self.sock.makefile("rb")
+        self.ids = itertools.count()
+        self.in_transaction = False
+        self.broken = False  # Set when an I/O error leaves the stream in an unknown state
+        if database:
+            self.query(f"USE DATABASE {database}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def query(self, statement):
+        """Run one statement and return its result."""
+        return _unwrap(self._round_trip([{"id": next(self.ids), "query": statement}], [statement])[0])
+
+    def pipeline(self, statements, raise_errors=True):
+        """
+        Send every statement as its own request before reading any reply,
+        so they cost one round trip between them; the server runs them in
+        order. Returns their results in order.
+        """
+        requests = [{"id": next(self.ids), "query": statement} for statement in statements]
+        return _results(self._round_trip(requests, statements), raise_errors)
+
+    def execute_many(self, statements, raise_errors=True):
+        """Send the statements as one batch request; one frame each way instead of one per statement."""
+        statements = list(statements)
+        response = self._round_trip([{"id": next(self.ids), "queries": statements}], statements)[0]
+        return _results(_batch_responses(response), raise_errors)
+
+    def _round_trip(self, requests, statements):
+        if self.broken:
+            raise ConnectionError("Connection is broken; open a new one.")
+        try:
+            self.sock.sendall(b"".join(encode(request) for request in requests))
+            self.in_transaction = _transaction_state(statements, self.in_transaction)
+            responses = []
+            for request in requests:
+                response = recv_message(self.file)
+                if response is None:
+                    raise ConnectionError("Server closed the connection.")
+                if response.get("id") != request["id"]:
+                    self.broken = True
+                    _unwrap(response)  # The server's report of what went wrong, if it sent one
+                    raise ProtocolError(f"Reply to request {response.get('id')} arrived for request {request['id']}.")
+                responses.append(response)
+            return responses
+        except (OSError, ProtocolError):
+            self.broken = True
+            raise
+
+    def close(self):
+        self.broken = True
+        self.file.close()
+        self.sock.close()
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of up to `size` Connections, opened as needed with the
+    given connection arguments. A connection given back inside a transaction
+    is rolled back first; one that failed is closed instead.
+    """
+
+    def __init__(self, size=8, checkout_timeout=None, **connect):
+        self.size = size
+        self.checkout_timeout = checkout_timeout  # Seconds to wait for a free connection; None waits forever
+        self.connect = connect
+        self.idle = queue.LifoQueue()  # Most recently used first: its socket is warmest
+        self.slots = threading.BoundedSemaphore(size)
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @contextmanager
+    def connection(self):
+        if self.closed:
+            raise ConnectionError("Pool is closed.")
+        if not self.slots.acquire(timeout=self.checkout_timeout):
+            raise TimeoutError(f"No connection free after {self.checkout_timeout:g}s.")
+        try:
+            try:
+                conn = self.idle.get_nowait()
+            except queue.Empty:
+                conn = Connection(**self.connect)
+            try:
+                yield conn
+            finally:
+                self._give_back(conn)
+        finally:
+            self.slots.release()
+
+    def _give_back(self, conn):
+        if conn.in_transaction and not conn.broken:
+            try:
+                conn.query("ROLLBACK")
+            except Exception:
+                conn.broken = True
+        if conn.broken or self.closed:
+            conn.close()
+        else:
+            self.idle.put(conn)
+
+    def query(self, statement):
+        with self.connection() as conn:
+            return conn.query(statement)
+
+    def pipeline(self, statements, raise_errors=True):
+        with self.connection() as conn:
+            return conn.pipeline(statements, raise_errors)
+
+    def execute_many(self, statements, raise_errors=True):
+        with self.connection() as conn:
+            return conn.execute_many(statements, raise_errors)
+
+    def close(self):
+        self.closed = True
+        while True:
+            try:
+                self.idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+class AsyncConnection:
+    """
+    A connection (one server session) for asyncio code. Any number of tasks
+    may query through it at once: each request goes out as soon as it is
+    made and its reply is matched back by id, so many are in flight on one
+    socket. The server still runs them one after another, in the order sent.
+    """
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.ids = itertools.count()
+        self.pending = {}  # Request id -> Future for its response
+        self.receiver = asyncio.get_running_loop().create_task(self._receive())
+
+    @classmethod
+    async def connect(cls, host="127.0.0.1", port=DEFAULT_PORT, socket_path=None, database=None):
+        if socket_path:
+            reader, writer = await asyncio.open_unix_connection(socket_path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        conn = cls(reader, writer)
+        if database:
+            await conn.query(f"USE DATABASE {database}")
+        return conn
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def query(self, statement):
+        return _unwrap(await self._send({"query": statement}))
+
+    async def pipeline(self, statements, raise_errors=True):
+        """Send every statement before awaiting any reply; results in order."""
+        futures = [self._request({"query": statement}) for statement in statements]
+        await self.writer.drain()
+        return _results(await asyncio.gather(*futures), raise_errors)
+
+    async def execute_many(self, statements, raise_errors=True):
+        response = await self._send({"queries": list(statements)})
+        return _results(_batch_responses(response), raise_errors)
+
+    def _request(self, body):
+        if self.receiver.done():
+            raise ConnectionError("Connection is closed.")
+        request_id = next(self.ids)
+        future = self.pending[request_id] = asyncio.get_running_loop().create_future()
+        self.writer.write(encode({"id": request_id, **body}))
+        return future
+
+    async def _send(self, body):
+        future = self._request(body)
+        await self.writer.drain()
+        return await future
+
+    async def _receive(self):
+        error = ConnectionError("Server closed the connection.")
+        try:
+            while True:
+                response = await read_message(self.reader)
+                if response is None:
+                    break
+                future = self.pending.pop(response.get("id"), None)
+                if future is None:
+                    _unwrap(response)  # An error about no request in particular ends the connection
+                    raise ProtocolError(f"Reply to unknown request {response.get('id')}.")
+                if not future.done():
+                    future.set_result(response)
+        except Exception as e:
+            error = e
+        finally:
+            for future in self.pending.values():
+                if not future.done():
+                    future.set_exception(error)
+            self.pending.clear()
+
+    async def close(self):
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except OSError:
+            pass
+        await self.receiver
@@ -1,349 +1,777 @@
-import json
-import os
-from .hashtable import HashTable
-from .object import Object
-from .indexing import BPlusTree
-import re
-
-
-class Collection:
-    def __init__(self, name, db_name):
-        self.name = name
-        self.db_name = db_name  # Database name
-        self.records = HashTable()  # Using custom hash table
-        self.collection_file = f"{db_name}/{name}.json"  # Path to the collection file
-        self.indexes = {}  # Dictionary to hold B+ Tree indexes for attributes
-        self.index_metadata_file = f"{db_name}/{name}_indexes.json"
-
-        if not os.path.exists(self.collection_file):
-            with open(self.collection_file, 'w') as file:
-                json.dump({}, file)
-        else:
-            self.load_from_file()
-        self.load_index_metadata()
-        self.load_indexes()
-    
-    
-    def load_index_metadata(self):
-        """Load index metadata that tells us which attributes have indexes."""
-        if os.path.exists(self.index_metadata_file):
-            with open(self.index_metadata_file, "r") as file:
-                indexed_attributes = json.load(file)
-            for attr in indexed_attributes:
-                index_file = f"{self.db_name}/{self.name}_{attr}_index.json"
-                bptree = BPlusTree(order=3, index_file=index_file)
-                bptree.load_index()
-                self.indexes[attr] = bptree
-
-    def load_indexes(self):
-        """
-        Load the B+ tree indexes for all attributes.
-        """
-        for attr, bptree in self.indexes.items():
-            bptree.load_index()
-
-    def load_from_file(self):
-        with open(self.collection_file, "r") as file:
-            data = json.load(file)
-            for obj_id, attrs in data.items():
-                obj = Object(**attrs)
-                self.records.insert(obj_id, obj)
-
-    def create_object(self, **attributes):
-        new_object = Object(**attributes)
-        self.records.insert(new_object.id, new_object)
-
-        for attr, bptree in self.indexes.items():
-            if attr in attributes:
-                bptree.insert(attributes[attr], new_object.id)
-
-        self.save_to_file()
-        message = f"Object created with ID: {new_object.id}"
-        return message, [{"ID": new_object.id, **new_object.attributes}]
-
-
-    def show_all(self):
-        all_records = []
-        for record_list in self.records.table:
-            for obj_id, obj in record_list:
-                all_records.append({"ID": obj_id, **obj.attributes})
-
-        if not all_records:
-            message = "No records in this collection."
-        else:
-            message = f"{len(all_records)} record(s) found."
-
-        return message, all_records
-                    
-    
-    def save_to_file(self):
-        data = {}
-        for record_list in self.records.table:
-            for obj_id, obj in record_list:
-                data[obj_id] = obj.attributes
-        with open(self.collection_file, "w") as file:
-            json.dump(data, file, indent=4)
-            
-            # Save indexes as well
-        for bptree in self.indexes.values():
-            bptree.save_index()  # Save each index after saving data
-        
-        # Save index metadata
-        with open(self.index_metadata_file, "w") as file:
-            json.dump(list(self.indexes.keys()), file)
-
-
-
-    def find_with_conditions(self, condition_str, selected_fields=None, sort_key=None, sort_order="asc", offset=0, limit=None):
-        matched = []
-        
-        if not condition_str.strip():
-            print("[Linear Search] No condition provided, returning all records.")
-            for record_list in self.records.table:
-                for obj_id, obj in record_list:
-                    matched.append((obj_id, obj))
-            return self._format_results(matched, selected_fields, sort_key, sort_order, offset, limit)
-        # Normalize the condition string
-        normalized = condition_str.replace(" and ", " AND ").replace(" or ", " OR ")
-
-        # Replace operators safely
-        normalized = normalized.replace("=", "==").replace("===", "==")  # Avoid triple equal
-        normalized = normalized.replace("<==", "<=").replace(">==", ">=")
-        normalized = re.sub(r"\bAND\b", "and", normalized)
-        normalized = re.sub(r"\bOR\b", "or", normalized)
-
-        # Replace conditions with obj.attributes.get(...)
-        condition_pattern = re.compile(r'(\w+)\s*(==|!=|>=|<=|>|<)\s*("[^"]*"|\d+|\w+@?\w*\.\w*)')
-        def repl(match):
-            field, op, val = match.groups()
-            val = val if val.startswith('"') else f'"{val}"'
-            return f'obj.attributes.get("{field}", "") {op} {val}'
-
-        try:
-            safe_condition = condition_pattern.sub(repl, normalized)
-        except Exception as e:
-            print(f"Failed to parse condition: {e}")
-            return []
-
-        # Try index-based optimization if it's a simple equality condition like: rollno == "5"
-        simple_match = re.fullmatch(r'obj\.attributes\.get\("(\w+)", ""\) == "([\w@.]*)"', safe_condition)
-        if simple_match:
-            field, value = simple_match.groups()
-            if field in self.indexes:
-                print(f"[Indexed Search] Using index for {field} = {value}")
-                doc_ids = self.indexes[field].search(value)
-                if doc_ids:
-                    for doc_id in doc_ids:
-                        for record_list in self.records.table:
-                            for obj_id, obj in record_list:
-                                if obj_id == doc_id:
-                                    matched.append((obj_id, obj))
-                else:
-                    print(f"[Index] No matching record found in index for {field} = {value}")
-
-                formatted_results = self._format_results(matched, selected_fields, sort_key, sort_order, offset, limit)
-                print("[Results Found]:")
-                for record in formatted_results:
-                    print(record)
-                return formatted_results
-
-        print("[Linear Search] Complex condition or no index, scanning all records.")
-        for record_list in self.records.table:
-            for obj_id, obj in record_list:
-                try:
-                    if eval(safe_condition, {}, {"obj": obj}):
-                        matched.append((obj_id, obj))
-                except Exception as e:
-                    print(f"Error in evaluating condition: {e}")
-
-        formatted_results=self._format_results(matched, selected_fields, sort_key, sort_order, offset, limit)
-        print("[Results Found]:")
-        for record in formatted_results:
-            print(record)
-        return formatted_results
-
-    def _format_results(self, matched, selected_fields, sort_key, sort_order, offset, limit):
-        # Sort if needed
-        if sort_key:
-            matched.sort(key=lambda item: item[1].attributes.get(sort_key, ""), reverse=(sort_order == "desc"))
-
-        # Offset and limit
-        matched = matched[offset:]
-        if limit is not None:
-            matched = matched[:limit]
-
-        # Format results
-        results = []
-        for obj_id, obj in matched:
-            if selected_fields:
-                output = {field: obj.attributes.get(field, '') for field in selected_fields}
-            else:
-                output = obj.attributes
-            results.append({"ID": obj_id, **output})
-
-        return results
-
-
-    def update(self, condition_dict, update_dict):
-        updated = False
-        updated_records = []
-
-        for record_list in self.records.table:
-            for obj_id, obj in record_list:
-                if all(obj.attributes.get(k) == v for k, v in condition_dict.items()):
-                    for uk, uv in update_dict.items():
-                        old_value = obj.attributes.get(uk)
-                        obj.attributes[uk] = uv
-
-                        # Update index if applicable
-                        if uk in self.indexes:
-                            bptree = self.indexes[uk]
-
-                            try:
-                                bptree.remove(old_value, obj_id)  # Remove old value
-                            except Exception as e:
-                                print(f"[Warning] Failed to remove old index: {e}")
-
-                            try:
-                                bptree.insert(uv, obj_id)  # Insert new value
-                            except Exception as e:
-                                print(f"[Warning] Failed to insert new index: {e}")
-
-                    updated = True
-                    updated_records.append({"ID": obj_id, **obj.attributes})
-
-        if updated:
-            self.save_to_file()
-            message = "Records updated successfully."
-        else:
-            message = "No matching records found to update."
-
-        return message, updated_records
-
-
-
-    def delete(self, condition_dict): 
-        deleted = False
-        for record_list in self.records.table:
-            i = 0
-            while i < len(record_list):
-                obj_id, obj = record_list[i]
-                if all(obj.attributes.get(k) == v for k, v in condition_dict.items()):
-                    record_list.pop(i)
-                    # Remove from any indexes as well
-                    for attr, bptree in self.indexes.items():
-                        if attr in obj.attributes:
-                            bptree.remove(obj.attributes[attr], obj_id)
-                    deleted = True
-                else:
-                    i += 1
-        if deleted:
-            print("Records deleted successfully.")
-            self.save_to_file()
-        else:
-            print("No matching records found to delete.")
-
-
-
-    def sort_records_by(self, field, reverse=False):
-        all_objects = []
-        for record_list in self.records.table:
-            for obj_id, obj in record_list:
-                all_objects.append((obj_id, obj))
-
-        try:
-            sorted_objects = sorted(all_objects, key=lambda x: x[1].attributes.get(field, ""), reverse=reverse)
-            for obj_id, obj in sorted_objects:
-                print(f"ID: {obj_id}, {obj}")
-        except Exception as e:
-            print(f"Error while sorting: {e}")
-            
-    def create_index(self, attribute_name): 
-        """Create a B+ Tree index for a specific attribute."""
-        if attribute_name in self.indexes:
-            print(f"Index on '{attribute_name}' already exists.")
-            return
-
-        if not self.records.table:
-            raise ValueError("No records found in the collection to create an index.")
-
-        index_file = f"{self.db_name}/{self.name}_{attribute_name}_index.json"
-        index = BPlusTree(order=3, index_file=index_file)
-
-        inserted = 0
-        for record_list in self.records.table:
-            for record in record_list:
-                doc_id, document = record
-                attr_value = document.attributes.get(attribute_name)
-                if attr_value is not None:
-                    index.insert(attr_value, doc_id)
-                    inserted += 1
-
-        if inserted == 0:
-            print(f"Attribute '{attribute_name}' not found in any record. Index not created.")
-            return
-
-        self.indexes[attribute_name] = index
-
-        # Save index metadata
-        with open(self.index_metadata_file, "w") as file:
-            json.dump(list(self.indexes.keys()), file)
-
-        print(f"Index created on attribute '{attribute_name}'.")
-
-
-    def remove_index(self, attribute_name):
-        """
-        Remove the index for a specific attribute.
-        """
-        if attribute_name in self.indexes:
-            index_file = self.indexes[attribute_name].index_file
-            del self.indexes[attribute_name]
-
-            # Delete the index file from disk
-            if os.path.exists(index_file):
-                os.remove(index_file)
-
-            # Update the index metadata file
-            with open(self.index_metadata_file, "w") as file:
-                json.dump(list(self.indexes.keys()), file)
-
-            print(f"Index removed for attribute '{attribute_name}'.")
-        else:
-            print(f"No index exists on '{attribute_name}'.")
-
-            
-    def print_index(self, attribute):
-        if attribute in self.indexes:
-            bptree = self.indexes[attribute]
-            print(f"Index for {attribute}: {bptree}")
-        else:
-            print(f"No index found for {attribute}")
-            
-    def find(self, field, value):
-        found = False
-        # Check if the field has an index
-        if field in self.indexes:
-            print(f"Using index to search for {field} = {value}")
-            result = self.indexes[field].search(value)
-            if result:
-                print(f"Found by index: {result}")
-                found = True
-            else:
-                print(f"No records found where {field} = {value} using index.")
-        else:
-            # If no index, do a linear search
-            print(f"Using linear search for {field} = {value}")
-            for record_list in self.records.table:
-                for obj_id, obj in record_list:
-                    if str(obj.attributes.get(field)).lower() == value.lower():
-                        print(f"ID: {obj_id}, {obj}")
-                        found = True
-        if not found:
-            print(f"No records found where {field} = {value}")
-
-
-
-
-
-
+import json
+import os
+import time
+import uuid
+import weakref
+from .columnar import ColumnStore
+from .cursor import Cursor
+from .hashtable import HashTable
+from .object import Object
+from .indexing import BPlusTree, DEFAULT_ORDER
+from .locking import RWLock, WriteLock, exclusive, shared
+from .mvcc import CLOCK, SnapshotRows, SnapshotView
+from .planner import Planner
+from .predicate import Predicate, bind_schema, compile_condition
+from .schema import Schema
+
+
+class Collection:
+    # Auto-compact once the log holds more than max(COMPACT_MIN_ENTRIES, COMPACT_RATIO * live records) entries
+    COMPACT_MIN_ENTRIES = 1000
+    COMPACT_RATIO = 2
+    # Seconds between index flushes while a collection keeps being written; 0 flushes after
+    # every write statement. DBMS.flush() (run at exit) and COMPACT write them out regardless,
+    # and an index found behind the log on load is rebuilt from the records
+    INDEX_FLUSH_INTERVAL = 60
+    # Processes a large full scan may be split across; set for the whole DBMS by DBMS.set_parallel_workers()
+    PARALLEL_WORKERS = 1
+    # Rows run_plan() produces per hold of the collection's lock; writers get in between
+    RUN_CHUNK = 1024
+
+    def __init__(self, name, db_name):
+        self.name = name
+        self.db_name = db_name  # Database name
+        self.lock = RWLock(f"{db_name}.{name}")  # Shared by reading statements, exclusive to writing ones
+        self.write_lock = WriteLock(name)  # Owned by the transaction (or statement) writing the collection
+        self.records = HashTable()  # Using custom hash table
+        self.collection_file = f"{db_name}/{name}.json"  # Snapshot written by compaction
+        self.log_file = f"{db_name}/{name}.log"  # Append-only log of changes since the snapshot
+        self.log_entries = 0  # Number of entries currently in the log
+        self.lsn = 0  # Log sequence number: total entries ever applied, carried across compactions
+        self.indexes = {}  # Dictionary to hold B+ Tree indexes for attributes
+        self.last_index_flush = time.monotonic()
+        self.index_metadata_file = f"{db_name}/{name}_indexes.json"
+        self.schema_file = f"{db_name}/{name}_schema.json"  # Declared field types, if any
+        self.schema = Schema()
+        self.columns = ColumnStore(self.records)  # Columnar shadow for analytic queries, built on first use
+        self.undo = None  # {doc_id: version or None} before the open transaction wrote them; see TransactionManager
+        self.pending_log = None  # Log entries of the open transaction, written by commit_log()
+        # Multi-versioning (see mvcc.py): writers never change a record in place but install a new version
+        self.owner = None  # Token of the open transaction or write statement, on its uncommitted versions
+        self.uncommitted = []  # Versions written but not yet committed
+        self.versioned = set()  # doc_ids whose current version still links to older ones
+        self.graveyard = {}  # doc_id -> tombstone of a deleted record some snapshot may still read
+        self.last_commit = 0  # Commit sequence of the newest version here
+        self.walks = weakref.WeakSet()  # Snapshot plans' index walks and record scans, frozen before the next write
+
+        self.load_schema()
+        if not os.path.exists(self.collection_file):
+            with open(self.collection_file, 'w') as file:
+                json.dump({}, file)
+        else:
+            self.load_from_file()
+        self.replay_log()
+        self.load_index_metadata()
+        self.load_indexes()
+    
+    
+    def load_schema(self):
+        if os.path.exists(self.schema_file):
+            with open(self.schema_file, "r") as file:
+                self.schema = Schema(json.load(file))
+
+    @exclusive
+    def set_schema(self, schema):
+        """
+        Declare field types (merged into any existing declaration) and convert
+        the stored values of those fields. Nothing changes if a value can't be
+        converted.
+        """
+        if self.pending_log is not None:
+            raise ValueError(f"Collection '{self.name}' has uncommitted changes; COMMIT or ROLLBACK first.")
+        merged = Schema({**self.schema.types, **schema.types})
+        self._freeze_walks()
+        changed = []
+        for obj_id, obj in self.records.items():
+            converted = merged.coerce(obj.attributes)  # Raises ValueError before anything is modified
+            if converted != obj.attributes or any(type(converted[k]) is not type(v) for k, v in obj.attributes.items()):
+                changed.append((obj_id, obj, converted))
+
+        for obj_id, obj, converted in changed:
+            self.records.insert(obj_id, self._new_version(obj_id, converted, obj))
+            self.columns.put(obj_id, converted)
+        self.schema = merged
+        with open(self.schema_file, "w") as file:
+            json.dump(merged.types, file)
+
+        self._append_log([self._log_put(obj_id, self.records.get(obj_id)) for obj_id, _, _ in changed])
+        self.commit_versions()
+        for attr in schema.types:
+            if attr in self.indexes:
+                self._rebuild_index(attr, self.indexes[attr])
+        message = f"Schema of '{self.name}' is now {merged}; {len(changed)} record(s) converted."
+        print(message)
+        return message
+
+    def index_file(self, attribute_name):
+        return f"{self.db_name}/{self.name}_{attribute_name}_index.json"
+
+    def files(self):
+        """Paths of every file the collection may keep on disk, its indexes' included."""
+        return [self.collection_file, self.log_file, self.index_metadata_file, self.schema_file] + [bptree.index_file for bptree in self.indexes.values()]
+
+    def relocate(self, name, db_name):
+        """
+        Take a new name or database: every file path, the index files'
+        included, now points where the renamed files are. Moving the files
+        themselves is up to the caller.
+        """
+        self.name, self.db_name = name, db_name
+        self.collection_file = f"{db_name}/{name}.json"
+        self.log_file = f"{db_name}/{name}.log"
+        self.index_metadata_file = f"{db_name}/{name}_indexes.json"
+        self.schema_file = f"{db_name}/{name}_schema.json"
+        for attribute_name, bptree in self.indexes.items():
+            bptree.index_file = self.index_file(attribute_name)
+
+    def load_index_metadata(self):
+        """Load index metadata that tells us which attributes have indexes."""
+        if os.path.exists(self.index_metadata_file):
+            with open(self.index_metadata_file, "r") as file:
+                indexed_attributes = json.load(file)
+            for attr in indexed_attributes:
+                # The order is read back from the index file by load_indexes()
+                self.indexes[attr] = BPlusTree(index_file=self.index_file(attr))
+
+    def load_indexes(self):
+        """
+        Load the B+ tree indexes for all attributes. Index files are flushed
+        lazily, so one that is missing, unreadable or stamped with an older
+        LSN than the collection is rebuilt from the records instead.
+        """
+        for attr, bptree in self.indexes.items():
+            if not bptree.load_index() or (bptree.lsn is not None and bptree.lsn != self.lsn):
+                print(f"[Index] Index on '{attr}' is behind the collection log, rebuilding.")
+                self._rebuild_index(attr, bptree)
+
+    def _rebuild_index(self, attribute_name, bptree):
+        pairs = []
+        for doc_id, document in self.records.items():
+            attr_value = document.attributes.get(attribute_name)
+            if attr_value is not None:
+                pairs.append((attr_value, doc_id))
+        bptree.bulk_load(pairs)
+        bptree.save_index(self.lsn)
+
+    def load_from_file(self):
+        with open(self.collection_file, "r") as file:
+            data = json.load(file)
+            for obj_id, attrs in data.items():
+                obj = Object(**attrs)
+                self.records.insert(obj_id, obj)
+
+    def replay_log(self):
+        """
+        Apply the put/delete entries logged since the last snapshot. Entries a
+        transaction committed sit between "begin" and "commit" markers and are
+        applied together, only once the "commit" marker has been read.
+        """
+        if not os.path.exists(self.log_file):
+            return
+        with open(self.log_file, "rb") as file:
+            lines = file.readlines()
+        offset = 0
+        group, group_offset = None, 0  # Entries of a transaction whose commit marker hasn't been read yet
+        for line_no, line in enumerate(lines):
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                if line_no == len(lines) - 1:
+                    break  # A crash mid-append left a partial entry; cut off below
+                raise
+            if entry["op"] == "begin":
+                group, group_offset = [], offset
+            elif entry["op"] == "commit":
+                for grouped in group or []:
+                    self._replay_entry(grouped)
+                group = None
+            elif group is not None:
+                group.append(entry)
+            else:
+                self._replay_entry(entry)
+            offset += len(line)
+
+        if group is not None:
+            offset = group_offset  # The whole unfinished transaction goes, not just its last line
+        if offset < sum(map(len, lines)):
+            # Cut the torn tail off so new appends start clean
+            print(f"[Warning] Dropping torn entries at the end of {self.log_file}")
+            with open(self.log_file, "r+b") as file:
+                file.truncate(offset)
+
+    def _replay_entry(self, entry):
+        if entry["op"] == "base":
+            # Written by compaction: the LSN the snapshot was taken at
+            self.lsn = entry["lsn"]
+            return
+        if entry["op"] == "put":
+            self.records.insert(entry["id"], Object(**entry["doc"]))
+        elif entry["op"] == "del":
+            self.records.remove(entry["id"])
+        self.log_entries += 1
+        self.lsn += 1
+
+    def _append_log(self, entries, txn=None):
+        """
+        Append a batch of log entries in one write, compacting when the log
+        gets too long. Inside a transaction the entries are only buffered;
+        commit_log() writes them, framed by the transaction's id.
+        """
+        if not entries:
+            return
+        if self.pending_log is not None and txn is None:
+            self.pending_log.extend(entries)
+            return
+        lines = [json.dumps(entry) + "\n" for entry in entries]
+        if txn is not None:
+            lines = [json.dumps({"op": "begin", "txn": txn}) + "\n", *lines, json.dumps({"op": "commit", "txn": txn}) + "\n"]
+        with open(self.log_file, "a") as file:
+            file.write("".join(lines))
+            file.flush()
+            os.fsync(file.fileno())
+        self.log_entries += len(entries)
+        self.lsn += len(entries)
+        if self.log_entries > max(self.COMPACT_MIN_ENTRIES, self.COMPACT_RATIO * len(self.records)):
+            self.compact()
+
+    def _log_put(self, obj_id, obj):
+        return {"op": "put", "id": obj_id, "doc": obj.attributes}
+
+    def _log_delete(self, obj_id):
+        return {"op": "del", "id": obj_id}
+
+    @exclusive
+    def flush_indexes(self, force=False):
+        """
+        Write out dirty indexes, stamped with the current LSN. Unless forced,
+        this only happens once INDEX_FLUSH_INTERVAL seconds have passed.
+        Never during a transaction: the indexes may hold uncommitted changes.
+        """
+        if self.pending_log is not None:
+            return
+        now = time.monotonic()
+        if not force and now - self.last_index_flush < self.INDEX_FLUSH_INTERVAL:
+            return
+        for bptree in self.indexes.values():
+            bptree.flush(self.lsn)
+        self.last_index_flush = now
+
+    @exclusive
+    def compact(self):
+        """Rewrite the snapshot from memory and truncate the log."""
+        if self.pending_log is not None:
+            raise ValueError(f"Collection '{self.name}' has uncommitted changes; COMMIT or ROLLBACK first.")
+        self.save_to_file()
+        # The log restarts with a header carrying the LSN the snapshot covers
+        tmp_file = f"{self.log_file}.tmp"
+        with open(tmp_file, "w") as file:
+            file.write(json.dumps({"op": "base", "lsn": self.lsn}) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_file, self.log_file)
+        self.log_entries = 0
+        message = f"Collection '{self.name}' compacted ({len(self.records)} record(s))."
+        print(message)
+        return message
+
+    @exclusive
+    def create_object(self, **attributes):
+        attributes = self.schema.coerce(attributes)
+        self._freeze_walks()
+        new_object = self._new_object(attributes)
+        self._remember(new_object.id, None)
+        self.records.insert(new_object.id, new_object)
+        self.columns.put(new_object.id, new_object.attributes)
+
+        for attr, bptree in self.indexes.items():
+            if attr in attributes:
+                bptree.insert(attributes[attr], new_object.id)
+
+        self._append_log([self._log_put(new_object.id, new_object)])
+        self.commit_versions()
+        self.flush_indexes()
+        message = f"Object created with ID: {new_object.id}"
+        return message, [{"ID": new_object.id, **new_object.attributes}]
+
+
+    @exclusive
+    def insert_many(self, documents):
+        """
+        Insert a batch of documents: records go into memory, each index is
+        updated in one bulk step and the log is appended with a single write.
+        Every document is checked against the schema first, so one that
+        doesn't fit means none is inserted.
+        """
+        start = time.perf_counter()
+        documents = [self.schema.coerce(attributes) for attributes in documents]
+        self._freeze_walks()
+        log_entries = []
+        index_pairs = {attr: [] for attr in self.indexes}
+        for attributes in documents:
+            new_object = self._new_object(attributes)
+            self._remember(new_object.id, None)
+            self.records.insert(new_object.id, new_object)
+            self.columns.put(new_object.id, new_object.attributes)
+            log_entries.append(self._log_put(new_object.id, new_object))
+            for attr, pairs in index_pairs.items():
+                if attr in attributes:
+                    pairs.append((attributes[attr], new_object.id))
+
+        for attr, pairs in index_pairs.items():
+            if pairs:
+                self.indexes[attr].insert_many(pairs)
+        self._append_log(log_entries)
+        self.commit_versions()
+        self.flush_indexes()
+
+        elapsed = time.perf_counter() - start
+        inserted = len(log_entries)
+        rate = inserted / elapsed if elapsed > 0 else float(inserted)
+        message = f"{inserted} object(s) inserted in {elapsed:.3f}s ({rate:,.0f} docs/sec)."
+        print(message)
+        return message, [{"inserted": inserted, "seconds": round(elapsed, 6), "docs_per_sec": round(rate, 1)}]
+
+    @shared
+    def get_by_id(self, doc_id):
+        """Fetch a single record by its ID with one hash probe."""
+        return self.records.get(doc_id)
+
+    @shared
+    def get_many(self, doc_ids):
+        """Resolve IDs to (id, object) pairs, skipping duplicates and unknown IDs."""
+        matched = []
+        for doc_id in dict.fromkeys(doc_ids):
+            obj = self.records.get(doc_id)
+            if obj is not None:
+                matched.append((doc_id, obj))
+        return matched
+
+    def find_by_ids(self, doc_ids, selected_fields=None, sort_key=None, sort_order="asc", offset=0, limit=None):
+        with self.lock.read():
+            plan = Planner(self).plan_ids(doc_ids, selected_fields, sort_key, sort_order, offset, limit)
+        return self.run_plan(plan)
+
+    @shared
+    def show_all(self):
+        all_records = []
+        for obj_id, obj in self.records.items():
+            all_records.append({"ID": obj_id, **obj.attributes})
+
+        if not all_records:
+            message = "No records in this collection."
+        else:
+            message = f"{len(all_records)} record(s) found."
+
+        return message, all_records
+                    
+    
+    def save_to_file(self):
+        data = {}
+        for obj_id, obj in self.records.items():
+            data[obj_id] = obj.attributes
+        # Write to a temp file and swap it in so a crash never leaves a half-written snapshot
+        tmp_file = f"{self.collection_file}.tmp"
+        with open(tmp_file, "w") as file:
+            json.dump(data, file, indent=4)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_file, self.collection_file)
+
+        # Save indexes as well
+        for bptree in self.indexes.values():
+            bptree.save_index(self.lsn)  # Save each index after saving data
+        
+        # Save index metadata
+        with open(self.index_metadata_file, "w") as file:
+            json.dump(list(self.indexes.keys()), file)
+
+
+
+    def find_with_conditions(self, condition, selected_fields=None, sort_key=None, sort_order="asc", offset=0, limit=None):
+        """Find records matching a WHERE clause, given as text or as an already compiled Predicate."""
+        plan = self.plan_query(condition, selected_fields, sort_key, sort_order, offset, limit)
+        return self.run_plan(plan)
+
+    @shared
+    def plan_query(self, condition, selected_fields=None, sort_key=None, sort_order="asc", offset=0, limit=None):
+        """Build (but don't run) the cheapest plan for a SHOW ... RECORDS query."""
+        predicate = self._bind_schema(self._compile(condition))
+        return Planner(self).plan(predicate, selected_fields, sort_key, sort_order, offset, limit)
+
+    def aggregate(self, aggregates, group_by=None, condition="", owner=None):
+        """
+        Compute [(func, field), ...] aggregates over the records matching a
+        condition, one row per group of the group_by fields.
+        """
+        return self.run_plan(self.plan_aggregate(aggregates, group_by, condition), owner=owner)
+
+    @shared
+    def plan_aggregate(self, aggregates, group_by=None, condition=""):
+        return Planner(self).plan_aggregate(self._bind_schema(self._compile(condition)), list(group_by or []), list(aggregates))
+
+    def run_plan(self, plan, analyze=False, owner=None):
+        """
+        Execute a plan; with analyze=True every operator records its actual
+        rows and time. The rows are pulled RUN_CHUNK at a time through a
+        Cursor, so the lock is held for reading one chunk at a time rather
+        than for the whole scan.
+        """
+        cursor = Cursor(self.stream_plan(plan, analyze, owner), collection_name=self.name, lock=self.lock)
+        rows = []
+        try:
+            while not cursor.exhausted:
+                rows.extend(cursor.fetch(self.RUN_CHUNK))
+        finally:
+            cursor.close()
+        return rows
+
+    def stream_plan(self, plan, analyze=False, owner=None):
+        """
+        Start a plan and return an iterator that produces its rows on demand.
+        Every row comes from the snapshot taken here: versions committed
+        later, or not at all, are never seen (except those of the transaction
+        `owner`, the reader's own). Pull the rows with the collection's lock
+        held for reading, as Cursor.fetch() (and so run_plan()) does; between pulls
+        no lock is needed. The snapshot is released once the rows run out or
+        the iterator is closed.
+        """
+        snapshot = CLOCK.snapshot(owner)
+        return SnapshotRows(plan.execute(SnapshotView(self, snapshot), analyze), snapshot)
+
+    def cursor(self, condition="", selected_fields=None, sort_key=None, sort_order="asc", offset=0, limit=None, name=None, owner=None):
+        """Open a cursor over a query; rows are read from the collection's snapshot as they are fetched."""
+        plan = self.plan_query(condition, selected_fields, sort_key, sort_order, offset, limit)
+        return Cursor(self.stream_plan(plan, owner=owner), name, self.name, self.lock)
+
+    def _select(self, predicate):
+        """
+        Return (id, object) pairs matching a compiled predicate, via the
+        planner's chosen access path. Writers read the latest versions, not a
+        snapshot. Materialized, so callers may modify the collection while
+        walking the result.
+        """
+        plan = Planner(self).plan_access(self._bind_schema(predicate))
+        return list(plan.execute(self))
+
+    def _compile(self, condition):
+        """A Predicate from a WHERE clause, an already compiled Predicate or an equality dict."""
+        if isinstance(condition, Predicate):
+            return condition
+        if isinstance(condition, dict):
+            return Predicate.from_dict(condition)
+        # Parsed and compiled once per distinct condition, then applied as a plain closure
+        return compile_condition(condition)
+
+    def _bind_schema(self, predicate):
+        """Give the condition's literals the declared types of their fields."""
+        node = bind_schema(predicate.node, self.schema)
+        return predicate if node is predicate.node else Predicate(node)
+
+    @exclusive
+    def update(self, condition, update_dict):
+        """
+        Set the fields of update_dict on every record matching a condition (a
+        WHERE clause, a compiled Predicate or an equality {field: value} dict).
+        Matches come from the planner; each touched index is updated in one
+        batch and the changes are logged with a single append.
+        """
+        update_dict = self.schema.coerce(update_dict)
+        self._freeze_walks()
+        updated_records = []
+        log_entries = []
+        removed = {attr: [] for attr in update_dict if attr in self.indexes}
+        added = {attr: [] for attr in removed}
+
+        for obj_id, obj in self._select(self._compile(condition)):
+            self._remember(obj_id, obj)
+            for uk, uv in update_dict.items():
+                old_value = obj.attributes.get(uk)
+                if uk in removed and (old_value != uv or type(old_value) is not type(uv)):
+                    if old_value is not None:
+                        removed[uk].append((old_value, obj_id))
+                    if uv is not None:
+                        added[uk].append((uv, obj_id))
+            obj = self._new_version(obj_id, {**obj.attributes, **update_dict}, obj)
+            self.records.insert(obj_id, obj)
+            self.columns.put(obj_id, obj.attributes)
+            updated_records.append({"ID": obj_id, **obj.attributes})
+            log_entries.append(self._log_put(obj_id, obj))
+
+        if not updated_records:
+            return "No matching records found to update.", []
+        for attr, bptree in ((attr, self.indexes[attr]) for attr in removed):
+            bptree.remove_many(removed[attr])
+            bptree.insert_many(added[attr])
+        self._append_log(log_entries)
+        self.commit_versions()
+        self.flush_indexes()
+        message = f"{len(updated_records)} record(s) updated."
+        print(message)
+        return message, updated_records
+
+    @exclusive
+    def delete(self, condition):
+        """
+        Delete every record matching a condition (see update()), with one
+        batched removal per index and a single log append.
+        """
+        self._freeze_walks()
+        log_entries = []
+        removed = {attr: [] for attr in self.indexes}
+        # Matches are collected up front so removals (and any shrink) don't disturb the scan
+        for obj_id, obj in self._select(self._compile(condition)):
+            self._remember(obj_id, obj)
+            # Into the graveyard before out of the table, so a snapshot scan finds it in one or the other
+            self.graveyard[obj_id] = self._new_version(obj_id, obj.attributes, obj, deleted=True)
+            self.records.remove(obj_id)
+            self.columns.delete(obj_id)
+            for attr, pairs in removed.items():
+                if obj.attributes.get(attr) is not None:
+                    pairs.append((obj.attributes[attr], obj_id))
+            log_entries.append(self._log_delete(obj_id))
+
+        if not log_entries:
+            message = "No matching records found to delete."
+            print(message)
+            return message, [{"deleted": 0}]
+        for attr, pairs in removed.items():
+            self.indexes[attr].remove_many(pairs)
+        self._append_log(log_entries)
+        self.commit_versions()
+        self.flush_indexes()
+        message = f"{len(log_entries)} record(s) deleted."
+        print(message)
+        return message, [{"deleted": len(log_entries)}]
+
+    def _new_object(self, attributes):
+        return self._new_version(str(uuid.uuid4()), attributes, None)
+
+    def _new_version(self, obj_id, attributes, previous, deleted=False):
+        """
+        An uncommitted version of a record, owned by the open transaction or
+        else by the current write statement. Snapshots keep reading
+        `previous` until the version is stamped by stamp().
+        """
+        if self.owner is None:
+            self.owner = object()  # A statement outside any transaction; commit_versions() ends it
+        if previous is not None and previous.version is None and previous.owner is self.owner:
+            previous = previous.previous  # Nobody else can see our own earlier uncommitted version
+        version = Object.new_version(obj_id, attributes, previous, self.owner, deleted)
+        self.uncommitted.append(version)
+        if previous is not None:
+            self.versioned.add(obj_id)
+        return version
+
+    def _freeze_walks(self):
+        """Called before a write touches the records, indexes or columns; see mvcc.Walk and mvcc.SnapshotRecords."""
+        for walk in list(self.walks):
+            walk.freeze()
+        self.walks.clear()
+
+    def stamp(self, sequence):
+        """
+        Commit the uncommitted versions as of `sequence`. Call with the
+        collection's lock held for writing, then CLOCK.committing(), in that order.
+        """
+        for version in self.uncommitted:
+            version.version = sequence
+            del version.owner  # Back to the class default
+        self.uncommitted = []
+        self.owner = None
+        self.last_commit = sequence
+
+    def commit_versions(self):
+        """
+        End a write statement: outside a transaction its versions are
+        committed under a new sequence number (inside one they wait for
+        COMMIT), then the versions no snapshot needs any more are dropped.
+        """
+        if self.pending_log is not None:
+            return
+        if self.uncommitted:
+            with CLOCK.committing() as sequence:
+                self.stamp(sequence)
+        self.collect_versions()
+
+    def collect_versions(self):
+        """Unlink versions older than the oldest open snapshot reads, and forget tombstones every snapshot sees."""
+        oldest = CLOCK.oldest()
+        for doc_id in list(self.versioned):
+            head = version = self.records.get(doc_id)
+            while version is not None and (version.version is None or version.version > oldest):
+                version = version.previous
+            if version is not None:
+                version.previous = None
+            if head is None or head.previous is None:
+                self.versioned.discard(doc_id)
+        for doc_id, tombstone in list(self.graveyard.items()):
+            # A tombstone of a rolled back delete has neither a sequence number nor an owner
+            if tombstone.version is None and tombstone.owner is None or tombstone.version is not None and tombstone.version <= oldest:
+                del self.graveyard[doc_id]
+
+    def _remember(self, obj_id, obj):
+        """Keep a record's before-image the first time the open transaction changes it (obj None: it didn't exist)."""
+        if self.undo is not None and obj_id not in self.undo:
+            self.undo[obj_id] = obj  # Versions are never modified, so the object itself is the before-image
+
+    @exclusive
+    def begin_transaction(self, owner):
+        """Start keeping before-images and buffering log entries; see TransactionManager.enlist()."""
+        self.undo = {}
+        self.pending_log = []
+        self.owner = owner
+
+    @exclusive
+    def commit_log(self, txn):
+        """
+        Write the transaction's buffered entries as one framed, fsync'd append,
+        then its indexes. Its versions were stamped just before.
+        """
+        entries, self.pending_log, self.undo = self.pending_log, None, None
+        self._append_log(entries, txn)
+        self.collect_versions()
+        self.flush_indexes(force=True)
+
+    @exclusive
+    def rollback(self):
+        """
+        Put back the before-images of the open transaction, in memory and in
+        the indexes (one batch each). Nothing of it reached the disk, so the
+        buffered log entries are simply dropped, as are its uncommitted
+        versions. Returns the records restored.
+        """
+        undo, self.undo, self.pending_log = self.undo, None, None
+        self.uncommitted, self.owner = [], None
+        if not undo:
+            return 0
+        self._freeze_walks()
+        removed = {attr: [] for attr in self.indexes}
+        added = {attr: [] for attr in self.indexes}
+        for obj_id, before in undo.items():
+            current = self.records.get(obj_id)
+            if current is not None:
+                for attr, pairs in removed.items():
+                    if current.attributes.get(attr) is not None:
+                        pairs.append((current.attributes[attr], obj_id))
+            tombstone = self.graveyard.get(obj_id)
+            if tombstone is not None and tombstone.version is None:
+                tombstone.owner = None  # Never committed; snapshots read past it until it's collected
+            if before is None:
+                if current is not None:
+                    self.records.remove(obj_id)
+                    self.columns.delete(obj_id)
+                continue
+            self.records.insert(obj_id, before)
+            self.columns.put(obj_id, before.attributes)
+            for attr, pairs in added.items():
+                if before.attributes.get(attr) is not None:
+                    pairs.append((before.attributes[attr], obj_id))
+
+        for attr, bptree in self.indexes.items():
+            bptree.remove_many(removed[attr])
+            bptree.insert_many(added[attr])
+        self.collect_versions()
+        return len(undo)
+
+    @shared
+    def sort_records_by(self, field, reverse=False):
+        all_objects = list(self.records.items())
+
+        try:
+            sorted_objects = sorted(all_objects, key=lambda x: x[1].attributes.get(field, ""), reverse=reverse)
+            for obj_id, obj in sorted_objects:
+                print(f"ID: {obj_id}, {obj}")
+        except Exception as e:
+            print(f"Error while sorting: {e}")
+            
+    @exclusive
+    def create_index(self, attribute_name, order=DEFAULT_ORDER):
+        """Create a B+ Tree index for a specific attribute with the given fanout (max keys per node)."""
+        if attribute_name in self.indexes:
+            print(f"Index on '{attribute_name}' already exists.")
+            return
+
+        if not len(self.records):
+            raise ValueError("No records found in the collection to create an index.")
+
+        index = BPlusTree(order=order, index_file=self.index_file(attribute_name))
+
+        pairs = []
+        for doc_id, document in self.records.items():
+            attr_value = document.attributes.get(attribute_name)
+            if attr_value is not None:
+                pairs.append((attr_value, doc_id))
+
+        if not pairs:
+            print(f"Attribute '{attribute_name}' not found in any record. Index not created.")
+            return
+
+        # Sort once and build the tree bottom-up, then write it out a single time
+        index.bulk_load(pairs)
+        index.save_index(self.lsn)
+        self.indexes[attribute_name] = index
+
+        # Save index metadata
+        with open(self.index_metadata_file, "w") as file:
+            json.dump(list(self.indexes.keys()), file)
+
+        print(f"Index created on attribute '{attribute_name}'.")
+
+
+    @exclusive
+    def remove_index(self, attribute_name):
+        """
+        Remove the index for a specific attribute.
+        """
+        if attribute_name in self.indexes:
+            index_file = self.indexes[attribute_name].index_file
+            del self.indexes[attribute_name]
+
+            # Delete the index file from disk
+            if os.path.exists(index_file):
+                os.remove(index_file)
+
+            # Update the index metadata file
+            with open(self.index_metadata_file, "w") as file:
+                json.dump(list(self.indexes.keys()), file)
+
+            print(f"Index removed for attribute '{attribute_name}'.")
+        else:
+            print(f"No index exists on '{attribute_name}'.")
+
+            
+    @shared
+    def print_index(self, attribute):
+        if attribute in self.indexes:
+            bptree = self.indexes[attribute]
+            print(f"Index for {attribute}: {bptree}")
+        else:
+            print(f"No index found for {attribute}")
+            
+    @shared
+    def find(self, field, value):
+        found = False
+        # Check if the field has an index
+        if field in self.indexes:
+            print(f"Using index to search for {field} = {value}")
+            result = self.indexes[field].search(value)
+            if result:
+                print(f"Found by index: {result}")
+                found = True
+            else:
+                print(f"No records found where {field} = {value} using index.")
+        else:
+            # If no index, do a linear search
+            print(f"Using linear search for {field} = {value}")
+            for obj_id, obj in self.records.items():
+                if str(obj.attributes.get(field)).lower() == value.lower():
+                    print(f"ID: {obj_id}, {obj}")
+                    found = True
+        if not found:
+            print(f"No records found where {field} = {value}")
+
+
+
+
+
+
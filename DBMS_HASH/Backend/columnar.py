@@ -0,0 +1,290 @@
+import threading
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; without it the planner never picks a columnar path
+    np = None
+
+from .aggregation import ACCUMULATORS, column_name
+from .predicate import COMPARATORS, And, Comparison, Not, Or, TrueCondition
+from .schema import coerce_like
+
+# What a stored value is, as far as numeric comparisons and aggregates are concerned
+NULL, INT, FLOAT, BOOL, TEXT_INT, TEXT_FLOAT, OTHER, INEXACT = range(8)
+MAX_EXACT = 2 ** 53  # Larger integers don't survive the trip through float64
+
+
+def available():
+    return np is not None
+
+
+def is_numeric_literal(value):
+    if value.__class__ is float:
+        return True
+    return value.__class__ is int and -MAX_EXACT <= value <= MAX_EXACT
+
+
+def vectorizable(node):
+    """Whether a condition only compares fields against numbers, so it can run as array operations."""
+    if isinstance(node, TrueCondition):
+        return True
+    if isinstance(node, (And, Or)):
+        return all(vectorizable(child) for child in node.children)
+    if isinstance(node, Not):
+        return vectorizable(node.child)
+    return isinstance(node, Comparison) and is_numeric_literal(node.value)
+
+
+def count_comparisons(node):
+    if isinstance(node, (And, Or)):
+        return sum(count_comparisons(child) for child in node.children)
+    if isinstance(node, Not):
+        return count_comparisons(node.child)
+    return 1 if isinstance(node, Comparison) else 0
+
+
+def classify(value):
+    """(kind, number) for a stored value, mirroring how the predicates and accumulators read it."""
+    cls = value.__class__
+    if cls is int:
+        return (INT, float(value)) if -MAX_EXACT <= value <= MAX_EXACT else (INEXACT, 0.0)
+    if cls is float:
+        return FLOAT, value
+    if value is None:
+        return NULL, 0.0
+    if cls is bool:
+        return BOOL, float(value)
+    if cls is str:
+        # Text from before values were typed compares (and sums) as the number it spells
+        kind, number = classify(coerce_like(value, 0))
+        if kind == NULL:
+            return OTHER, 0.0
+        return {INT: TEXT_INT, FLOAT: TEXT_FLOAT}.get(kind, kind), number
+    return OTHER, 0.0
+
+
+def _grow(array, capacity):
+    grown = np.zeros(capacity, dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+class Column:
+    """One field as a float64 array, with the kind of every value alongside (NULL when missing)."""
+
+    def __init__(self, kinds, values):
+        self.kinds = kinds
+        self.values = values
+        self.inexact = int((kinds == INEXACT).sum())  # Rows the float64 array can't represent
+
+    def set(self, row, value):
+        kind, number = classify(value)
+        self.inexact += int(kind == INEXACT) - int(self.kinds[row] == INEXACT)
+        self.kinds[row] = kind
+        self.values[row] = number
+
+    def grow(self, capacity):
+        self.kinds = _grow(self.kinds, capacity)
+        self.values = _grow(self.values, capacity)
+
+
+class ColumnStore:
+    """
+    Columnar shadow of a collection for analytic queries: per field, a
+    float64 array and a kind array, row-aligned with a list of doc_ids.
+    Rows are laid out the first time a plan needs them and each column is
+    built on first use; after that every insert, update and delete keeps
+    them in sync. Those writes hold the collection's lock alone, but
+    readers share it, so the lazy builds take the store's own lock.
+    """
+
+    # Drop the shadow (it is rebuilt on next use) once this many rows are dead
+    # and they outnumber the live ones
+    REBUILD_MIN_DEAD = 1024
+
+    def __init__(self, records):
+        self.records = records
+        self.build_lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.ids = []  # Row -> doc_id, None once deleted
+        self.rows = {}  # doc_id -> row
+        self.alive = None
+        self.columns = {}
+        self.dead = 0
+
+    @property
+    def built(self):
+        return self.alive is not None
+
+    def _build_rows(self):
+        self.ids = [doc_id for doc_id, _ in self.records.items()]
+        self.rows = {doc_id: row for row, doc_id in enumerate(self.ids)}
+        self.alive = np.zeros(max(len(self.ids), 16), dtype=bool)
+        self.alive[:len(self.ids)] = True
+
+    def column(self, field):
+        column = self.columns.get(field)
+        if column is not None:
+            return column
+        with self.build_lock:
+            return self._build_column(field)
+
+    def _build_column(self, field):
+        if not self.built:
+            self._build_rows()
+        column = self.columns.get(field)
+        if column is None:
+            # One pass over the hash table, then the values in row order (dead rows read as None)
+            by_id = {doc_id: obj.attributes.get(field) for doc_id, obj in self.records.items()}
+            pairs = [classify(by_id.get(doc_id)) for doc_id in self.ids]
+            capacity = len(self.alive)
+            kinds = np.zeros(capacity, dtype=np.int8)
+            values = np.zeros(capacity, dtype=np.float64)
+            if pairs:
+                kinds[:len(pairs)] = [kind for kind, _ in pairs]
+                values[:len(pairs)] = [number for _, number in pairs]
+            column = self.columns[field] = Column(kinds, values)
+        return column
+
+    def put(self, doc_id, attributes):
+        """Record an inserted or updated record."""
+        if not self.built:
+            return
+        row = self.rows.get(doc_id)
+        if row is None:
+            row = len(self.ids)
+            if row == len(self.alive):
+                capacity = 2 * row
+                self.alive = _grow(self.alive, capacity)
+                for column in self.columns.values():
+                    column.grow(capacity)
+            self.ids.append(doc_id)
+            self.rows[doc_id] = row
+            self.alive[row] = True
+        for field, column in self.columns.items():
+            column.set(row, attributes.get(field))
+
+    def delete(self, doc_id):
+        if not self.built:
+            return
+        row = self.rows.pop(doc_id, None)
+        if row is None:
+            return
+        self.ids[row] = None
+        self.alive[row] = False
+        for column in self.columns.values():
+            column.set(row, None)
+        self.dead += 1
+        if self.dead >= self.REBUILD_MIN_DEAD and 2 * self.dead > len(self.ids):
+            self.reset()
+
+    def mask(self, node):
+        """
+        Boolean array over the rows matching a vectorizable condition, or None
+        if a column it reads holds integers too large to compare as float64.
+        """
+        if not self.built:
+            with self.build_lock:
+                if not self.built:  # Another reader may have built it while this one waited
+                    self._build_rows()
+        size = len(self.ids)
+        result = self._mask(node, size)
+        return None if result is None else result & self.alive[:size]
+
+    def _mask(self, node, size):
+        if isinstance(node, TrueCondition):
+            return np.ones(size, dtype=bool)
+        if isinstance(node, (And, Or)):
+            result = None
+            for child in node.children:
+                mask = self._mask(child, size)
+                if mask is None:
+                    return None
+                if result is None:
+                    result = mask
+                elif isinstance(node, And):
+                    result &= mask
+                else:
+                    result |= mask
+            return result
+        if isinstance(node, Not):
+            mask = self._mask(node.child, size)
+            return None if mask is None else ~mask
+        column = self.column(node.field)
+        if column.inexact:
+            return None
+        kinds, values = column.kinds[:size], column.values[:size]
+        number = (kinds >= INT) & (kinds <= TEXT_FLOAT)
+        if node.op == "!=":
+            # Like None != 5, a missing or non-numeric value is "not equal"
+            return ~number | (values != node.value)
+        return number & COMPARATORS[node.op](values, node.value)
+
+    def match(self, node):
+        """doc_ids of the records matching a vectorizable condition, or None (see mask())."""
+        mask = self.mask(node)
+        if mask is None:
+            return None
+        ids = self.ids
+        return [ids[row] for row in np.flatnonzero(mask).tolist()]
+
+    def aggregate(self, node, aggregates):
+        """
+        One row of ungrouped aggregates over the records matching a
+        vectorizable condition, or None if a column can't be used.
+        """
+        selected = self.mask(node)
+        if selected is None:
+            return None
+        size = len(self.ids)
+        result = {}
+        for func, field in aggregates:
+            if field == "*":
+                result[column_name(func, field)] = int(selected.sum())
+                continue
+            column = self.column(field)
+            if column.inexact:
+                return None
+            kinds, values = column.kinds[:size], column.values[:size]
+            if func == "COUNT":
+                value = int((selected & (kinds != NULL)).sum())
+            elif func in ("SUM", "AVG"):
+                value = self._sum(func, kinds, values, selected)
+            else:
+                value = self._extreme(func, field, kinds, values, selected)
+            result[column_name(func, field)] = value
+        return result
+
+    def _sum(self, func, kinds, values, selected):
+        # Bools don't count as numbers here, as in the Sum accumulator
+        picked = selected & (kinds >= INT) & (kinds <= TEXT_FLOAT) & (kinds != BOOL)
+        count = int(picked.sum())
+        if not count:
+            return None
+        numbers = values[picked]
+        if ((kinds[picked] == FLOAT) | (kinds[picked] == TEXT_FLOAT)).any():
+            total = float(numbers.sum())
+        elif float(np.abs(numbers).max()) * count < 2 ** 63:
+            total = int(numbers.astype(np.int64).sum())
+        else:
+            total = sum(int(number) for number in numbers.tolist())  # Would overflow int64
+        return total / count if func == "AVG" else total
+
+    def _extreme(self, func, field, kinds, values, selected):
+        present = selected & (kinds != NULL)
+        if not present.any():
+            return None
+        present_kinds = kinds[present]
+        if ((present_kinds != INT) & (present_kinds != FLOAT)).any():
+            # Bools, text and other types order across types; leave that to the accumulator
+            accumulator = ACCUMULATORS[func](field)
+            get = self.records.get
+            for row in np.flatnonzero(present).tolist():
+                accumulator.add(get(self.ids[row]).attributes)
+            return accumulator.result()
+        numbers = values[present]
+        position = int(numbers.argmin() if func == "MIN" else numbers.argmax())
+        value = float(numbers[position])
+        return int(value) if present_kinds[position] == INT else value
@@ -0,0 +1,53 @@
+from contextlib import nullcontext
+from itertools import islice
+
+
+class Cursor:
+    """
+    Server-side cursor over a running query plan. Rows are produced only as
+    they are fetched, so paging through a large result keeps one page in
+    memory. Rows come from the snapshot taken when the cursor was opened, so
+    records written while it is open are not seen. Each fetch holds the
+    collection's lock for reading, none is held in between. COMMIT, ROLLBACK
+    and the end of the session close every open cursor, so none pins its
+    snapshot past the transaction it was read in.
+    """
+
+    def __init__(self, rows, name=None, collection_name=None, lock=None):
+        self.name = name
+        self.collection_name = collection_name
+        self.lock = lock  # The collection's RWLock
+        self.rows = iter(rows)
+        self.position = 0  # Rows handed out so far
+        self.exhausted = False
+
+    def __repr__(self):
+        return f"Cursor(name={self.name!r}, position={self.position}, exhausted={self.exhausted})"
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        page = self.fetch(1)
+        if not page:
+            raise StopIteration
+        return page[0]
+
+    def fetch(self, count=1):
+        """Return up to `count` more rows; fewer means the result is used up."""
+        if count < 0:
+            raise ValueError("Fetch count must not be negative.")
+        with self.lock.read() if self.lock is not None else nullcontext():
+            page = list(islice(self.rows, count))
+        self.position += len(page)
+        if len(page) < count:
+            self.exhausted = True
+        return page
+
+    def close(self):
+        # Closing the plan releases its snapshot; dropping it lets the records it holds be freed
+        close = getattr(self.rows, "close", None)
+        if close is not None:
+            close()
+        self.rows = iter(())
+        self.exhausted = True
@@ -1,120 +1,144 @@
-import os
-import json
-import shutil
-from .database import Database
-from .transaction import TransactionManager
-
-class DBMS:
-    def __init__(self,root_path="."):
-        self.root_path = root_path  # Set the root_path before using it
-        self.databases = {}  # Key is database name, value is Database object
-        self.current_database = None
-        self.transaction_manager = TransactionManager(self.root_path)
-        self.load_databases()
-
-    def load_databases(self):
-        """Load all databases from the 'databases.json' file."""
-        if os.path.exists("databases.json"):
-            with open("databases.json", "r") as file:
-                data = json.load(file)
-                for db_name in data:
-                    self.databases[db_name] = Database(db_name)
-
-    def save_databases(self):
-        """Save all databases to the 'databases.json' file."""
-        with open("databases.json", "w") as file:
-            json.dump(list(self.databases.keys()), file)
-    
-    def create_database(self, db_name):
-        if not db_name.strip():  # Check for empty or whitespace-only input
-            message = "Database name cannot be empty."
-            print(f"[ERROR] {message}")
-            return {"message": message, "records": []}
-
-        if db_name not in self.databases:
-            self.databases[db_name] = Database(db_name)
-            self.save_databases()  # Save after creating a database
-            message = f"Database '{db_name}' created successfully."
-            print(f"[INFO] {message}")
-            return {"message": message, "records": [{"name": db_name}]}
-        else:
-            message = f"Database '{db_name}' already exists."
-            print(f"[WARNING] {message}")
-            return {"message": message, "records": []}
-
-
-    
-    def delete_database(self, db_name):
-        if db_name in self.databases:
-            shutil.rmtree(db_name, ignore_errors=True)
-            del self.databases[db_name]
-            if self.current_database and self.current_database.name == db_name:
-                self.current_database = None
-            self.save_databases()
-            print(f"Database '{db_name}' deleted.")
-        else:
-            print(f"Database '{db_name}' does not exist.")
-
-    def rename_database(self, old_name, new_name):
-        if old_name not in self.databases:
-            print(f"Database '{old_name}' does not exist.")
-            return
-
-        if new_name in self.databases:
-            print(f"A database named '{new_name}' already exists.")
-            return
-
-        # Rename the database folder
-        try:
-            os.rename(old_name, new_name)
-        except Exception as e:
-            print(f"Failed to rename database folder: {e}")
-            return
-
-        # Update the database object in memory
-        database = self.databases.pop(old_name)
-        database.name = new_name
-        self.databases[new_name] = database
-
-        # Update collection file paths to reflect the new database name
-        for collection in database.collections.values():
-            old_path = collection.collection_file
-            new_path = old_path.replace(old_name, new_name)
-            collection.collection_file = new_path  # Update the collection file path
-            
-            try:
-                os.rename(old_path, new_path)  # Rename collection file
-            except Exception as e:
-                print(f"Failed to rename collection file: {e}")
-
-        # If you're tracking the current database, update the reference
-        if self.current_database == old_name:
-            self.current_database = new_name
-
-        self.save_databases()
-        print(f"Database renamed from '{old_name}' to '{new_name}'.")
-
-    def delete_collection(self, collection_name):
-        db = self.get_current_database()
-        if db:
-            db.delete_collection(collection_name)
-        else:
-            print("No current database selected.")
-            
-    def show_databases(self):
-        if not self.databases:
-            print("No databases available.")
-            return []  # Return empty list if no databases
-
-        return list(self.databases.keys())  # Return the list of database names
-
-
-    def set_current_database(self, db_name):
-        if db_name in self.databases:
-            self.current_database = self.databases[db_name]
-            print(f"Current database set to '{db_name}'.")
-        else:
-            print(f"Database '{db_name}' does not exist.")
-
-    def get_current_database(self):
-        return self.current_database
+import os
+import json
+import shutil
+import atexit
+from .collection import Collection
+from .database import Database
+from .locking import RWLock
+from .transaction import TransactionManager
+from .plan_cache import PlanCache
+
+class DBMS:
+    def __init__(self,root_path="."):
+        self.root_path = root_path  # Set the root_path before using it
+        self.databases = {}  # Key is database name, value is Database object
+        self.current_database = None
+        self.transaction_manager = TransactionManager(self.root_path)
+        self.transaction_manager.recover()  # Before any collection loads its log
+        self.catalog_lock = RWLock("catalog")  # Exclusive to statements that create, drop or rename databases and collections
+        self.plan_cache = PlanCache()  # Parsed SHOW ... RECORDS statements, keyed by normalized text
+        self.cursors = {}  # Open cursors by name, from DECLARE ... CURSOR FOR
+        self.parallel_workers = Collection.PARALLEL_WORKERS  # See set_parallel_workers()
+        self.load_databases()
+
+        # Indexes are flushed lazily; make sure nothing dirty is left behind on exit
+        atexit.register(self.flush)
+
+    def load_databases(self):
+        """Load all databases from the 'databases.json' file."""
+        if os.path.exists("databases.json"):
+            with open("databases.json", "r") as file:
+                data = json.load(file)
+                for db_name in data:
+                    self.databases[db_name] = Database(db_name)
+
+    def flush(self):
+        """Write out every dirty index of every loaded collection."""
+        for database in self.databases.values():
+            for collection in database.collections.values():
+                collection.flush_indexes(force=True)
+
+    def set_parallel_workers(self, workers):
+        """
+        Let the planner split large full scans across this many processes
+        (1 turns parallel scans off). Applies to every collection.
+        """
+        if workers < 1:
+            raise ValueError("PARALLEL_WORKERS must be at least 1.")
+        self.parallel_workers = Collection.PARALLEL_WORKERS = workers
+        message = f"Parallel scans use up to {workers} worker(s)." if workers > 1 else "Parallel scans are off."
+        print(message)
+        return message
+
+    def save_databases(self):
+        """Save all databases to the 'databases.json' file."""
+        with open("databases.json", "w") as file:
+            json.dump(list(self.databases.keys()), file)
+    
+    def create_database(self, db_name):
+        if not db_name.strip():  # Check for empty or whitespace-only input
+            message = "Database name cannot be empty."
+            print(f"[ERROR] {message}")
+            return {"message": message, "records": []}
+
+        if db_name not in self.databases:
+            self.databases[db_name] = Database(db_name)
+            self.save_databases()  # Save after creating a database
+            message = f"Database '{db_name}' created successfully."
+            print(f"[INFO] {message}")
+            return {"message": message, "records": [{"name": db_name}]}
+        else:
+            message = f"Database '{db_name}' already exists."
+            print(f"[WARNING] {message}")
+            return {"message": message, "records": []}
+
+
+    
+    def delete_database(self, db_name):
+        if db_name in self.databases:
+            shutil.rmtree(db_name, ignore_errors=True)
+            del self.databases[db_name]
+            if self.current_database and self.current_database.name == db_name:
+                self.current_database = None
+            self.save_databases()
+            print(f"Database '{db_name}' deleted.")
+        else:
+            print(f"Database '{db_name}' does not exist.")
+
+    def rename_database(self, old_name, new_name):
+        if old_name not in self.databases:
+            print(f"Database '{old_name}' does not exist.")
+            return
+
+        if new_name in self.databases:
+            print(f"A database named '{new_name}' already exists.")
+            return
+
+        # Rename the database folder
+        try:
+            os.rename(old_name, new_name)
+        except Exception as e:
+            print(f"Failed to rename database folder: {e}")
+            return
+
+        # Update the database object in memory
+        database = self.databases.pop(old_name)
+        database.name = new_name
+        database.db_file = f"{new_name}/database.json"
+        self.databases[new_name] = database
+
+        # The folder moved with every file in it; point the collections and their indexes there
+        for collection in database.collections.values():
+            collection.relocate(collection.name, new_name)
+
+        # If you're tracking the current database, update the reference
+        if self.current_database == old_name:
+            self.current_database = new_name
+
+        self.save_databases()
+        print(f"Database renamed from '{old_name}' to '{new_name}'.")
+
+    def delete_collection(self, collection_name):
+        db = self.get_current_database()
+        if db:
+            db.delete_collection(collection_name)
+        else:
+            print("No current database selected.")
+            
+    def show_databases(self):
+        if not self.databases:
+            print("No databases available.")
+            return []  # Return empty list if no databases
+
+        return list(self.databases.keys())  # Return the list of database names
+
+
+    def set_current_database(self, db_name):
+        if db_name in self.databases:
+            self.current_database = self.databases[db_name]
+            print(f"Current database set to '{db_name}'.")
+        else:
+            print(f"Database '{db_name}' does not exist.")
+
+    def get_current_database(self):
+        return self.current_database
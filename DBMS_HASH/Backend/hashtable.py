@@ -1,44 +1,147 @@
-class HashTable:
-    def __init__(self, size=100):
-        self.size = size
-        self.table = [[] for _ in range(size)]  # Create a list of empty lists
-
-    def _hash(self, key):
-        return hash(key) % self.size
-
-    def insert(self, key, value):
-        index = self._hash(key)
-        for item in self.table[index]:
-            if item[0] == key:
-                item[1] = value  # Update value if key already exists
-                return
-        self.table[index].append([key, value])  # Insert new key-value pair
-
-    def search(self, key):
-        index = self._hash(key)
-        if self.table[index] is not None:
-            for k, v in self.table[index]:
-                if k == key:
-                    return v
-        return None
-    
-    def get(self, key):
-        index = self._hash(key)
-        for item in self.table[index]:
-            if item[0] == key:
-                return item[1]
-        return None  # Return None if key not found
-
-    def remove(self, key):
-        index = self._hash(key)
-        for i, item in enumerate(self.table[index]):
-            if item[0] == key:
-                del self.table[index][i]
-                return True
-        return False  # Return False if key is not found
-    
-    def items(self):
-        """Yields key, value pairs (like dict.items())."""
-        for bucket in self.table:
-            for key, value in bucket:
-                yield key, value
+_DELETED = object()  # Tombstone marker left behind by remove()
+
+
+class HashTable:
+    """
+    Open-addressing hash table used to store the records of a collection.
+
+    Keys, values and cached hashes live in three flat parallel lists. The
+    table doubles when the fill (live + deleted slots) passes ``max_load``
+    and halves when the live entries drop below ``min_load``, so lookups
+    stay O(1) no matter how many records the collection holds.
+    """
+
+    MIN_SIZE = 8
+
+    def __init__(self, size=MIN_SIZE, max_load=0.66, min_load=0.15):
+        self.max_load = max_load
+        self.min_load = min_load
+        self._allocate(self._round_size(size))
+        self._used = 0  # Live entries
+        self._fill = 0  # Live entries + tombstones
+
+    def _round_size(self, size):
+        capacity = self.MIN_SIZE
+        while capacity < size:
+            capacity <<= 1
+        return capacity
+
+    def _allocate(self, capacity):
+        self.size = capacity
+        self._mask = capacity - 1
+        self._hashes = [0] * capacity
+        self._keys = [None] * capacity
+        self._values = [None] * capacity
+
+    def _probe(self, key, key_hash):
+        """
+        Return the slot holding ``key`` or the slot where it should be inserted
+        (the first tombstone seen on the probe path, otherwise the empty slot).
+        """
+        mask = self._mask
+        keys = self._keys
+        hashes = self._hashes
+        perturb = key_hash & 0xFFFFFFFFFFFFFFFF
+        index = key_hash & mask
+        free_slot = None
+        while True:
+            slot_key = keys[index]
+            if slot_key is None:
+                return index if free_slot is None else free_slot
+            if slot_key is _DELETED:
+                if free_slot is None:
+                    free_slot = index
+            elif hashes[index] == key_hash and (slot_key is key or slot_key == key):
+                return index
+            perturb >>= 5
+            index = (5 * index + 1 + perturb) & mask
+
+    def _resize(self, capacity):
+        old_hashes, old_keys, old_values = self._hashes, self._keys, self._values
+        self._allocate(capacity)
+        mask = self._mask
+        keys, hashes, values = self._keys, self._hashes, self._values
+        for key_hash, key, value in zip(old_hashes, old_keys, old_values):
+            if key is None or key is _DELETED:
+                continue
+            perturb = key_hash & 0xFFFFFFFFFFFFFFFF
+            index = key_hash & mask
+            while keys[index] is not None:
+                perturb >>= 5
+                index = (5 * index + 1 + perturb) & mask
+            keys[index] = key
+            hashes[index] = key_hash
+            values[index] = value
+        self._fill = self._used
+
+    def insert(self, key, value):
+        key_hash = hash(key)
+        index = self._probe(key, key_hash)
+        slot_key = self._keys[index]
+        if slot_key is not None and slot_key is not _DELETED:
+            self._values[index] = value  # Update value if key already exists
+            return
+        if slot_key is None:
+            self._fill += 1
+        self._keys[index] = key
+        self._hashes[index] = key_hash
+        self._values[index] = value
+        self._used += 1
+        if self._fill > self.size * self.max_load:
+            # Grow so the table ends up roughly a third full
+            self._resize(self._round_size(self._used * 3))
+
+    def search(self, key):
+        return self.get(key)
+
+    def get(self, key):
+        index = self._probe(key, hash(key))
+        slot_key = self._keys[index]
+        if slot_key is None or slot_key is _DELETED:
+            return None  # Return None if key not found
+        return self._values[index]
+
+    def remove(self, key):
+        index = self._probe(key, hash(key))
+        slot_key = self._keys[index]
+        if slot_key is None or slot_key is _DELETED:
+            return False  # Return False if key is not found
+        self._keys[index] = _DELETED
+        self._values[index] = None
+        self._used -= 1
+        if self.size > self.MIN_SIZE and self._used < self.size * self.min_load:
+            self._resize(self._round_size(self._used * 3))
+        return True
+
+    def __contains__(self, key):
+        slot_key = self._keys[self._probe(key, hash(key))]
+        return slot_key is not None and slot_key is not _DELETED
+
+    def __len__(self):
+        return self._used
+
+    def items(self, start=0, stop=None):
+        """Yields key, value pairs (like dict.items()), optionally from a range of slots only."""
+        # Bind the current arrays so a resize during iteration cannot tear the scan
+        keys, values = self._keys, self._values
+        for index in range(start, len(keys) if stop is None else min(stop, len(keys))):
+            key = keys[index]
+            if key is not None and key is not _DELETED:
+                yield key, values[index]
+
+    def slots(self, copy=True):
+        """
+        The key and value arrays; copies, for a scan that must not see later
+        writes, unless copy is False. Empty and deleted slots hold a None value.
+        """
+        if not copy:
+            return self._keys, self._values
+        return list(self._keys), list(self._values)
+
+    def keys(self):
+        for key, _ in self.items():
+            yield key
+
+    def values(self):
+        for _, value in self.items():
+            yield value
@@ -1,140 +1,402 @@
-import json
-import os
-
-class BPlusTreeNode:
-    def __init__(self, is_leaf=True):
-        self.is_leaf = is_leaf
-        self.keys = []  # List of tuples: (key, doc_id)
-        self.children = []  # Child nodes or pointers
-        self.parent = None
-
-    def to_dict(self):
-        # Only store the keys (attribute value and doc_id)
-        return {
-            "is_leaf": self.is_leaf,
-            "keys": self.keys,
-            "children": [child.to_dict() for child in self.children] if not self.is_leaf else []
-        }
-
-class BPlusTree:
-    def __init__(self, order=3, index_file="index.json"):
-        self.root = BPlusTreeNode()
-        self.order = order
-        self.index_file = index_file
-
-    def insert(self, key, doc_id):
-        leaf_node = self._find_leaf_node(key)
-        
-        # Check if the key already exists
-        for idx, (existing_key, doc_ids) in enumerate(leaf_node.keys):
-            if existing_key == key:
-                # Append the doc_id if it's not already there
-                if doc_id not in doc_ids:
-                    doc_ids.append(doc_id)
-                break
-        else:
-            # Insert new key with a list of doc_ids containing the current doc_id
-            leaf_node.keys.append((key, [doc_id]))
-        
-        leaf_node.keys.sort()
-
-        if len(leaf_node.keys) > self.order:
-            self._split_node(leaf_node)
-
-        self.save_index()
-
-
-    def _find_leaf_node(self, key):
-        node = self.root
-        while not node.is_leaf:
-            for i, (node_key, _) in enumerate(node.keys):
-                if key < node_key:
-                    node = node.children[i]
-                    break
-            else:
-                node = node.children[-1]
-        return node
-
-    def _split_node(self, node):
-        mid_index = len(node.keys) // 2
-        mid_key = node.keys[mid_index]
-
-        new_node = BPlusTreeNode(is_leaf=node.is_leaf)
-        new_node.keys = node.keys[mid_index:]
-        node.keys = node.keys[:mid_index]
-
-        if node == self.root:
-            new_root = BPlusTreeNode(is_leaf=False)
-            new_root.keys = [mid_key]
-            new_root.children = [node, new_node]
-            node.parent = new_root
-            new_node.parent = new_root
-            self.root = new_root
-        else:
-            parent = node.parent
-            new_node.parent = parent
-            parent.keys.append(mid_key)
-            parent.children.append(new_node)
-            parent.keys.sort()
-            if len(parent.keys) > self.order:
-                self._split_node(parent)
-
-    def search(self, key):
-        leaf_node = self._find_leaf_node(key)
-        for k, doc_ids in leaf_node.keys:
-            if k == key:
-                return doc_ids  # Return list of doc_ids
-        return []  # Return empty list if no match found
-
-
-    def save_index(self):
-        # Save the index in a way that avoids serializing full objects
-        try:
-            with open(self.index_file, 'w') as file:
-                json.dump(self.root.to_dict(), file, indent=4)
-        except Exception as e:
-            print(f"Error saving index: {e}")
-
-    def load_index(self):
-        if os.path.exists(self.index_file):
-            try:
-                with open(self.index_file, 'r') as file:
-                    data = json.load(file)
-                self.root = self._rebuild_from_data(data)
-            except Exception as e:
-                print(f"Error loading index: {e}")
-        else:
-            print("No index file found. Starting with an empty index.")
-
-    def _rebuild_from_data(self, data):
-        node = BPlusTreeNode(is_leaf=data["is_leaf"])
-        node.keys = [(k, v) for k, v in data["keys"]]
-        if not node.is_leaf:
-            node.children = [self._rebuild_from_data(child) for child in data["children"]]
-            for child in node.children:
-                child.parent = node
-        return node
-    
-    def remove(self, key, doc_id=None):
-        leaf_node = self._find_leaf_node(key)
-        original_len = len(leaf_node.keys)
-
-        # If doc_id is provided, remove exact match; else remove all entries with that key
-        if doc_id is not None:
-            for i, (k, doc_ids) in enumerate(leaf_node.keys):
-                if k == key and doc_id in doc_ids:
-                    doc_ids.remove(doc_id)
-                    if not doc_ids:
-                        leaf_node.keys.pop(i)  # Remove the key if no doc_ids remain
-                    break
-        else:
-            leaf_node.keys = [(k, doc_ids) for (k, doc_ids) in leaf_node.keys if k != key]
-
-        if len(leaf_node.keys) < original_len:
-            print(f"Removed key={key} doc_id={doc_id}")
-        else:
-            print(f"No matching entry found for key={key} doc_id={doc_id}")
-
-        self.save_index()
-
-
+import json
+import os
+from bisect import bisect_left, bisect_right
+from .schema import from_sort_key, is_numeric_text, sort_key
+
+DEFAULT_ORDER = 128  # Maximum number of keys held by a node before it splits
+
+
+class BPlusTreeNode:
+    def __init__(self, is_leaf=True):
+        self.is_leaf = is_leaf
+        self.keys = []  # Sorted keys (separator keys in internal nodes)
+        self.values = []  # Leaves only: one {doc_id: None} dict per key
+        self.children = []  # Internal nodes only: len(keys) + 1 child nodes
+        self.parent = None
+        self.next = None  # Leaves only: right-hand sibling leaf
+
+
+class BPlusTree:
+    """
+    B+ tree mapping attribute values to the IDs of the documents holding them.
+
+    Internal nodes route with binary search: children[i] holds keys below
+    keys[i] and children[i + 1] holds keys from keys[i] upwards. Leaves are
+    chained left to right through ``next`` for ordered scans. Deletes do not
+    rebalance; a leaf may shrink (or empty) but separators stay valid bounds.
+
+    Nodes hold keys encoded with schema.sort_key(), i.e. (type rank, value),
+    so a field holding both numbers and text orders instead of raising. The
+    public methods take and return plain values.
+    """
+
+    def __init__(self, order=DEFAULT_ORDER, index_file="index.json"):
+        if order < 3:
+            raise ValueError("B+ tree order must be at least 3.")
+        self.root = BPlusTreeNode()
+        self.order = order
+        self.index_file = index_file
+        self.dirty = False  # Set by in-memory changes, cleared once the tree is written out
+        self.key_count = 0  # Distinct keys, kept for the planner's cardinality estimates
+        self.entry_count = 0  # (key, doc_id) entries
+        self.numeric_text = 0  # Text keys spelling numbers: results sort them as numbers, the tree as text
+        self.lsn = None  # Collection LSN the saved file reflects (None for files without a stamp)
+
+    def __repr__(self):
+        return f"BPlusTree(order={self.order}, height={self.height()}, file={self.index_file!r})"
+
+    def insert(self, key, doc_id):
+        self._insert(sort_key(key), doc_id)
+        self.dirty = True
+
+    def insert_many(self, pairs):
+        """Insert (key, doc_id) pairs in memory; the owner flushes the index once afterwards."""
+        for key, doc_id in pairs:
+            self._insert(sort_key(key), doc_id)
+        self.dirty = True
+
+    def bulk_load(self, pairs):
+        """
+        Build the tree bottom-up from (key, doc_id) pairs: sort once, pack the
+        leaves, then stack internal levels on top until a single root is left.
+        """
+        keys, values = [], []
+        encoded = [(sort_key(key), doc_id) for key, doc_id in pairs]
+        for key, doc_id in sorted(encoded, key=lambda pair: pair[0]):
+            if keys and keys[-1] == key:
+                values[-1][doc_id] = None
+            else:
+                keys.append(key)
+                values.append({doc_id: None})
+        self._build(keys, values)
+        self.dirty = True
+
+    def _build(self, keys, values):
+        """Pack already sorted, de-duplicated keys into a fresh tree."""
+        self.key_count = len(keys)
+        self.entry_count = sum(len(doc_ids) for doc_ids in values)
+        self.numeric_text = sum(1 for key in keys if is_numeric_text(key))
+        level = []
+        for start in range(0, len(keys), self.order):
+            leaf = BPlusTreeNode(is_leaf=True)
+            leaf.keys = keys[start:start + self.order]
+            leaf.values = values[start:start + self.order]
+            if level:
+                level[-1].next = leaf
+            level.append(leaf)
+        if not level:
+            self.root = BPlusTreeNode()
+            return
+
+        # Each internal node holds up to `order` separators, i.e. order + 1 children
+        while len(level) > 1:
+            parents = []
+            for start in range(0, len(level), self.order + 1):
+                node = BPlusTreeNode(is_leaf=False)
+                node.children = level[start:start + self.order + 1]
+                node.keys = [self._first_key(child) for child in node.children[1:]]
+                for child in node.children:
+                    child.parent = node
+                parents.append(node)
+            level = parents
+        self.root = level[0]
+        self.root.parent = None
+
+    def _first_key(self, node):
+        while not node.is_leaf:
+            node = node.children[0]
+        return node.keys[0]
+
+    def _insert(self, key, doc_id):
+        leaf_node = self._find_leaf_node(key)
+        i = bisect_left(leaf_node.keys, key)
+        if i < len(leaf_node.keys) and leaf_node.keys[i] == key:
+            if doc_id not in leaf_node.values[i]:
+                leaf_node.values[i][doc_id] = None
+                self.entry_count += 1
+            return
+
+        leaf_node.keys.insert(i, key)
+        leaf_node.values.insert(i, {doc_id: None})
+        self.key_count += 1
+        self.entry_count += 1
+        self.numeric_text += is_numeric_text(key)
+        if len(leaf_node.keys) > self.order:
+            self._split_leaf(leaf_node)
+
+    def _find_leaf_node(self, key):
+        node = self.root
+        while not node.is_leaf:
+            node = node.children[bisect_right(node.keys, key)]
+        return node
+
+    def _first_leaf(self):
+        node = self.root
+        while not node.is_leaf:
+            node = node.children[0]
+        return node
+
+    def _split_leaf(self, node):
+        mid_index = len(node.keys) // 2
+        new_node = BPlusTreeNode(is_leaf=True)
+        new_node.keys = node.keys[mid_index:]
+        new_node.values = node.values[mid_index:]
+        del node.keys[mid_index:]
+        del node.values[mid_index:]
+
+        new_node.next = node.next
+        node.next = new_node
+        # The separator is copied up: it stays in the right leaf as its first key
+        self._insert_into_parent(node, new_node.keys[0], new_node)
+
+    def _split_internal(self, node):
+        mid_index = len(node.keys) // 2
+        separator = node.keys[mid_index]
+
+        new_node = BPlusTreeNode(is_leaf=False)
+        new_node.keys = node.keys[mid_index + 1:]
+        new_node.children = node.children[mid_index + 1:]
+        for child in new_node.children:
+            child.parent = new_node
+        del node.keys[mid_index:]
+        del node.children[mid_index + 1:]
+
+        # The separator is pushed up and no longer kept at this level
+        self._insert_into_parent(node, separator, new_node)
+
+    def _insert_into_parent(self, node, separator, new_node):
+        parent = node.parent
+        if parent is None:
+            new_root = BPlusTreeNode(is_leaf=False)
+            new_root.keys = [separator]
+            new_root.children = [node, new_node]
+            node.parent = new_root
+            new_node.parent = new_root
+            self.root = new_root
+            return
+
+        position = parent.children.index(node)
+        parent.keys.insert(position, separator)
+        parent.children.insert(position + 1, new_node)
+        new_node.parent = parent
+        if len(parent.keys) > self.order:
+            self._split_internal(parent)
+
+    def search(self, key):
+        key = sort_key(key)
+        leaf_node = self._find_leaf_node(key)
+        i = bisect_left(leaf_node.keys, key)
+        if i < len(leaf_node.keys) and leaf_node.keys[i] == key:
+            return list(leaf_node.values[i])  # Return list of doc_ids
+        return []  # Return empty list if no match found
+
+    def range_search(self, low=None, high=None, low_inclusive=True, high_inclusive=True):
+        """
+        Return the doc_ids of every key between low and high (None means
+        unbounded) by locating the first leaf and following the leaf chain.
+        """
+        return list(self.iter_range(low, high, low_inclusive, high_inclusive))
+
+    def iter_range(self, low=None, high=None, low_inclusive=True, high_inclusive=True):
+        """Lazy form of range_search(): leaves are visited only as doc_ids are consumed."""
+        low = None if low is None else sort_key(low)
+        high = None if high is None else sort_key(high)
+        if low is None:
+            leaf, i = self._first_leaf(), 0
+        else:
+            leaf = self._find_leaf_node(low)
+            i = bisect_left(leaf.keys, low) if low_inclusive else bisect_right(leaf.keys, low)
+
+        while leaf is not None:
+            keys = leaf.keys
+            if high is not None:
+                end = bisect_right(keys, high) if high_inclusive else bisect_left(keys, high)
+            else:
+                end = len(keys)
+            for values in leaf.values[i:end]:
+                yield from list(values)  # Copied so writes between pulls can't break the iteration
+            if end < len(keys):
+                return
+            leaf, i = leaf.next, 0
+
+    def iter_desc(self):
+        """Yield every doc_id from the largest key down, walking the tree right to left."""
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node.is_leaf:
+                for values in node.values[::-1]:
+                    yield from list(values)
+            else:
+                stack.extend(node.children)  # The rightmost child is popped first
+
+    def items(self):
+        """Yield (key, doc_ids) pairs in key order by walking the leaf chain."""
+        leaf = self._first_leaf()
+        while leaf is not None:
+            for key, doc_ids in zip(leaf.keys, leaf.values):
+                yield from_sort_key(key), list(doc_ids)
+            leaf = leaf.next
+
+    def min_key(self):
+        # Emptied leaves are unlinked, so only an empty tree has no first key
+        leaf = self._first_leaf()
+        return from_sort_key(leaf.keys[0]) if leaf.keys else None
+
+    def max_key(self):
+        node = self.root
+        while not node.is_leaf:
+            node = node.children[-1]
+        return from_sort_key(node.keys[-1]) if node.keys else None
+
+    def stats(self):
+        """Cardinality statistics used by the query planner."""
+        return {
+            "keys": self.key_count,
+            "entries": self.entry_count,
+            "height": self.height(),
+            "min": self.min_key(),
+            "max": self.max_key(),
+        }
+
+    def height(self):
+        levels, node = 1, self.root
+        while not node.is_leaf:
+            node = node.children[0]
+            levels += 1
+        return levels
+
+    def to_dict(self):
+        # Leaves are stored flat in key order; the tree is rebuilt bottom-up on load
+        return {
+            "order": self.order,
+            "lsn": self.lsn,
+            "entries": [[key, doc_ids] for key, doc_ids in self.items()],
+        }
+
+    def flush(self, lsn=None):
+        """Save the index only if it changed since the last save."""
+        if self.dirty:
+            self.save_index(lsn)
+
+    def save_index(self, lsn=None):
+        """
+        Write the index to a temporary file and move it over the old one, so
+        a crash or a failed write never leaves a torn index behind. Errors
+        are raised; the index then stays dirty.
+        """
+        if lsn is not None:
+            self.lsn = lsn
+        tmp_file = f"{self.index_file}.tmp"
+        try:
+            with open(tmp_file, 'w') as file:
+                json.dump(self.to_dict(), file)
+            os.replace(tmp_file, self.index_file)
+        except BaseException:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+            raise
+        self.dirty = False
+
+    def load_index(self):
+        """Load the index file; returns False if there is none or it can't be read."""
+        if os.path.exists(self.index_file):
+            try:
+                with open(self.index_file, 'r') as file:
+                    data = json.load(file)
+                if "entries" in data:
+                    self.order = data.get("order", self.order)
+                    self.lsn = data.get("lsn")
+                    self._build(
+                        [sort_key(key) for key, _ in data["entries"]],
+                        [dict.fromkeys(doc_ids) for _, doc_ids in data["entries"]],
+                    )
+                else:
+                    # Older nested format: collect the leaf entries and rebuild
+                    self.bulk_load(
+                        (key, doc_id) for key, doc_ids in self._legacy_leaf_keys(data) for doc_id in doc_ids
+                    )
+            except Exception as e:
+                print(f"Error loading index: {e}")
+                return False
+            return True
+        print("No index file found. Starting with an empty index.")
+        return False
+
+    def _legacy_leaf_keys(self, data):
+        if data["is_leaf"]:
+            return [(k, v) for k, v in data["keys"]]
+        return [entry for child in data["children"] for entry in self._legacy_leaf_keys(child)]
+
+    def remove(self, key, doc_id=None):
+        if self._remove(sort_key(key), doc_id):
+            self.dirty = True
+
+    def remove_many(self, pairs):
+        """Remove (key, doc_id) pairs in memory; returns how many were found. The owner flushes once afterwards."""
+        removed = 0
+        for key, doc_id in pairs:
+            removed += self._remove(sort_key(key), doc_id)
+        if removed:
+            self.dirty = True
+        return removed
+
+    def _remove(self, encoded, doc_id):
+        leaf_node = self._find_leaf_node(encoded)
+        i = bisect_left(leaf_node.keys, encoded)
+        removed = False
+
+        # If doc_id is provided, remove exact match; else remove all entries with that key
+        if i < len(leaf_node.keys) and leaf_node.keys[i] == encoded:
+            doc_ids = leaf_node.values[i]
+            if doc_id is None:
+                self.entry_count -= len(doc_ids)
+                doc_ids.clear()
+                removed = True
+            elif doc_id in doc_ids:
+                del doc_ids[doc_id]
+                self.entry_count -= 1
+                removed = True
+            if not doc_ids:
+                # Remove the key if no doc_ids remain
+                leaf_node.keys.pop(i)
+                leaf_node.values.pop(i)
+                self.key_count -= 1
+                self.numeric_text -= is_numeric_text(encoded)
+                if not leaf_node.keys and leaf_node.parent is not None:
+                    self._unlink_leaf(leaf_node)
+        return removed
+
+    def _unlink_leaf(self, leaf):
+        """
+        Take an emptied leaf out of the leaf chain and its parent, so scans
+        and min_key()/max_key() never walk past it. Its own next pointer is
+        kept for any range iterator still standing on it.
+        """
+        previous = self._previous_leaf(leaf)
+        if previous is not None:
+            previous.next = leaf.next
+        parent = leaf.parent
+        position = parent.children.index(leaf)
+        del parent.children[position]
+        # The neighbouring child takes over the leaf's key range
+        del parent.keys[position - 1 if position else 0]
+        while len(parent.children) == 1:
+            # An internal node left with one child is replaced by that child
+            child, grandparent = parent.children[0], parent.parent
+            child.parent = grandparent
+            if grandparent is None:
+                self.root = child
+                break
+            grandparent.children[grandparent.children.index(parent)] = child
+            parent = grandparent
+
+    def _previous_leaf(self, node):
+        while node.parent is not None and node.parent.children[0] is node:
+            node = node.parent
+        if node.parent is None:
+            return None
+        node = node.parent.children[node.parent.children.index(node) - 1]
+        while not node.is_leaf:
+            node = node.children[-1]
+        return node
@@ -0,0 +1,201 @@
+import functools
+import itertools
+import threading
+from contextlib import ExitStack, contextmanager
+
+# Seconds a statement waits for a collection another transaction is writing before giving up
+LOCK_TIMEOUT = 30.0
+
+_ranks = itertools.count()  # Creation order of the locks: the one order multi-lock statements take them in
+
+
+class RWLock:
+    """
+    Shared/exclusive lock. Any number of threads may read at once; a writer
+    waits for them to leave and has the lock alone. Waiting writers hold off
+    newly arriving readers, so a stream of reads can't starve them, and the
+    readers already waiting when a writer finishes go before the next
+    writer, so a stream of writes can't starve them either. Both sides are
+    reentrant, and the writing thread may also read; a reader can't upgrade
+    to writing (release first).
+    """
+
+    def __init__(self, name=""):
+        self.name = name
+        self.rank = next(_ranks)
+        self.condition = threading.Condition(threading.Lock())
+        self.readers = {}  # Thread id -> read depth
+        self.writer = None  # Thread id of the writer
+        self.write_depth = 0
+        self.waiting_writers = 0
+        self.writes = 0  # Write releases so far; a reader waiting across one goes next
+        self.waiting_readers = 0
+        self.admitting = 0  # Readers a finished writer let in that haven't got there yet
+
+    def __repr__(self):
+        return f"RWLock({self.name!r}, readers={len(self.readers)}, writer={self.writer is not None})"
+
+    def acquire_read(self):
+        me = threading.get_ident()
+        with self.condition:
+            if self.writer == me or me in self.readers:
+                self.readers[me] = self.readers.get(me, 0) + 1
+                return
+            writes = self.writes
+            if self.writer is not None or self.waiting_writers:
+                self.waiting_readers += 1
+                try:
+                    while self.writer is not None or (self.waiting_writers and self.writes == writes):
+                        self.condition.wait()
+                finally:
+                    self.waiting_readers -= 1
+                if self.writes != writes and self.admitting:
+                    self.admitting -= 1
+                    if not self.admitting:
+                        self.condition.notify_all()
+            self.readers[me] = 1
+
+    def release_read(self):
+        me = threading.get_ident()
+        with self.condition:
+            if self.readers[me] == 1:
+                del self.readers[me]
+                if not self.readers:
+                    self.condition.notify_all()
+            else:
+                self.readers[me] -= 1
+
+    def acquire_write(self):
+        me = threading.get_ident()
+        with self.condition:
+            if self.writer == me:
+                self.write_depth += 1
+                return
+            if me in self.readers:
+                raise RuntimeError(f"Lock '{self.name}' is held for reading; it can't be upgraded to writing.")
+            self.waiting_writers += 1
+            try:
+                while self.writer is not None or self.readers or self.admitting:
+                    self.condition.wait()
+            finally:
+                self.waiting_writers -= 1
+            self.writer, self.write_depth = me, 1
+
+    def release_write(self):
+        with self.condition:
+            self.write_depth -= 1
+            if not self.write_depth:
+                self.writer = None
+                self.writes += 1
+                self.admitting = self.waiting_readers
+                self.condition.notify_all()
+
+    @contextmanager
+    def read(self):
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self):
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+def shared(method):
+    """Run a Collection method under the collection's lock, shared with other readers."""
+    @functools.wraps(method)
+    def locked(self, *args, **kwargs):
+        with self.lock.read():
+            return method(self, *args, **kwargs)
+    return locked
+
+
+def exclusive(method):
+    """Run a Collection method under the collection's lock, alone."""
+    @functools.wraps(method)
+    def locked(self, *args, **kwargs):
+        with self.lock.write():
+            return method(self, *args, **kwargs)
+    return locked
+
+
+@contextmanager
+def write_all(locks):
+    """
+    Take several RWLocks for writing, always in rank order, so two statements
+    that both need the same collections can't each hold what the other waits for.
+    """
+    with ExitStack() as stack:
+        for lock in sorted(set(locks), key=lambda lock: lock.rank):
+            stack.enter_context(lock.write())
+        yield
+
+
+class DeadlockError(ValueError):
+    pass
+
+
+class WriteLock:
+    """
+    Which writer a collection belongs to: an open transaction from its first
+    write until COMMIT or ROLLBACK, or a single write statement. Owners are
+    the tokens transactions and statements already carry. Transactions take
+    these locks one statement at a time, in no fixed order, so a wait that
+    would close a cycle of owners waiting on each other fails at once with
+    DeadlockError instead of hanging; any other wait gives up after
+    LOCK_TIMEOUT seconds.
+    """
+
+    registry = threading.Condition(threading.Lock())  # Guards every WriteLock and the waits-for map
+    waiting = {}  # Owner -> the WriteLock it is waiting for
+
+    def __init__(self, name=""):
+        self.name = name
+        self.owner = None
+        self.depth = 0
+
+    def __repr__(self):
+        return f"WriteLock({self.name!r}, held={self.owner is not None})"
+
+    def held_by_other(self, owner):
+        return self.owner is not None and self.owner is not owner
+
+    def acquire(self, owner, timeout=None):
+        timeout = LOCK_TIMEOUT if timeout is None else timeout
+        with self.registry:
+            if self.owner is owner:
+                self.depth += 1
+                return
+            if self.owner is not None:
+                self._check_deadlock(owner)
+            self.waiting[owner] = self
+            try:
+                if not self.registry.wait_for(lambda: self.owner is None, timeout):
+                    raise ValueError(f"Timed out after {timeout:g}s waiting for collection '{self.name}', which another transaction is writing.")
+            finally:
+                del self.waiting[owner]
+            self.owner, self.depth = owner, 1
+
+    def _check_deadlock(self, owner):
+        holder, seen = self.owner, set()
+        while holder is not None and id(holder) not in seen:
+            if holder is owner:
+                raise DeadlockError(f"Deadlock: waiting for collection '{self.name}' would never end; ROLLBACK and retry.")
+            seen.add(id(holder))
+            blocked_on = self.waiting.get(holder)
+            holder = blocked_on.owner if blocked_on is not None else None
+
+    def release(self, owner):
+        with self.registry:
+            if self.owner is not owner:
+                return
+            self.depth -= 1
+            if not self.depth:
+                self.owner = None
+                self.registry.notify_all()
@@ -0,0 +1,274 @@
+import threading
+from contextlib import contextmanager
+from itertools import islice
+
+
+class CommitClock:
+    """
+    The global commit sequence. Every committed statement or transaction
+    stamps its new record versions with the next number; a reader's
+    snapshot is the last number committed when its statement started.
+    The clock also tracks which snapshots are still held, so old versions
+    can be dropped once no reader needs them.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sequence = 0  # Last committed sequence number
+        self.readers = {}  # Snapshot sequence -> number of readers holding it
+
+    @contextmanager
+    def committing(self):
+        """
+        Yield the next sequence number; the versions stamped with it inside
+        the block become visible together, as no snapshot starts meanwhile.
+        """
+        with self.lock:
+            self.sequence += 1
+            yield self.sequence
+
+    def snapshot(self, owner=None):
+        with self.lock:
+            self.readers[self.sequence] = self.readers.get(self.sequence, 0) + 1
+            return Snapshot(self, self.sequence, owner)
+
+    def release(self, sequence):
+        with self.lock:
+            if self.readers.get(sequence, 0) <= 1:
+                self.readers.pop(sequence, None)
+            else:
+                self.readers[sequence] -= 1
+
+    def oldest(self):
+        """Versions committed at or before this number are all any reader can still ask for."""
+        with self.lock:
+            return min(self.readers, default=self.sequence)
+
+
+CLOCK = CommitClock()
+
+
+class Snapshot:
+    """
+    What one statement reads: every version committed up to `sequence`,
+    plus the uncommitted versions of `owner` (the reader's own transaction).
+    """
+
+    def __init__(self, clock, sequence, owner=None):
+        self.clock = clock
+        self.sequence = sequence
+        self.owner = owner
+        self.released = False
+
+    def __repr__(self):
+        return f"Snapshot(sequence={self.sequence})"
+
+    def current(self, version):
+        """Whether this snapshot sees `version` itself (rather than something older)."""
+        if version.version is None:
+            return version.owner is not None and version.owner is self.owner
+        return version.version <= self.sequence
+
+    def visible(self, version):
+        """The version of a record this snapshot sees, walking back its chain; None if none or deleted."""
+        while version is not None:
+            if self.current(version):
+                return None if version.deleted else version
+            version = version.previous
+        return None
+
+    def release(self):
+        if not self.released:
+            self.released = True
+            self.clock.release(self.sequence)
+
+
+class SnapshotRows:
+    """
+    The rows of a running plan, read at `snapshot`. The snapshot is released
+    once the rows run out, fail, or are closed, even if none was ever pulled.
+    """
+
+    def __init__(self, rows, snapshot):
+        self.rows, self.snapshot = rows, snapshot
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            return next(self.rows)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        close = getattr(self.rows, "close", None)
+        if close is not None:
+            close()
+        self.snapshot.release()
+
+
+class SnapshotRecords:
+    """
+    A collection's records as one snapshot sees them, with the get() /
+    items() / len() interface of the HashTable the plan operators read.
+    Deleted records are still reachable through the collection's graveyard
+    until no snapshot needs them. A scan reads the live slot arrays; writers
+    call freeze() before changing them (as with Walk), which copies them for
+    the scans still running.
+    """
+
+    MAX_CHUNK = 1024  # Slots read per lock round trip, growing from 8 so a LIMIT doesn't overread
+
+    def __init__(self, collection, snapshot):
+        self.collection = collection
+        self.snapshot = snapshot
+        self.source = None  # (keys, values, graveyard) the scans read
+        self.frozen = False
+        self.lock = threading.Lock()
+
+    def _source(self):
+        # Call with self.lock held. The first scan registers for freezing before it reads anything
+        if self.source is None:
+            keys, values = self.collection.records.slots(copy=False)
+            self.source = keys, values, self.collection.graveyard
+            self.collection.walks.add(self)
+        return self.source
+
+    def freeze(self):
+        with self.lock:
+            if self.source is not None and not self.frozen:
+                keys, values, graveyard = self.source
+                self.source = list(keys), list(values), dict(graveyard)
+                self.frozen = True
+
+    @property
+    def size(self):
+        # Slots a parallel scan splits into ranges
+        with self.lock:
+            return len(self._source()[0])
+
+    def get(self, doc_id):
+        version = self.collection.records.get(doc_id)
+        if version is None:
+            return self.snapshot.visible(self.collection.graveyard.get(doc_id))
+        stamp = version.version
+        if stamp is not None and stamp <= self.snapshot.sequence:
+            return version  # The common case: the live version is old enough
+        return self.snapshot.visible(version)
+
+    def items(self, start=0, stop=None):
+        sequence, visible = self.snapshot.sequence, self.snapshot.visible
+        index, size = start, 8
+        while True:
+            with self.lock:
+                keys, values, graveyard = self._source()
+                end = len(keys) if stop is None else min(stop, len(keys))
+                upto = min(index + size, end)
+                chunk = list(zip(keys[index:upto], values[index:upto]))
+                if graveyard:
+                    # Also in the graveyard (a rolled back delete); the graveyard pass below covers it
+                    chunk = [(key, version) for key, version in chunk if key not in graveyard]
+            if index >= end:
+                break
+            index, size = upto, min(size * 2, self.MAX_CHUNK)
+            for key, version in chunk:
+                if version is None:
+                    continue  # Empty or deleted slot
+                stamp = version.version
+                if stamp is None or stamp > sequence:
+                    version = visible(version)
+                    if version is None:
+                        continue
+                yield key, version
+        if start == 0:
+            with self.lock:
+                tombstones = list(self._source()[2].items())
+            for doc_id, tombstone in tombstones:
+                version = visible(tombstone)
+                if version is not None:
+                    yield doc_id, version
+
+    def is_current(self):
+        """Whether the live records are exactly what the snapshot sees."""
+        collection, snapshot = self.collection, self.snapshot
+        if collection.last_commit > snapshot.sequence:
+            return False
+        return all(version.owner is snapshot.owner for version in list(collection.uncommitted))
+
+    def __len__(self):
+        if self.is_current():
+            return len(self.collection.records)  # Nothing to filter out; the table keeps its own count
+        return sum(1 for _ in self.items())
+
+
+class Walk:
+    """
+    doc_ids a snapshot plan reads lazily off the live indexes. Writers call
+    freeze() before changing an index, which reads the rest of the walk into
+    memory first, so it keeps producing the ids of the index as it was.
+    """
+
+    MAX_CHUNK = 256  # doc_ids read off the index per lock round trip, growing from 1 so a LIMIT doesn't overread
+
+    def __init__(self, doc_ids):
+        self.doc_ids = iter(doc_ids)
+        self.lock = threading.Lock()
+
+    def __iter__(self):
+        size = 1
+        while True:
+            with self.lock:
+                chunk = list(islice(self.doc_ids, size))
+            if not chunk:
+                return
+            yield from chunk
+            size = min(size * 2, self.MAX_CHUNK)
+
+    def freeze(self):
+        with self.lock:
+            self.doc_ids = iter(list(self.doc_ids))
+
+
+class SnapshotView:
+    """
+    Stand-in for a Collection while a plan runs against a snapshot: the
+    records are filtered by the snapshot, the indexes and columns are the
+    live ones (is_current() and unstable_ids() say how far to trust them).
+    """
+
+    def __init__(self, collection, snapshot):
+        self.collection = collection
+        self.snapshot = snapshot
+        self.records = SnapshotRecords(collection, snapshot)
+        self.indexes = collection.indexes
+        self.columns = collection.columns
+        self.name = collection.name
+
+    def is_current(self):
+        """Whether the live records (and so the indexes and columns) are exactly what the snapshot sees."""
+        return self.records.is_current()
+
+    def walk(self, doc_ids):
+        """Register an index walk to be frozen before the next write (see Walk)."""
+        walk = Walk(doc_ids)
+        self.collection.walks.add(walk)
+        return walk
+
+    def unstable_ids(self):
+        """
+        doc_ids whose snapshot version differs from the live one (updated or
+        deleted since, or by another transaction), so an index or column
+        lookup on the live values may miss or misplace them.
+        """
+        collection, current = self.collection, self.snapshot.current
+        unstable = set()
+        for doc_id in list(collection.versioned):
+            version = collection.records.get(doc_id)
+            if version is not None and not current(version):
+                unstable.add(doc_id)
+        for doc_id, tombstone in list(collection.graveyard.items()):
+            if not current(tombstone):
+                unstable.add(doc_id)
+        return unstable
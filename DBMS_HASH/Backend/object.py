@@ -1,10 +1,29 @@
-import uuid
-
-class Object:
-    def __init__(self, **attributes):
-        self.id = str(uuid.uuid4())  # Unique ID for each object
-        self.attributes = attributes  # A dictionary of attribute names and values
-
-    def to_dict(self):
-        """Return only JSON-serializable attributes."""
-        return self.attributes
+import uuid
+
+class Object:
+    # Version chain (see mvcc.py). Records loaded from disk are version 0, seen by every snapshot
+    version = 0  # Commit sequence that made this version visible; None until its writer commits
+    owner = None  # The writer's token while uncommitted
+    previous = None  # The version this one replaced, kept while a snapshot may still read it
+    deleted = False  # Tombstone left by a delete
+
+    def __init__(self, **attributes):
+        self.id = str(uuid.uuid4())  # Unique ID for each object
+        self.attributes = attributes  # A dictionary of attribute names and values
+
+    @classmethod
+    def new_version(cls, doc_id, attributes, previous, owner, deleted=False):
+        """An uncommitted version of record `doc_id` replacing `previous` (None for a new record)."""
+        obj = cls.__new__(cls)
+        obj.id = doc_id
+        obj.attributes = attributes
+        obj.previous = previous
+        obj.owner = owner
+        obj.version = None
+        if deleted:
+            obj.deleted = True
+        return obj
+
+    def to_dict(self):
+        """Return only JSON-serializable attributes."""
+        return self.attributes
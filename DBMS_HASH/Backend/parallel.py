@@ -0,0 +1,83 @@
+import multiprocessing
+import os
+import signal
+import threading
+from .predicate import And, Comparison, Not, Or
+
+# Chunks per worker, so a partition full of expensive records doesn't hold up the rest
+CHUNKS_PER_WORKER = 4
+
+# One pool per worker count, started on first use and shared by every scan (and
+# thread) after that. Its processes come from a forkserver, or are spawned, rather
+# than forked from this multi-threaded process, so each task carries what it reads
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class Missing:
+    """Stands in for a field a record doesn't have. A class pickles by reference, so `is` still works in a worker."""
+
+
+def worker_count(requested):
+    """Workers a scan may actually use: the DBMS setting, but never more than the CPUs present."""
+    return max(1, min(requested, os.cpu_count() or 1))
+
+
+def fields(node):
+    """The fields a condition reads, in a fixed order: all a worker needs of a record."""
+    if isinstance(node, (And, Or)):
+        return sorted({field for child in node.children for field in fields(child)})
+    if isinstance(node, Not):
+        return fields(node.child)
+    return [node.field] if isinstance(node, Comparison) else []
+
+
+def _ignore_interrupts():
+    # Ctrl-C reaches the whole process group; the parent handles it, the workers carry on
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _pool(workers):
+    with _pools_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            pool = _pools[workers] = multiprocessing.get_context(method).Pool(workers, initializer=_ignore_interrupts)
+        return pool
+
+
+def _scan_partition(task):
+    node, names, rows = task
+    matches = node.compile()
+    return [
+        position for position, row in enumerate(rows)
+        if matches({name: value for name, value in zip(names, row) if value is not Missing})
+    ]
+
+
+def partitions(size, count):
+    """Split the slot range [0, size) into `count` contiguous (start, stop) pieces."""
+    step = -(-size // count)
+    return [(start, min(start + step, size)) for start in range(0, size, step)]
+
+
+def parallel_scan(records, node, workers):
+    """
+    doc_ids of the records satisfying the condition `node`, tested by
+    `workers` pooled processes that each take a range of hash table slots.
+    A range goes out as just the values of the fields the condition reads,
+    and only the positions of the matches come back. Results are in slot
+    order, the same order a single-process scan produces.
+    """
+    names = fields(node)
+    doc_ids = []  # Per range, filled in as the range is sent
+
+    def tasks():
+        # Run by the pool's feeder thread, so the workers start on the first ranges while later ones are packed
+        for start, stop in partitions(records.size, workers * CHUNKS_PER_WORKER):
+            chunk = list(records.items(start, stop))
+            doc_ids.append([doc_id for doc_id, _ in chunk])
+            yield node, names, [tuple([obj.attributes.get(name, Missing) for name in names]) for _, obj in chunk]
+
+    results = _pool(workers).imap(_scan_partition, tasks())
+    return [doc_ids[number][position] for number, positions in enumerate(results) for position in positions]
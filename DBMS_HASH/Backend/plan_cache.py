@@ -0,0 +1,66 @@
+import re
+import threading
+from collections import OrderedDict
+from .schema import parse_literal
+
+# The value side of a "field op value" comparison; these literals become parameters
+LITERAL_PATTERN = re.compile(r'(\w+\s*(?:==|!=|>=|<=|=|>|<)\s*)("[^"]*"|\'[^\']*\'|[^\s()=!<>"\']+)')
+
+
+def normalize_query(query):
+    """
+    Turn a statement into its cache key: whitespace is collapsed and every
+    comparison literal is replaced by "?". Returns (key, params) where params
+    holds the lifted literals in textual order: quoted ones as text, the rest
+    typed by schema.infer_value().
+    """
+    params = []
+
+    def lift(match):
+        params.append(parse_literal(match.group(2)))
+        return f"{match.group(1)}?"
+
+    key = LITERAL_PATTERN.sub(lift, " ".join(query.split()))
+    return key, params
+
+
+class PlanCache:
+    """LRU cache of parsed statements keyed by normalized statement text. Safe to share between threads."""
+
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self.lock = threading.Lock()
+        self.plans = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self.lock:
+            plan = self.plans.get(key)
+            if plan is None:
+                self.misses += 1
+                return None
+            self.plans.move_to_end(key)
+            self.hits += 1
+            return plan
+
+    def put(self, key, plan):
+        with self.lock:
+            self.plans[key] = plan
+            self.plans.move_to_end(key)
+            if len(self.plans) > self.capacity:
+                self.plans.popitem(last=False)  # Evict the least recently used plan
+
+    def clear(self):
+        with self.lock:
+            self.plans.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "size": len(self.plans),
+            "capacity": self.capacity,
+        }
@@ -0,0 +1,859 @@
+import heapq
+import math
+import time
+from itertools import islice
+from . import columnar, parallel
+from .aggregation import GroupTable, column_name
+from .mvcc import SnapshotView
+from .predicate import And, Comparison, Not, Or, Predicate, TrueCondition, conjuncts, make_and
+from .schema import order_key, sort_key
+
+# Relative cost of the basic steps, in "visit one record and test it" units
+SCAN_COST = 1.0  # Visit a record during a full scan and run the predicate
+FETCH_COST = 1.5  # Resolve a doc_id with a hash probe and run the predicate
+INDEX_DESCENT_COST = 2.0  # Per B+ tree level walked from the root
+INDEX_ENTRY_COST = 0.1  # Collect one doc_id from a leaf
+SET_OP_COST = 0.2  # Hash one doc_id into an intersection/union set
+AGGREGATE_COST = 0.2  # Feed one record to one accumulator
+COLUMN_COST = 0.02  # One comparison or aggregate step over one row of a NumPy column
+WORKER_COST = 1000.0  # Hand one pooled scan worker its ranges and collect its results
+SHIP_COST = 0.3  # Pack one field of one record for a scan worker
+
+# Below this many records the columnar shadow isn't worth its array overhead
+COLUMNAR_MIN_ROWS = 10000
+
+# Default selectivities when statistics don't apply (the classic System R guesses)
+EQ_SELECTIVITY = 0.1
+RANGE_SELECTIVITY = 1 / 3
+BETWEEN_SELECTIVITY = 1 / 4
+NE_SELECTIVITY = 0.9
+
+
+def _to_number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class PlanNode:
+    """
+    One operator of a query plan. Subclasses implement _execute() as a
+    generator, so rows flow through the plan one at a time and an operator
+    that has what it needs (Limit) stops pulling from its inputs.
+    """
+
+    name = "Node"
+
+    def __init__(self, *children):
+        self.children = list(children)
+        self.estimated_rows = 0
+        self.estimated_cost = 0.0
+        self.actual_rows = None
+        self.elapsed = None
+
+    def detail(self):
+        return ""
+
+    def execute(self, collection, analyze=False):
+        """Return an iterator over this operator's rows."""
+        rows = self._execute(collection, analyze)
+        return self._instrument(rows) if analyze else rows
+
+    def _instrument(self, rows):
+        # Count rows and time spent producing them (children included) as they are pulled
+        self.actual_rows, self.elapsed = 0, 0.0
+        rows = iter(rows)
+        while True:
+            start = time.perf_counter()
+            try:
+                row = next(rows)
+            except StopIteration:
+                self.elapsed += time.perf_counter() - start
+                return
+            self.elapsed += time.perf_counter() - start
+            self.actual_rows += 1
+            yield row
+
+    def _execute(self, collection, analyze):
+        raise NotImplementedError
+
+    def walk(self, depth=0):
+        yield depth, self
+        for child in self.children:
+            yield from child.walk(depth + 1)
+
+
+class FullScan(PlanNode):
+    name = "Full Scan"
+
+    def __init__(self, predicate, total, selectivity):
+        super().__init__()
+        self.predicate = predicate
+        self.estimated_rows = total * selectivity
+        self.estimated_cost = total * SCAN_COST
+
+    def detail(self):
+        return "" if isinstance(self.predicate.node, TrueCondition) else f"filter: {self.predicate}"
+
+    def _execute(self, collection, analyze):
+        if isinstance(self.predicate.node, TrueCondition):
+            return collection.records.items()
+        matches = self.predicate.matches
+        return ((obj_id, obj) for obj_id, obj in collection.records.items() if matches(obj.attributes))
+
+
+class ParallelScan(PlanNode):
+    """Full scan split over pooled worker processes by hash table slot range, producing doc_ids."""
+
+    name = "Parallel Scan"
+
+    def __init__(self, predicate, total, selectivity, workers):
+        super().__init__()
+        self.predicate, self.workers = predicate, workers
+        self.estimated_rows = total * selectivity
+        # The parent still visits every record, to pack the fields the workers test
+        self.estimated_cost = total * (SCAN_COST / workers + SHIP_COST * max(1, len(parallel.fields(predicate.node)))) + workers * WORKER_COST
+
+    def detail(self):
+        return f"filter: {self.predicate}, {self.workers} workers"
+
+    def _execute(self, collection, analyze):
+        return iter(parallel.parallel_scan(collection.records, self.predicate.node, self.workers))
+
+
+class ColumnarScan(PlanNode):
+    """Numeric comparisons evaluated as mask operations over the columnar shadow, producing doc_ids."""
+
+    name = "Columnar Scan"
+
+    def __init__(self, node, total, selectivity):
+        super().__init__()
+        self.node = node
+        self.estimated_rows = total * selectivity
+        self.estimated_cost = total * COLUMN_COST * columnar.count_comparisons(node)
+
+    def detail(self):
+        return f"filter: {self.node!r}"
+
+    def _execute(self, collection, analyze):
+        doc_ids = collection.columns.match(self.node)
+        if doc_ids is None:
+            # A column holds integers too large for float64; test each record instead
+            matches = Predicate(self.node).matches
+            doc_ids = [obj_id for obj_id, obj in collection.records.items() if matches(obj.attributes)]
+        return iter(doc_ids)
+
+
+class IdLookup(PlanNode):
+    name = "ID Lookup"
+
+    def __init__(self, doc_ids):
+        super().__init__()
+        self.doc_ids = list(dict.fromkeys(doc_ids))
+        self.estimated_rows = len(self.doc_ids)
+        self.estimated_cost = 0.0
+
+    def detail(self):
+        return f"{len(self.doc_ids)} id(s)"
+
+    def _execute(self, collection, analyze):
+        return iter(self.doc_ids)
+
+
+class IndexScan(PlanNode):
+    """Point lookup or range scan on one B+ tree, producing doc_ids."""
+
+    def __init__(self, field, bptree, low=None, high=None, low_inclusive=True, high_inclusive=True):
+        super().__init__()
+        self.field = field
+        self.bptree = bptree
+        self.low, self.high = low, high
+        self.low_inclusive, self.high_inclusive = low_inclusive, high_inclusive
+        self.covered = []  # The WHERE terms this scan answers exactly, set by the planner
+
+    @property
+    def is_point(self):
+        return self.low is not None and self.low == self.high and self.low_inclusive and self.high_inclusive
+
+    @property
+    def name(self):
+        return "Index Point Lookup" if self.is_point else "Index Range Scan"
+
+    def detail(self):
+        if self.is_point:
+            return f"on {self.field} = {self.low!r}"
+        bounds = []
+        if self.low is not None:
+            bounds.append(f"{self.field} {'>=' if self.low_inclusive else '>'} {self.low!r}")
+        if self.high is not None:
+            bounds.append(f"{self.field} {'<=' if self.high_inclusive else '<'} {self.high!r}")
+        return "on " + " AND ".join(bounds)
+
+    def estimate(self, total):
+        stats = self.bptree.stats()
+        entries, keys = stats["entries"], max(stats["keys"], 1)
+        per_key = entries / keys
+        if self.is_point:
+            rows = per_key
+        else:
+            rows = entries * self._range_fraction(stats)
+        self.estimated_rows = min(rows, total)
+        self.estimated_cost = stats["height"] * INDEX_DESCENT_COST + self.estimated_rows * INDEX_ENTRY_COST
+        return self
+
+    def _range_fraction(self, stats):
+        # Interpolate between the index's min and max when the keys are numeric
+        low, high = _to_number(stats["min"]), _to_number(stats["max"])
+        if low is not None and high is not None and high > low:
+            start = _to_number(self.low) if self.low is not None else low
+            end = _to_number(self.high) if self.high is not None else high
+            if start is not None and end is not None:
+                return min(max((end - start) / (high - low), 0.0), 1.0)
+        if self.low is not None and self.high is not None:
+            return BETWEEN_SELECTIVITY
+        return RANGE_SELECTIVITY
+
+    def _execute(self, collection, analyze):
+        yield from self.bptree.iter_range(self.low, self.high, self.low_inclusive, self.high_inclusive)
+
+
+class IndexOrderedScan(PlanNode):
+    """Every doc_id of an index in key order (or reverse), so results come out already sorted."""
+
+    name = "Index Ordered Scan"
+
+    def __init__(self, field, bptree, order):
+        super().__init__()
+        self.field, self.bptree, self.order = field, bptree, order
+        stats = bptree.stats()
+        self.estimated_rows = stats["entries"]
+        self.estimated_cost = stats["height"] * INDEX_DESCENT_COST + stats["entries"] * INDEX_ENTRY_COST
+
+    def detail(self):
+        return f"on {self.field} {self.order.upper()}"
+
+    def _execute(self, collection, analyze):
+        if self.order == "desc":
+            return self.bptree.iter_desc()
+        return self.bptree.iter_range()
+
+
+class IndexIntersection(PlanNode):
+    """AND of several doc_id inputs, probed from the smallest estimated set upwards."""
+
+    name = "Index Intersection"
+
+    def __init__(self, inputs, total):
+        inputs = sorted(inputs, key=lambda node: node.estimated_rows)
+        super().__init__(*inputs)
+        selectivity = 1.0
+        for node in inputs:
+            selectivity *= node.estimated_rows / total if total else 0.0
+        self.estimated_rows = total * selectivity
+        self.estimated_cost = sum(node.estimated_cost + node.estimated_rows * SET_OP_COST for node in inputs)
+
+    def detail(self):
+        return f"{len(self.children)} inputs, smallest first"
+
+    def _execute(self, collection, analyze):
+        survivors = set(self.children[0].execute(collection, analyze))
+        for child in self.children[1:]:
+            if not survivors:
+                break  # Nothing left to intersect; skip the remaining inputs
+            survivors.intersection_update(child.execute(collection, analyze))
+        yield from survivors
+
+
+class IndexUnion(PlanNode):
+    """OR of several doc_id inputs, one per branch of the condition."""
+
+    name = "Index Union"
+
+    def __init__(self, inputs, total):
+        super().__init__(*inputs)
+        self.estimated_rows = min(sum(node.estimated_rows for node in inputs), total)
+        self.estimated_cost = sum(node.estimated_cost + node.estimated_rows * SET_OP_COST for node in inputs)
+
+    def detail(self):
+        return f"{len(self.children)} branches"
+
+    def _execute(self, collection, analyze):
+        seen = set()
+        for child in self.children:
+            for doc_id in child.execute(collection, analyze):
+                if doc_id not in seen:
+                    seen.add(doc_id)
+                    yield doc_id
+
+
+class Fetch(PlanNode):
+    """Resolve doc_ids to records with one hash probe each, applying the predicate."""
+
+    name = "Fetch"
+
+    def __init__(self, child, predicate, selectivity=1.0, recheck=None):
+        super().__init__(child)
+        self.predicate = predicate
+        # The whole WHERE, for records the input found by values newer than the snapshot's
+        self.recheck = recheck
+        self.estimated_rows = child.estimated_rows * selectivity
+        self.estimated_cost = child.estimated_cost + child.estimated_rows * FETCH_COST
+
+    def detail(self):
+        if self.predicate is None or isinstance(self.predicate.node, TrueCondition):
+            return ""
+        return f"filter: {self.predicate}"
+
+    def _execute(self, collection, analyze):
+        # Inputs never repeat a doc_id, so each one is a single hash probe
+        get = collection.records.get
+        matches = None
+        if self.predicate is not None and not isinstance(self.predicate.node, TrueCondition):
+            matches = self.predicate.matches
+        doc_ids = self.children[0].execute(collection, analyze)
+        if self.recheck is not None and isinstance(collection, SnapshotView):
+            yield from self._snapshot_rows(collection, doc_ids, matches)
+            return
+        for doc_id in doc_ids:
+            obj = get(doc_id)
+            if obj is not None and (matches is None or matches(obj.attributes)):
+                yield doc_id, obj
+
+    def _snapshot_rows(self, view, doc_ids, matches):
+        """
+        The input comes from the live indexes or columns, which may be ahead of
+        the snapshot. Records changed since it was taken are tested against the
+        whole WHERE on the version the snapshot sees, and are looked at apart
+        from the input, which may have missed them (for an ordered scan they
+        are merged in at their snapshot key).
+        """
+        live, get = view.collection.records.get, view.records.get
+        sequence, owner = view.snapshot.sequence, view.snapshot.owner
+        recheck = self.recheck.matches
+        # Registered first, so a write from here on freezes the walk before the changes
+        # unstable_ids() has not seen can reach the index
+        doc_ids = view.walk(doc_ids)
+        changed = view.unstable_ids()
+
+        def stable_rows():
+            for doc_id in doc_ids:
+                if doc_id in changed:
+                    continue
+                obj = live(doc_id)
+                if obj is not None and (obj.owner is owner if obj.version is None else obj.version <= sequence):
+                    if matches is None or matches(obj.attributes):
+                        yield doc_id, obj
+                    continue
+                # New, or changed after unstable_ids() was taken; the walk was frozen first, so
+                # the index placed it by the snapshot's version, but check that version in full
+                obj = get(doc_id)
+                if obj is not None and recheck(obj.attributes):
+                    yield doc_id, obj
+
+        def changed_rows(ids):
+            for doc_id in ids:
+                obj = get(doc_id)
+                if obj is not None and recheck(obj.attributes):
+                    yield doc_id, obj
+
+        child = self.children[0]
+        if isinstance(child, IndexOrderedScan) and changed:
+            key = lambda row: order_key(row[1].attributes.get(child.field))
+            reverse = child.order == "desc"
+            early = sorted(changed_rows(changed), key=key, reverse=reverse)
+            yield from heapq.merge(stable_rows(), early, key=key, reverse=reverse)
+        else:
+            yield from changed_rows(changed)
+            yield from stable_rows()
+
+
+class Sort(PlanNode):
+    name = "Sort"
+
+    def __init__(self, child, key, order):
+        super().__init__(child)
+        self.key, self.order = key, order
+        rows = child.estimated_rows
+        self.estimated_rows = rows
+        self.estimated_cost = child.estimated_cost + rows * math.log2(rows + 1) * 0.1
+
+    def detail(self):
+        return f"{self.key} {self.order.upper()}"
+
+    def _execute(self, collection, analyze):
+        key = self.key
+        rows = self.children[0].execute(collection, analyze)
+        return iter(sorted(rows, key=lambda item: order_key(item[1].attributes.get(key)), reverse=(self.order == "desc")))
+
+
+class TopK(Sort):
+    """Sort that only keeps the first k rows, in a bounded heap: O(N log k) instead of O(N log N)."""
+
+    name = "Top-K Sort"
+
+    def __init__(self, child, key, order, k):
+        super().__init__(child, key, order)
+        self.k = k
+        rows = child.estimated_rows
+        self.estimated_rows = min(rows, k)
+        self.estimated_cost = child.estimated_cost + rows * math.log2(k + 1) * 0.1
+
+    def detail(self):
+        return f"{self.key} {self.order.upper()}, keep {self.k}"
+
+    def _execute(self, collection, analyze):
+        key = self.key
+        rows = self.children[0].execute(collection, analyze)
+        # Like sorted(...)[:k], ties included, but never holds more than k rows
+        select = heapq.nlargest if self.order == "desc" else heapq.nsmallest
+        return iter(select(self.k, rows, key=lambda item: order_key(item[1].attributes.get(key))))
+
+
+class Limit(PlanNode):
+    name = "Limit"
+
+    def __init__(self, child, offset, limit):
+        super().__init__(child)
+        self.offset, self.limit = offset, limit
+        rows = max(child.estimated_rows - offset, 0)
+        self.estimated_rows = rows if limit is None else min(rows, limit)
+        self.estimated_cost = child.estimated_cost
+        if limit is not None and not isinstance(child, Sort) and child.estimated_rows > 0:
+            # Unsorted input stops being pulled after offset + limit rows
+            self.estimated_cost *= min(1.0, (offset + limit) / child.estimated_rows)
+
+    def detail(self):
+        return f"offset {self.offset}" + (f", limit {self.limit}" if self.limit is not None else "")
+
+    def _execute(self, collection, analyze):
+        # islice stops pulling from the input once offset + limit rows have gone by
+        stop = None if self.limit is None else self.offset + self.limit
+        return islice(self.children[0].execute(collection, analyze), self.offset, stop)
+
+
+class Project(PlanNode):
+    """Turn (id, object) pairs into result dicts with the selected fields."""
+
+    name = "Project"
+
+    def __init__(self, child, fields):
+        super().__init__(child)
+        self.fields = fields
+        self.estimated_rows = child.estimated_rows
+        self.estimated_cost = child.estimated_cost
+
+    def detail(self):
+        return ", ".join(self.fields) if self.fields else "*"
+
+    def _execute(self, collection, analyze):
+        fields = self.fields
+        for obj_id, obj in self.children[0].execute(collection, analyze):
+            if fields:
+                output = {field: obj.attributes.get(field, '') for field in fields}
+            else:
+                output = obj.attributes
+            yield {"ID": obj_id, **output}
+
+
+def _behind(collection):
+    """Whether a plan runs against a snapshot that the live indexes and columns are ahead of."""
+    return isinstance(collection, SnapshotView) and not collection.is_current()
+
+
+def _snapshot_aggregate(collection, predicate, group_by, aggregates):
+    """Aggregate record by record over what the snapshot sees, for when the statistics can't be trusted."""
+    table = GroupTable(group_by, aggregates)
+    matches = predicate.matches
+    for _, obj in collection.records.items():
+        if matches(obj.attributes):
+            table.add(obj.attributes)
+    return table.rows()
+
+
+class Aggregate(PlanNode):
+    """Aggregates computed in one pass over the matching records, grouped in a hash table."""
+
+    def __init__(self, child, group_by, aggregates, groups):
+        super().__init__(child)
+        self.group_by, self.aggregates = group_by, aggregates
+        self.estimated_rows = min(groups, child.estimated_rows) if group_by else 1
+        self.estimated_cost = child.estimated_cost + child.estimated_rows * AGGREGATE_COST * len(aggregates)
+
+    @property
+    def name(self):
+        return "Hash Aggregate" if self.group_by else "Aggregate"
+
+    def detail(self):
+        columns = ", ".join(column_name(func, field) for func, field in self.aggregates)
+        return columns + (f" group by {', '.join(self.group_by)}" if self.group_by else "")
+
+    def _execute(self, collection, analyze):
+        table = GroupTable(self.group_by, self.aggregates)
+        add = table.add
+        for _, obj in self.children[0].execute(collection, analyze):
+            add(obj.attributes)
+        yield from table.rows()
+
+
+class IndexAggregate(PlanNode):
+    """
+    Ungrouped COUNT/MIN/MAX answered from B+ tree statistics, without
+    reading a record. COUNT(*) under a WHERE counts the doc_ids of an index
+    access path that answers every term.
+    """
+
+    name = "Index-Only Aggregate"
+
+    def __init__(self, aggregates, predicate, count_input=None):
+        super().__init__(*([count_input] if count_input is not None else []))
+        self.aggregates, self.predicate = aggregates, predicate
+        self.estimated_rows = 1
+        self.estimated_cost = count_input.estimated_cost if count_input is not None else 1.0
+
+    def detail(self):
+        return ", ".join(column_name(func, field) for func, field in self.aggregates)
+
+    def _execute(self, collection, analyze):
+        if _behind(collection):
+            yield from _snapshot_aggregate(collection, self.predicate, [], self.aggregates)
+            return
+        count = None
+        row = {}
+        for func, field in self.aggregates:
+            if func == "COUNT" and field == "*":
+                if count is None:
+                    if self.children:
+                        count = sum(1 for _ in self.children[0].execute(collection, analyze))
+                    else:
+                        count = len(collection.records)
+                value = count
+            elif func == "COUNT":
+                value = collection.indexes[field].entry_count
+            elif func == "MIN":
+                value = collection.indexes[field].min_key()
+            else:
+                value = collection.indexes[field].max_key()
+            row[column_name(func, field)] = value
+        yield row
+
+
+class ColumnarAggregate(PlanNode):
+    """Ungrouped aggregates over the columnar shadow: the WHERE is a mask, each aggregate one array reduction."""
+
+    name = "Columnar Aggregate"
+
+    def __init__(self, node, aggregates, total):
+        super().__init__()
+        self.node, self.aggregates = node, aggregates
+        self.estimated_rows = 1
+        self.estimated_cost = total * COLUMN_COST * (columnar.count_comparisons(node) + len(aggregates))
+
+    def detail(self):
+        columns = ", ".join(column_name(func, field) for func, field in self.aggregates)
+        if isinstance(self.node, TrueCondition):
+            return columns
+        return f"{columns} filter: {self.node!r}"
+
+    def _execute(self, collection, analyze):
+        row = None if _behind(collection) else collection.columns.aggregate(self.node, self.aggregates)
+        if row is None or _behind(collection):
+            # Some column can't be represented exactly, or the columns are ahead of the
+            # snapshot; aggregate record by record
+            row = next(_snapshot_aggregate(collection, Predicate(self.node), [], self.aggregates))
+        yield row
+
+
+class IndexGroupCount(PlanNode):
+    """COUNT per key of a GROUP BY field, read off the leaves of its index."""
+
+    name = "Index Group Count"
+
+    def __init__(self, field, bptree, aggregates, total):
+        super().__init__()
+        self.field, self.bptree, self.aggregates, self.total = field, bptree, aggregates, total
+        stats = bptree.stats()
+        self.estimated_rows = stats["keys"] + (1 if stats["entries"] < total else 0)
+        self.estimated_cost = stats["height"] * INDEX_DESCENT_COST + stats["keys"] * INDEX_ENTRY_COST
+
+    def detail(self):
+        columns = ", ".join(column_name(func, field) for func, field in self.aggregates)
+        return f"{columns} group by {self.field}"
+
+    def _execute(self, collection, analyze):
+        if _behind(collection):
+            yield from _snapshot_aggregate(collection, Predicate(TrueCondition()), [self.field], self.aggregates)
+            return
+        for key, doc_ids in self.bptree.items():
+            yield {self.field: key, **{column_name(func, field): len(doc_ids) for func, field in self.aggregates}}
+        missing = len(collection.records) - self.bptree.entry_count
+        if missing > 0:
+            # Records without the field form their own group, which the index never saw
+            yield {self.field: None, **{column_name(func, field): missing if field == "*" else 0 for func, field in self.aggregates}}
+
+
+class Planner:
+    """
+    Chooses the access path for a WHERE clause by estimated cost: a full
+    scan, an index point lookup, an index range scan, the intersection of
+    several index scans, a columnar scan or a full scan split across worker
+    processes, using each BPlusTree's cardinality statistics.
+    """
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.total = len(collection.records)
+
+    def selectivity(self, node):
+        """Estimated fraction of records satisfying a condition."""
+        if isinstance(node, TrueCondition):
+            return 1.0
+        if isinstance(node, And):
+            result = 1.0
+            for child in node.children:
+                result *= self.selectivity(child)
+            return result
+        if isinstance(node, Or):
+            miss = 1.0
+            for child in node.children:
+                miss *= 1.0 - self.selectivity(child)
+            return 1.0 - miss
+        if isinstance(node, Not):
+            return 1.0 - self.selectivity(node.child)
+        if node.field in self.collection.indexes and self.total:
+            scan = self._scan_for(node.field, [node])
+            if scan is not None:
+                return scan.estimate(self.total).estimated_rows / self.total
+        if node.op == "==":
+            return EQ_SELECTIVITY
+        if node.op == "!=":
+            return NE_SELECTIVITY
+        return RANGE_SELECTIVITY
+
+    def plan(self, predicate, selected_fields=None, sort_key=None, sort_order="asc", offset=0, limit=None):
+        """Full plan for a SHOW ... RECORDS statement: access path, then sort, limit and projection."""
+        plan = self.finish(self.plan_access(predicate), selected_fields, sort_key, sort_order, offset, limit)
+        if sort_key:
+            ordered = self._ordered_plan(predicate, selected_fields, sort_key, sort_order, offset, limit)
+            if ordered is not None and ordered.estimated_cost < plan.estimated_cost:
+                return ordered
+        return plan
+
+    def _ordered_plan(self, predicate, selected_fields, sort_key, sort_order, offset, limit):
+        """
+        Read the records in sort order off the sort key's index, filtering as
+        they come, so a LIMIT stops the walk early and nothing is sorted.
+        """
+        bptree = self.collection.indexes.get(sort_key)
+        # Records without the field sort as "" but are absent from the index, so
+        # the walk is only complete when every record has an entry
+        if bptree is None or not self.total or bptree.entry_count != self.total:
+            return None
+        if bptree.numeric_text:
+            return None  # The tree orders that text as text, the results as numbers
+        scan = IndexOrderedScan(sort_key, bptree, sort_order)
+        node = Fetch(scan, predicate, self.selectivity(predicate.node), recheck=predicate)
+        if offset or limit is not None:
+            node = Limit(node, offset, limit)
+        return Project(node, selected_fields)
+
+    def plan_ids(self, doc_ids, selected_fields=None, sort_key=None, sort_order="asc", offset=0, limit=None):
+        return self.finish(Fetch(IdLookup(doc_ids), None), selected_fields, sort_key, sort_order, offset, limit)
+
+    def finish(self, node, selected_fields, sort_key, sort_order, offset, limit):
+        if sort_key and limit is not None:
+            node = TopK(node, sort_key, sort_order, offset + limit)
+        elif sort_key:
+            node = Sort(node, sort_key, sort_order)
+        if offset or limit is not None:
+            node = Limit(node, offset, limit)
+        return Project(node, selected_fields)
+
+    def plan_aggregate(self, predicate, group_by, aggregates):
+        """Plan SHOW ... AGGREGATE: from index statistics when possible, else one streaming pass."""
+        terms = conjuncts(predicate.node)
+        if not group_by:
+            index_only = self._index_only_aggregate(predicate, terms, aggregates)
+            if index_only is not None:
+                return index_only
+        elif len(group_by) == 1 and not terms and group_by[0] in self.collection.indexes:
+            field = group_by[0]
+            if all(func == "COUNT" and agg_field in ("*", field) for func, agg_field in aggregates):
+                return IndexGroupCount(field, self.collection.indexes[field], aggregates, self.total)
+
+        groups = self.total
+        if len(group_by) == 1 and group_by[0] in self.collection.indexes:
+            groups = self.collection.indexes[group_by[0]].key_count + 1
+        plan = Aggregate(self.plan_access(predicate), group_by, aggregates, groups)
+        if not group_by and self._columnar() and columnar.vectorizable(predicate.node):
+            vectorized = ColumnarAggregate(predicate.node, aggregates, self.total)
+            if vectorized.estimated_cost < plan.estimated_cost:
+                return vectorized
+        return plan
+
+    def _columnar(self):
+        """Whether the columnar shadow is worth considering for this collection."""
+        return columnar.available() and self.total >= COLUMNAR_MIN_ROWS
+
+    def _index_only_aggregate(self, predicate, terms, aggregates):
+        indexes = self.collection.indexes
+        if terms:
+            # Under a WHERE only COUNT(*) qualifies, and only if one access path answers every term
+            if any(func != "COUNT" or field != "*" for func, field in aggregates):
+                return None
+            exact = [node for node, covered in self._access_paths(terms) if len(covered) == len(terms)]
+            if not exact:
+                return None
+            return IndexAggregate(aggregates, predicate, min(exact, key=lambda node: node.estimated_cost))
+        for func, field in aggregates:
+            if not (field == "*" or (func in ("COUNT", "MIN", "MAX") and field in indexes)):
+                return None
+            if func != "COUNT" and indexes[field].numeric_text:
+                return None  # The tree's ends aren't the extremes once text spells numbers
+        return IndexAggregate(aggregates, predicate)
+
+    def plan_access(self, predicate):
+        """Pick the cheapest way to produce the (id, object) pairs matching a predicate."""
+        terms = conjuncts(predicate.node)
+
+        # A top-level ID term is a direct hash probe; nothing beats it
+        id_terms = [t for t in terms if isinstance(t, Comparison) and t.field == "ID" and t.op == "=="]
+        if id_terms:
+            ids = {t.value for t in id_terms}
+            residual = Predicate(make_and([t for t in terms if t not in id_terms]))
+            lookup = IdLookup(list(ids) if len(ids) == 1 else [])
+            return Fetch(lookup, residual, self.selectivity(residual.node))
+
+        best = FullScan(predicate, self.total, self.selectivity(predicate.node))
+        for access, covered in self._access_paths(terms):
+            # Terms the index answered exactly need no second look; the rest are
+            # checked only against the candidates that survive the index step
+            residual = [term for term in terms if all(term is not done for done in covered)]
+            residual_node = make_and(residual)
+            fetch = Fetch(access, Predicate(residual_node) if residual else None, self.selectivity(residual_node), predicate)
+            if fetch.estimated_cost < best.estimated_cost:
+                best = fetch
+
+        workers = parallel.worker_count(self.collection.PARALLEL_WORKERS)
+        if workers > 1 and terms:
+            # Workers test every record; the parent only fetches the matches
+            fetch = Fetch(ParallelScan(predicate, self.total, self.selectivity(predicate.node), workers), None)
+            if fetch.estimated_cost < best.estimated_cost:
+                best = fetch
+
+        vector_terms = [term for term in terms if columnar.vectorizable(term)] if self._columnar() else []
+        if vector_terms:
+            # Numeric terms become one mask over the columns; the rest are checked on the survivors
+            residual = [term for term in terms if all(term is not done for done in vector_terms)]
+            residual_node = make_and(residual)
+            node = make_and(vector_terms)
+            scan = ColumnarScan(node, self.total, self.selectivity(node))
+            fetch = Fetch(scan, Predicate(residual_node) if residual else None, self.selectivity(residual_node), predicate)
+            if fetch.estimated_cost < best.estimated_cost:
+                best = fetch
+        return best
+
+    def _access_paths(self, terms):
+        """
+        Every index-based way to produce candidate doc_ids for a list of AND
+        terms, as (node, covered_terms) pairs: single scans, unions for OR
+        terms, and intersections of the k most selective of those.
+        """
+        paths = [(scan, scan.covered) for scan in self._index_scans(terms)]
+        for term in terms:
+            if isinstance(term, Or):
+                union = self._union_for(term)
+                if union is not None:
+                    paths.append(union)
+        paths.sort(key=lambda path: path[0].estimated_rows)
+
+        for k in range(2, len(paths) + 1):
+            chosen = paths[:k]
+            intersection = IndexIntersection([node for node, _ in chosen], self.total)
+            paths.append((intersection, [term for _, covered in chosen for term in covered]))
+        return paths
+
+    def _union_for(self, node):
+        """Union the best access path of each OR branch, or None if some branch can't use an index."""
+        inputs, exact = [], True
+        for branch in node.children:
+            branch_terms = conjuncts(branch)
+            options = self._access_paths(branch_terms)
+            if not options:
+                return None
+            access, covered = min(options, key=lambda path: path[0].estimated_cost + path[0].estimated_rows * FETCH_COST)
+            exact = exact and len(covered) == len(branch_terms)
+            inputs.append(access)
+        # An inexact branch leaves the whole OR term to the residual check
+        return IndexUnion(inputs, self.total), ([node] if exact else [])
+
+    def _index_scans(self, terms):
+        field_terms = {}
+        for term in terms:
+            if isinstance(term, Comparison) and term.field in self.collection.indexes:
+                field_terms.setdefault(term.field, []).append(term)
+        scans = []
+        for field, comparisons in field_terms.items():
+            scan = self._scan_for(field, comparisons)
+            if scan is not None:
+                scans.append(scan.estimate(self.total))
+        return scans
+
+    def _scan_for(self, field, comparisons):
+        """Turn one field's comparisons into a single IndexScan, or None if the index can't serve them."""
+        # Records without the field never reach the index, so for the index to be
+        # exact the field's terms must reject a record that lacks it
+        if all(term.compile()({}) for term in comparisons):
+            return None
+        # Keys are ordered by type first; a scan only stays within the literal's
+        # type (and agrees with the full scan) if every key in the index has it
+        bptree = self.collection.indexes[field]
+        ranks = {sort_key(term.value)[0] for term in comparisons}
+        if bptree.key_count and ranks != {sort_key(bptree.min_key())[0], sort_key(bptree.max_key())[0]}:
+            return None
+        low, high, low_inclusive, high_inclusive = None, None, True, True
+        covered = []
+        for term in comparisons:
+            op, value = term.op, term.value
+            if op == "==":
+                low, high, low_inclusive, high_inclusive = value, value, True, True
+                covered = [term]
+                break
+            if op in (">", ">="):
+                # Keep the tighter bound; either way the scan implies this term
+                if low is None or value > low or (value == low and op == ">"):
+                    low, low_inclusive = value, op == ">="
+                covered.append(term)
+            elif op in ("<", "<="):
+                if high is None or value < high or (value == high and op == "<"):
+                    high, high_inclusive = value, op == "<="
+                covered.append(term)
+            # != is left to the residual filter: a record without the field
+            # satisfies it, and such a record never reaches the index
+        scan = IndexScan(field, bptree, low, high, low_inclusive, high_inclusive)
+        scan.covered = covered
+        return scan
+
+
+def explain(plan, analyze=False):
+    """Render a plan as (text, rows): one row per operator with estimates and, for ANALYZE, actuals."""
+    rows, lines = [], []
+    for depth, node in plan.walk():
+        row = {
+            "operator": node.name,
+            "detail": node.detail(),
+            "depth": depth,
+            "estimated_rows": round(node.estimated_rows, 1),
+            "estimated_cost": round(node.estimated_cost, 1),
+        }
+        line = f"{'  ' * depth}-> {node.name}"
+        if row["detail"]:
+            line += f" ({row['detail']})"
+        line += f"  [est rows={row['estimated_rows']} cost={row['estimated_cost']}]"
+        if analyze:
+            row["actual_rows"] = node.actual_rows
+            row["time_ms"] = round(node.elapsed * 1000, 3) if node.elapsed is not None else None
+            line += f" [actual rows={row['actual_rows']} time={row['time_ms']}ms]"
+        rows.append(row)
+        lines.append(line)
+    return "\n".join(lines), rows
@@ -0,0 +1,316 @@
+import operator
+import re
+from functools import lru_cache
+from .schema import coerce_like, infer_value
+
+COMPARATORS = {
+    "==": operator.eq, "!=": operator.ne,
+    ">": operator.gt, ">=": operator.ge,
+    "<": operator.lt, "<=": operator.le,
+}
+
+# Strings, comparison operators, parentheses and bare words (field names, keywords, values)
+TOKEN_PATTERN = re.compile(r'\s*(?:("[^"]*"|\'[^\']*\')|(==|!=|>=|<=|=|>|<)|([()])|([^\s()=!<>"\']+))')
+
+
+class Comparison:
+    def __init__(self, field, op, value):
+        self.field = field
+        self.op = op
+        self.value = value
+
+    def __repr__(self):
+        return f"{self.field} {self.op} {self.value!r}"
+
+    def compile(self):
+        field, value, compare = self.field, self.value, COMPARATORS[self.op]
+        if isinstance(value, str):
+            if self.op == "==":
+                return lambda attributes: attributes.get(field, "") == value
+
+            def predicate(attributes):
+                try:
+                    return compare(attributes.get(field, ""), value)
+                except TypeError:
+                    return False  # Values of unrelated types never match
+            return predicate
+
+        # Typed literal: stored text (records from before values were typed) is
+        # converted on the fly; a missing or unconvertible value compares as None
+        if self.op in ("==", "!="):
+            def predicate(attributes):
+                current = attributes.get(field)
+                if current.__class__ is str:
+                    current = coerce_like(current, value)
+                return compare(current, value)
+            return predicate
+
+        def predicate(attributes):
+            current = attributes.get(field)
+            if current.__class__ is str:
+                current = coerce_like(current, value)
+            try:
+                return compare(current, value)
+            except TypeError:
+                return False
+        return predicate
+
+
+class Param:
+    """Placeholder for a literal lifted out of a cached statement; see bind_params()."""
+
+    def __init__(self, position):
+        self.position = position
+
+    def __repr__(self):
+        return f"${self.position}"
+
+
+class And:
+    def __init__(self, children):
+        self.children = children
+
+    def __repr__(self):
+        return "(" + " AND ".join(map(repr, self.children)) + ")"
+
+    def compile(self):
+        compiled = [child.compile() for child in self.children]
+        if len(compiled) == 2:
+            first, second = compiled
+            return lambda attributes: first(attributes) and second(attributes)
+        return lambda attributes: all(predicate(attributes) for predicate in compiled)
+
+
+class Or:
+    def __init__(self, children):
+        self.children = children
+
+    def __repr__(self):
+        return "(" + " OR ".join(map(repr, self.children)) + ")"
+
+    def compile(self):
+        compiled = [child.compile() for child in self.children]
+        if len(compiled) == 2:
+            first, second = compiled
+            return lambda attributes: first(attributes) or second(attributes)
+        return lambda attributes: any(predicate(attributes) for predicate in compiled)
+
+
+class Not:
+    def __init__(self, child):
+        self.child = child
+
+    def __repr__(self):
+        return f"NOT {self.child!r}"
+
+    def compile(self):
+        inner = self.child.compile()
+        return lambda attributes: not inner(attributes)
+
+
+class TrueCondition:
+    """Matches every record; used for an empty WHERE clause."""
+
+    def __repr__(self):
+        return "TRUE"
+
+    def compile(self):
+        return lambda attributes: True
+
+
+class Parser:
+    """
+    Recursive-descent parser for WHERE clauses:
+
+        expr       := term (OR term)*
+        term       := factor (AND factor)*
+        factor     := NOT factor | '(' expr ')' | comparison
+        comparison := field (= | == | != | > | >= | < | <=) value
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.tokens = self._tokenize(text)
+        self.pos = 0
+
+    def _tokenize(self, text):
+        tokens = []
+        pos = 0
+        text = text.rstrip()
+        while pos < len(text):
+            match = TOKEN_PATTERN.match(text, pos)
+            if not match or match.end() == pos:
+                raise SyntaxError(f"Invalid condition near: {text[pos:]!r}")
+            quoted, op, paren, word = match.groups()
+            if quoted is not None:
+                tokens.append(("value", quoted[1:-1]))
+            elif op is not None:
+                tokens.append(("op", "==" if op == "=" else op))
+            elif paren is not None:
+                tokens.append((paren, paren))
+            else:
+                tokens.append(("word", word))
+            pos = match.end()
+        return tokens
+
+    def _peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def _next(self):
+        token = self._peek()
+        self.pos += 1
+        return token
+
+    def _keyword(self, word):
+        kind, value = self._peek()
+        return kind == "word" and value.lower() == word
+
+    def parse(self):
+        if not self.tokens:
+            return TrueCondition()
+        node = self._expr()
+        if self.pos != len(self.tokens):
+            raise SyntaxError(f"Unexpected {self._peek()[1]!r} in condition: {self.text}")
+        return node
+
+    def _expr(self):
+        children = [self._term()]
+        while self._keyword("or"):
+            self._next()
+            children.append(self._term())
+        return children[0] if len(children) == 1 else Or(children)
+
+    def _term(self):
+        children = [self._factor()]
+        while self._keyword("and"):
+            self._next()
+            children.append(self._factor())
+        return children[0] if len(children) == 1 else And(children)
+
+    def _factor(self):
+        if self._keyword("not"):
+            self._next()
+            return Not(self._factor())
+        kind, _ = self._peek()
+        if kind == "(":
+            self._next()
+            node = self._expr()
+            if self._next()[0] != ")":
+                raise SyntaxError(f"Missing ')' in condition: {self.text}")
+            return node
+        return self._comparison()
+
+    def _comparison(self):
+        kind, field = self._next()
+        if kind != "word":
+            raise SyntaxError(f"Expected a field name in condition: {self.text}")
+        kind, op = self._next()
+        if kind != "op":
+            raise SyntaxError(f"Expected a comparison operator after {field!r}")
+        kind, value = self._next()
+        if kind not in ("word", "value"):
+            raise SyntaxError(f"Expected a value after {field} {op}")
+        if kind == "word" and field != "ID":
+            value = infer_value(value)  # Unquoted: 30 is a number, true a bool; quoted stays text
+        return Comparison(field, op, value)
+
+
+def conjuncts(node):
+    """Split a condition into its top-level AND terms."""
+    if isinstance(node, And):
+        return list(node.children)
+    if isinstance(node, TrueCondition):
+        return []
+    return [node]
+
+
+def make_and(nodes):
+    """Combine condition nodes with AND (an empty list matches everything)."""
+    if not nodes:
+        return TrueCondition()
+    return nodes[0] if len(nodes) == 1 else And(list(nodes))
+
+
+def parameterize(node):
+    """
+    Replace every "?" value (in textual order) with a Param placeholder and
+    return the parameter count. Used on conditions normalized by the plan cache.
+    """
+    count = 0
+
+    def walk(current):
+        nonlocal count
+        if isinstance(current, Comparison):
+            if current.value == "?":
+                current.value = Param(count)
+                count += 1
+        elif isinstance(current, (And, Or)):
+            for child in current.children:
+                walk(child)
+        elif isinstance(current, Not):
+            walk(current.child)
+
+    walk(node)
+    return count
+
+
+def bind_params(node, params):
+    """Return a copy of a parameterized condition with its placeholders filled in."""
+    if isinstance(node, Comparison):
+        value = params[node.value.position] if isinstance(node.value, Param) else node.value
+        return Comparison(node.field, node.op, value)
+    if isinstance(node, And):
+        return And([bind_params(child, params) for child in node.children])
+    if isinstance(node, Or):
+        return Or([bind_params(child, params) for child in node.children])
+    if isinstance(node, Not):
+        return Not(bind_params(node.child, params))
+    return node
+
+
+def bind_schema(node, schema):
+    """
+    Convert the literals of a condition to the declared types of their
+    fields, so "age > '30'" compares as a number on an int field. Returns
+    the node itself when nothing changes.
+    """
+    if not schema:
+        return node
+    if isinstance(node, Comparison):
+        if node.field not in schema.types or isinstance(node.value, Param):
+            return node
+        value = schema.coerce_value(node.field, node.value)
+        if value == node.value and type(value) is type(node.value):
+            return node
+        return Comparison(node.field, node.op, value)
+    if isinstance(node, (And, Or)):
+        children = [bind_schema(child, schema) for child in node.children]
+        if all(new is old for new, old in zip(children, node.children)):
+            return node
+        return type(node)(children)
+    if isinstance(node, Not):
+        child = bind_schema(node.child, schema)
+        return node if child is node.child else Not(child)
+    return node
+
+
+class Predicate:
+    """A parsed WHERE clause together with its compiled closure."""
+
+    def __init__(self, node):
+        self.node = node
+        self.matches = node.compile()  # Callable taking a record's attributes dict
+
+    def __repr__(self):
+        return repr(self.node)
+
+    @classmethod
+    def from_dict(cls, condition_dict):
+        """Build an equality-only predicate from {field: value} (as UPDATE/DELETE pass)."""
+        return cls(make_and([Comparison(k, "==", v) for k, v in condition_dict.items()]))
+
+
+@lru_cache(maxsize=256)
+def compile_condition(condition_str):
+    """Parse and compile a WHERE clause once; repeated conditions reuse the result."""
+    return Predicate(Parser(condition_str).parse())
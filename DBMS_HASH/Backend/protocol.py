@@ -0,0 +1,65 @@
+import asyncio
+import json
+import struct
+
+# Every message is a 4-byte big-endian length followed by that many bytes of UTF-8 JSON.
+# Requests:  {"id": <any>, "query": "<statement>"}
+#            {"id": <any>, "queries": ["<statement>", ...]}  -- a batch, run in order
+# Responses: {"id": <the request's>, "result": <what process_query returned>}
+#            {"id": <the request's>, "error": {"type": "SyntaxError", "message": "..."}}
+#            {"id": <the request's>, "results": [{"result": ...} or {"error": ...}, ...]}
+HEADER = struct.Struct("!I")
+MAX_FRAME = 64 * 1024 * 1024  # A garbled length must not make the reader allocate gigabytes
+DEFAULT_PORT = 7433
+
+
+class ProtocolError(ValueError):
+    pass
+
+
+def encode(message):
+    """A message as one frame. Values JSON can't hold are sent as their str()."""
+    payload = json.dumps(message, default=str, separators=(",", ":")).encode()
+    if len(payload) > MAX_FRAME:
+        raise ProtocolError(f"Message of {len(payload)} bytes is over the {MAX_FRAME}-byte frame limit.")
+    return HEADER.pack(len(payload)) + payload
+
+
+def frame_length(header):
+    (length,) = HEADER.unpack(header)
+    if length > MAX_FRAME:
+        raise ProtocolError(f"Frame of {length} bytes is over the {MAX_FRAME}-byte limit.")
+    return length
+
+
+def decode(payload):
+    try:
+        return json.loads(payload)
+    except ValueError as e:
+        raise ProtocolError(f"Frame is not valid JSON: {e}")
+
+
+async def read_message(reader):
+    """The next message from an asyncio StreamReader, or None once the peer has closed."""
+    try:
+        header = await reader.readexactly(HEADER.size)
+    except asyncio.IncompleteReadError as e:
+        if not e.partial:
+            return None  # Closed between messages
+        raise ProtocolError("Connection closed in the middle of a frame.")
+    try:
+        return decode(await reader.readexactly(frame_length(header)))
+    except asyncio.IncompleteReadError:
+        raise ProtocolError("Connection closed in the middle of a frame.")
+
+
+def recv_message(file):
+    """The next message from a socket's makefile("rb"), or None once the peer has closed."""
+    header = file.read(HEADER.size)
+    if not header:
+        return None
+    length = frame_length(header) if len(header) == HEADER.size else -1
+    payload = file.read(length) if length >= 0 else b""
+    if len(payload) != length:
+        raise ProtocolError("Connection closed in the middle of a frame.")
+    return decode(payload)
@@ -1,220 +1,578 @@
-from .transaction import TransactionManager
-def query_processor(dbms):
-    transaction_manager = TransactionManager(dbms.root_path)  # Create a TransactionManager instance
-    print("\n--- Query Mode (type 'exit' to quit) ---")
-    while True:
-        query = input(">> ").strip()
-        if query.lower() == 'exit':
-            transaction_manager.rollback()  # Manually call cleanup before exiting
-            break
-        process_query(query, dbms, transaction_manager)
-
-
-def process_query(query, dbms,transaction_manager):
-    tokens = query.split()
-    if not tokens:
-        raise SyntaxError("Empty query")  # No query
-
-    cmd = tokens[0].lower()
-    results = []
-    if cmd == "begin":
-            # Begin a new transaction
-        transaction_manager.begin()
-
-    elif cmd == "commit":
-            # Commit the transaction
-        transaction_manager.commit()
-
-    elif cmd == "rollback":
-            # Rollback the transaction
-        transaction_manager.rollback()
-        
-    if cmd == "create":
-        if tokens[1].lower() == "database":
-            return dbms.create_database(tokens[2])
-            
-        elif tokens[1].lower() == "collection":
-            db = dbms.get_current_database()
-            if db:
-                return db.create_collection(tokens[2])
-                
-        elif tokens[1].lower() == "index":
-            # Ensure the format is correct: CREATE INDEX <index_name> ON <collection_name> (<attribute_name>)
-            if len(tokens) != 6 or tokens[3].lower() != "on":
-                print("Error: Invalid CREATE INDEX query format")
-                return
-
-            index_name = tokens[2]             # idx_rollno
-            collection_name = tokens[4]        # Student
-            attribute_token = tokens[5]        # (rollno)
-
-            if not (attribute_token.startswith("(") and attribute_token.endswith(")")):
-                print("Error: Invalid attribute format. Use (attribute_name)")
-                return
-
-            attribute_name = attribute_token[1:-1]  # Strip parentheses
-
-            db = dbms.get_current_database()
-            if db:
-                collection = db.get_collection(collection_name)
-                if collection:
-                    collection.create_index(attribute_name)
-                    print(f"Index '{index_name}' created on attribute '{attribute_name}' in collection '{collection_name}'.")
-                else:
-                    print(f"Collection '{collection_name}' not found.")
-            else:
-                print("No database selected.")
-
-
-                
-    elif cmd == "use":
-        if len(tokens) >= 3 and tokens[1].lower() == "database":
-            db_name = tokens[2]
-            if not dbms.set_current_database(db_name):
-                return None  # Invalid DB
-        else:
-            return None  # Invalid syntax
-
-    elif cmd == "insert":
-        if tokens[1].lower() == "into":
-            collection_name = tokens[2]
-            fields = {k: v for kv in tokens[3:] if '=' in kv for k, v in [kv.split('=')]}
-            db = dbms.get_current_database()
-            if db:
-                collection = db.get_collection(collection_name)
-                if collection:
-                    message, inserted = collection.create_object(**fields)
-                    return {"message": message, "records": inserted}
-            raise ValueError("Collection not found.")
-
-    elif cmd == "show":
-        if len(tokens) < 2:
-            raise SyntaxError("Missing keyword after SHOW")
-        elif tokens[1].lower() == "databases":
-            databases = dbms.show_databases()
-            return [{"Database": name} for name in databases]
-
-        elif tokens[1].lower() == "collections":
-            db = dbms.get_current_database()
-            if db:
-                collections = db.show_all_collections()
-                return [{"Collection": name} for name in collections]
-            else:
-                raise SyntaxError("No database selected")
-        elif len(tokens) >= 3 and tokens[2].lower() == "records":
-            collection_name = tokens[1]
-            db = dbms.get_current_database()
-            if not db:
-                return None
-
-            collection = db.get_collection(collection_name)
-            if not collection:
-                raise SyntaxError("Collection don't exist.")
-
-            fields = None
-            condition_str = ""
-            sort_key = None
-            sort_order = "asc"
-            offset = 0
-            limit = None
-
-            # Convert query to lowercase for keywords but preserve original tokens for values
-            lower_tokens = [token.lower() for token in tokens]
-
-            # Handle SELECT fields
-            if "select" in lower_tokens:
-                select_index = lower_tokens.index("select")
-                end_index = min([lower_tokens.index(kw) for kw in ["where", "sortby", "offset", "limit"] if kw in lower_tokens and lower_tokens.index(kw) > select_index] + [len(tokens)])
-                fields = tokens[select_index + 1:end_index]
-
-            # Handle WHERE condition
-            if "where" in lower_tokens:
-                where_index = lower_tokens.index("where")
-                end_index = min([lower_tokens.index(kw) for kw in ["sortby", "offset", "limit"] if kw in lower_tokens and lower_tokens.index(kw) > where_index] + [len(tokens)])
-                condition_str = " ".join(tokens[where_index + 1:end_index])
-
-            # Handle SORTBY key [asc|desc]
-            if "sortby" in lower_tokens:
-                sort_index = lower_tokens.index("sortby")
-                sort_key = tokens[sort_index + 1]
-                if len(tokens) > sort_index + 2 and tokens[sort_index + 2].lower() in ["asc", "desc"]:
-                    sort_order = tokens[sort_index + 2].lower()
-
-            # Handle OFFSET
-            if "offset" in lower_tokens:
-                try:
-                    offset = int(tokens[lower_tokens.index("offset") + 1])
-                except:
-                    offset = 0
-
-            # Handle LIMIT
-            if "limit" in lower_tokens:
-                try:
-                    limit = int(tokens[lower_tokens.index("limit") + 1])
-                except:
-                    limit = None
-
-            records =  collection.find_with_conditions(condition_str, fields, sort_key, sort_order, offset, limit)
-            message = f"{len(records)} record(s) found." if records else "No records found."
-            return {"message": message, "records": records}
-
-    elif cmd == "update":
-        collection_name = tokens[1]
-        if tokens[2].lower() == "set":
-            update_key, update_value = tokens[3].split("=")
-            if tokens[4].lower() == "where":
-                cond_key, cond_value = tokens[5].split("=")
-                db = dbms.get_current_database()
-                if db:
-                    collection = db.get_collection(collection_name)
-                    if collection:
-                        message, updated_records = collection.update(
-                            {cond_key: cond_value}, {update_key: update_value}
-                        )
-                        return {"message": message, "records": updated_records}
-
-
-    elif cmd == "delete":
-        if tokens[1].lower() == "from":
-            collection_name = tokens[2]
-            if tokens[3].lower() == "where":
-                key, value = tokens[4].split("=")
-                db = dbms.get_current_database()
-                if db:
-                    collection = db.get_collection(collection_name)
-                    if collection:
-                        collection.delete({key: value})
-                        
-        elif tokens[1].lower() == "database":
-            dbms.delete_database(tokens[2])   
-            
-        elif tokens[1].lower() == "collection":
-            db = dbms.get_current_database()
-            if db:
-                return db.delete_collection(tokens[2])  
-
-    elif cmd == "rename":
-        if tokens[1].lower() == "database":
-            dbms.rename_database(tokens[2], tokens[4])
-        elif tokens[1].lower() == "collection":
-            db = dbms.get_current_database()
-            if db:
-                db.rename_collection(tokens[2], tokens[4])
-    
-    elif cmd == "drop" and tokens[1].lower() == "index":
-        index_name = tokens[2].lower()
-        collection_name = tokens[4]
-
-        db = dbms.get_current_database()
-        if db:
-            collection = db.get_collection(collection_name)
-            if collection:
-                collection.remove_index(index_name)
-                print(f"Index '{index_name}' has been dropped from '{collection_name}'.")
-            else:
-                print(f"Collection '{collection_name}' not found.")
-        else:
-            print("No active database found.")
-   
-
-    return results if results else None
+import json
+import re
+from .aggregation import parse_aggregates
+from .cursor import Cursor
+from .indexing import DEFAULT_ORDER
+from .plan_cache import normalize_query
+from .planner import Planner, explain
+from .predicate import Parser, Predicate, bind_params, parameterize
+from .schema import Schema, parse_literal
+from .transaction import TransactionManager
+
+# Matches "ID=<id>" and "ID IN (<id>, <id>, ...)" conditions for direct fetch-by-ID
+ID_CONDITION_PATTERN = re.compile(r'\s*ID(?:\s*=\s*(\S+)|\s+IN\s*\((.*)\))\s*', re.IGNORECASE)
+
+
+def parse_id_condition(condition_str):
+    """Return the list of IDs for an ID=/ID IN condition, or None for anything else."""
+    match = ID_CONDITION_PATTERN.fullmatch(condition_str)
+    if not match:
+        return None
+    single_id, id_list = match.groups()
+    raw_ids = [single_id] if single_id is not None else re.split(r'[\s,]+', id_list.strip())
+    return [raw_id.strip('"\'') for raw_id in raw_ids if raw_id]
+
+
+def parse_show_records(tokens):
+    """
+    Parse SHOW <collection> RECORDS [SELECT ...] [WHERE ...] [SORTBY <field> [ASC|DESC]]
+    [OFFSET n] [LIMIT n] into a plan dict. Expects normalized tokens, where
+    comparison literals have already been replaced by "?".
+    """
+    plan = {
+        "collection": tokens[1],
+        "fields": None,
+        "doc_ids": None,
+        "condition": None,
+        "predicate": None,
+        "sort_key": None,
+        "sort_order": "asc",
+        "offset": 0,
+        "limit": None,
+    }
+    condition_str = ""
+
+    # Convert query to lowercase for keywords but preserve original tokens for values
+    lower_tokens = [token.lower() for token in tokens]
+
+    # Handle SELECT fields
+    if "select" in lower_tokens:
+        select_index = lower_tokens.index("select")
+        end_index = min([lower_tokens.index(kw) for kw in ["where", "sortby", "offset", "limit"] if kw in lower_tokens and lower_tokens.index(kw) > select_index] + [len(tokens)])
+        plan["fields"] = tokens[select_index + 1:end_index]
+
+    # Handle WHERE condition
+    if "where" in lower_tokens:
+        where_index = lower_tokens.index("where")
+        end_index = min([lower_tokens.index(kw) for kw in ["sortby", "offset", "limit"] if kw in lower_tokens and lower_tokens.index(kw) > where_index] + [len(tokens)])
+        condition_str = " ".join(tokens[where_index + 1:end_index])
+
+    # Handle SORTBY key [asc|desc]
+    if "sortby" in lower_tokens:
+        sort_index = lower_tokens.index("sortby")
+        plan["sort_key"] = tokens[sort_index + 1]
+        if len(tokens) > sort_index + 2 and tokens[sort_index + 2].lower() in ["asc", "desc"]:
+            plan["sort_order"] = tokens[sort_index + 2].lower()
+
+    # Handle OFFSET
+    if "offset" in lower_tokens:
+        try:
+            plan["offset"] = int(tokens[lower_tokens.index("offset") + 1])
+        except:
+            plan["offset"] = 0
+
+    # Handle LIMIT
+    if "limit" in lower_tokens:
+        try:
+            plan["limit"] = int(tokens[lower_tokens.index("limit") + 1])
+        except:
+            plan["limit"] = None
+
+    plan["doc_ids"] = parse_id_condition(condition_str)
+    if plan["doc_ids"] is None:
+        condition = Parser(condition_str).parse()
+        if parameterize(condition):
+            plan["condition"] = condition
+        else:
+            plan["predicate"] = Predicate(condition)  # Nothing to bind, compile once
+    return plan
+
+
+def parse_show_aggregate(query):
+    """
+    Parse SHOW <collection> AGGREGATE <func>(<field>|*), ... [GROUP BY <field>, ...]
+    [WHERE <condition>] into (collection, aggregates, group_by, condition).
+    """
+    match = re.match(r'\s*show\s+(\S+)\s+aggregate\s+(.*)$', query, re.IGNORECASE | re.DOTALL)
+    if not match:
+        raise SyntaxError("Usage: SHOW <collection_name> AGGREGATE COUNT(*), AVG(<field>) [GROUP BY <field>] [WHERE ...]")
+    collection_name, rest = match.groups()
+    group_match = re.search(r'\bgroup\s+by\b', rest, re.IGNORECASE)
+    where_match = re.search(r'\bwhere\b', rest, re.IGNORECASE)
+
+    def clause(found, other):
+        # A clause runs until the other one starts (if that comes later) or to the end
+        stop = other.start() if other and other.start() > found.start() else len(rest)
+        return rest[found.end():stop].strip()
+
+    starts = [found.start() for found in (group_match, where_match) if found]
+    aggregates = parse_aggregates(rest[:min(starts, default=len(rest))])
+    group_by = []
+    if group_match:
+        group_by = [field for field in re.split(r'[\s,]+', clause(group_match, where_match)) if field]
+        if not group_by:
+            raise SyntaxError("GROUP BY needs at least one field")
+    condition = clause(where_match, group_match) if where_match else ""
+    return collection_name, aggregates, group_by, condition
+
+
+# One <field>=<value> assignment of an UPDATE ... SET clause; values may be quoted
+ASSIGNMENT_PATTERN = re.compile(r'\s*,?\s*([^\s=,]+)\s*=\s*("[^"]*"|\'[^\']*\'|[^\s,]+)')
+WHERE_PATTERN = re.compile(r'\s*where\b', re.IGNORECASE)
+
+
+def parse_update(query):
+    """
+    Parse UPDATE <collection> SET <field>=<value> [<field>=<value> ...] [WHERE <condition>]
+    into (collection, updates, condition). Without WHERE every record is updated.
+    """
+    match = re.match(r'\s*update\s+(\S+)\s+set\s+(.*)$', query, re.IGNORECASE | re.DOTALL)
+    if not match:
+        raise SyntaxError("Usage: UPDATE <collection_name> SET <field>=<value> ... [WHERE <condition>]")
+    collection_name, rest = match.groups()
+    updates, pos = {}, 0
+    while pos < len(rest.rstrip()) and not WHERE_PATTERN.match(rest, pos):
+        assignment = ASSIGNMENT_PATTERN.match(rest, pos)
+        if not assignment:
+            raise SyntaxError(f"Invalid assignment near: {rest[pos:]!r}")
+        updates[assignment.group(1)] = parse_literal(assignment.group(2))
+        pos = assignment.end()
+    if not updates:
+        raise SyntaxError("SET needs at least one <field>=<value>")
+    where = WHERE_PATTERN.match(rest, pos)
+    condition = rest[where.end():].strip() if where else ""
+    return collection_name, updates, condition
+
+
+def parse_delete(query):
+    """Parse DELETE FROM <collection> [WHERE <condition>] into (collection, condition)."""
+    match = re.match(r'\s*delete\s+from\s+(\S+)(?:\s+where\b(.*))?\s*$', query, re.IGNORECASE | re.DOTALL)
+    if not match:
+        raise SyntaxError("Usage: DELETE FROM <collection_name> [WHERE <condition>]")
+    return match.group(1), (match.group(2) or "").strip()
+
+
+def plan_show_records(query, dbms):
+    """Fetch the cached plan for a SHOW ... RECORDS statement, parsing it on a miss."""
+    key, params = normalize_query(query)
+    plan = dbms.plan_cache.get(key)
+    if plan is None:
+        plan = parse_show_records(key.split())
+        dbms.plan_cache.put(key, plan)
+    return plan, params
+
+
+def build_query_plan(query, dbms, collection):
+    """Turn a SHOW ... RECORDS statement into an executable plan tree for the collection."""
+    plan, params = plan_show_records(query, dbms)
+    options = (plan["fields"], plan["sort_key"], plan["sort_order"], plan["offset"], plan["limit"])
+    if plan["doc_ids"] is not None:
+        # Placeholders in an ID=? lookup take the lifted literals in order
+        literals = iter(params)
+        doc_ids = [next(literals) if doc_id == "?" else doc_id for doc_id in plan["doc_ids"]]
+        return Planner(collection).plan_ids(doc_ids, *options)
+    predicate = plan["predicate"] or Predicate(bind_params(plan["condition"], params))
+    return collection.plan_query(predicate, *options)
+
+
+def query_processor(dbms):
+    transaction_manager = TransactionManager(dbms.root_path)  # Create a TransactionManager instance
+    print("\n--- Query Mode (type 'exit' to quit) ---")
+    while True:
+        query = input(">> ").strip()
+        if query.lower() == 'exit':
+            transaction_manager.rollback()  # Manually call cleanup before exiting
+            close_cursors(dbms)
+            break
+        process_query(query, dbms, transaction_manager)
+
+
+# Statements that change the catalog run alone; every other statement shares it
+CATALOG_COMMANDS = ("create", "drop", "delete", "rename")
+CATALOG_OBJECTS = ("database", "collection")
+
+
+def process_query(query, dbms,transaction_manager):
+    tokens = query.split()
+    if not tokens:
+        raise SyntaxError("Empty query")  # No query
+
+    if tokens[0].lower() in ("begin", "commit", "rollback"):
+        # Only touch collections the transaction holds, which can't be dropped meanwhile
+        return _process_query(query, tokens, dbms, transaction_manager)
+    catalog_change = tokens[0].lower() in CATALOG_COMMANDS and len(tokens) > 1 and tokens[1].lower() in CATALOG_OBJECTS
+    with dbms.catalog_lock.write() if catalog_change else dbms.catalog_lock.read():
+        if catalog_change:
+            check_not_in_use(tokens, dbms, transaction_manager)
+        return _process_query(query, tokens, dbms, transaction_manager)
+
+
+def close_cursors(dbms):
+    """Close every open cursor, releasing the snapshot each one holds; done when a transaction or session ends."""
+    for cursor in dbms.cursors.values():
+        cursor.close()
+    if dbms.cursors:
+        print(f"{len(dbms.cursors)} open cursor(s) closed.")
+    dbms.cursors.clear()
+
+
+def check_not_in_use(tokens, dbms, transaction_manager):
+    """Refuse to drop or rename a collection (or a database) another transaction is writing."""
+    if tokens[0].lower() == "create" or len(tokens) < 3:
+        return
+    if tokens[1].lower() == "database":
+        db = dbms.databases.get(tokens[2])
+        collections = db.collections.values() if db else []
+    else:
+        db = dbms.get_current_database()
+        collection = db.get_collection(tokens[2]) if db else None
+        collections = [collection] if collection else []
+    for collection in collections:
+        if collection.write_lock.held_by_other(transaction_manager.owner):
+            raise ValueError(f"Collection '{collection.name}' is being written by another transaction.")
+
+
+def _process_query(query, tokens, dbms, transaction_manager):
+    cmd = tokens[0].lower()
+    results = []
+    if cmd == "begin":
+            # Begin a new transaction
+        transaction_manager.begin()
+
+    elif cmd == "commit":
+            # Commit the transaction
+        transaction_manager.commit()
+        close_cursors(dbms)
+
+    elif cmd == "rollback":
+            # Rollback the transaction
+        transaction_manager.rollback()
+        close_cursors(dbms)
+        
+    if cmd == "create":
+        if tokens[1].lower() == "database":
+            return dbms.create_database(tokens[2])
+            
+        elif tokens[1].lower() == "collection":
+            # CREATE COLLECTION <name> [(<field> <type>, ...)]
+            db = dbms.get_current_database()
+            if db:
+                rest = query.split(None, 3)
+                schema = Schema.parse(rest[3]) if len(rest) > 3 else None
+                return db.create_collection(tokens[2], schema)
+                
+        elif tokens[1].lower() == "index":
+            # Ensure the format is correct: CREATE INDEX <index_name> ON <collection_name> (<attribute_name>) [WITH (order=<n>)]
+            if len(tokens) not in (6, 8) or tokens[3].lower() != "on":
+                print("Error: Invalid CREATE INDEX query format")
+                return
+
+            order = DEFAULT_ORDER
+            if len(tokens) == 8:
+                option = re.fullmatch(r'\(order=(\d+)\)', tokens[7], re.IGNORECASE)
+                if tokens[6].lower() != "with" or not option:
+                    print("Error: Invalid index options. Use WITH (order=<n>)")
+                    return
+                order = int(option.group(1))
+
+            index_name = tokens[2]             # idx_rollno
+            collection_name = tokens[4]        # Student
+            attribute_token = tokens[5]        # (rollno)
+
+            if not (attribute_token.startswith("(") and attribute_token.endswith(")")):
+                print("Error: Invalid attribute format. Use (attribute_name)")
+                return
+
+            attribute_name = attribute_token[1:-1]  # Strip parentheses
+
+            db = dbms.get_current_database()
+            if db:
+                collection = db.get_collection(collection_name)
+                if collection:
+                    with transaction_manager.writing(collection, transactional=False):
+                        collection.create_index(attribute_name, order)
+                    print(f"Index '{index_name}' created on attribute '{attribute_name}' in collection '{collection_name}'.")
+                else:
+                    print(f"Collection '{collection_name}' not found.")
+            else:
+                print("No database selected.")
+
+
+                
+    elif cmd == "use":
+        if len(tokens) >= 3 and tokens[1].lower() == "database":
+            db_name = tokens[2]
+            if not dbms.set_current_database(db_name):
+                return None  # Invalid DB
+        else:
+            return None  # Invalid syntax
+
+    elif cmd == "insert":
+        if tokens[1].lower() == "many":
+            # INSERT MANY INTO <collection_name> (<field>=<value> ...) (<field>=<value> ...) ...
+            if len(tokens) < 4 or tokens[2].lower() != "into":
+                raise SyntaxError("Usage: INSERT MANY INTO <collection_name> (<field>=<value> ...) ...")
+            collection_name = tokens[3]
+            groups = re.findall(r'\(([^)]*)\)', query.split(None, 4)[4] if len(tokens) > 4 else "")
+            documents = [
+                {k: parse_literal(v) for kv in group.split() if '=' in kv for k, v in [kv.split('=', 1)]}
+                for group in groups
+            ]
+            db = dbms.get_current_database()
+            if db:
+                collection = db.get_collection(collection_name)
+                if collection:
+                    with transaction_manager.writing(collection):
+                        message, summary = collection.insert_many(documents)
+                    return {"message": message, "records": summary}
+            raise ValueError("Collection not found.")
+
+        elif tokens[1].lower() == "into":
+            collection_name = tokens[2]
+            fields = {k: parse_literal(v) for kv in tokens[3:] if '=' in kv for k, v in [kv.split('=', 1)]}
+            db = dbms.get_current_database()
+            if db:
+                collection = db.get_collection(collection_name)
+                if collection:
+                    with transaction_manager.writing(collection):
+                        message, inserted = collection.create_object(**fields)
+                    return {"message": message, "records": inserted}
+            raise ValueError("Collection not found.")
+
+    elif cmd == "show":
+        if len(tokens) < 2:
+            raise SyntaxError("Missing keyword after SHOW")
+        elif tokens[1].lower() == "databases":
+            databases = dbms.show_databases()
+            return [{"Database": name} for name in databases]
+
+        elif tokens[1].lower() == "collections":
+            db = dbms.get_current_database()
+            if db:
+                collections = db.show_all_collections()
+                return [{"Collection": name} for name in collections]
+            else:
+                raise SyntaxError("No database selected")
+        elif tokens[1].lower() == "cache" and len(tokens) >= 3 and tokens[2].lower() == "stats":
+            stats = dbms.plan_cache.stats()
+            message = f"Plan cache: {stats['hits']} hit(s), {stats['misses']} miss(es), {stats['size']}/{stats['capacity']} plan(s) cached."
+            return {"message": message, "records": [stats]}
+
+        elif len(tokens) >= 3 and tokens[2].lower() == "schema":
+            db = dbms.get_current_database()
+            if not db:
+                raise SyntaxError("No database selected")
+            collection = db.get_collection(tokens[1])
+            if not collection:
+                raise SyntaxError("Collection don't exist.")
+            fields = [{"field": field, "type": type_name} for field, type_name in collection.schema.types.items()]
+            message = f"Schema of '{collection.name}': {collection.schema}" if fields else f"'{collection.name}' has no declared schema."
+            return {"message": message, "records": fields}
+
+        elif len(tokens) >= 3 and tokens[2].lower() == "aggregate":
+            collection_name, aggregates, group_by, condition = parse_show_aggregate(query)
+            db = dbms.get_current_database()
+            if not db:
+                raise SyntaxError("No database selected")
+            collection = db.get_collection(collection_name)
+            if not collection:
+                raise SyntaxError("Collection don't exist.")
+            rows = collection.aggregate(aggregates, group_by, condition, owner=transaction_manager.owner)
+            message = f"{len(rows)} group(s)." if group_by else "Aggregate computed."
+            return {"message": message, "records": rows}
+
+        elif len(tokens) >= 3 and tokens[2].lower() == "records":
+            collection_name = tokens[1]
+            db = dbms.get_current_database()
+            if not db:
+                return None
+
+            collection = db.get_collection(collection_name)
+            if not collection:
+                raise SyntaxError("Collection don't exist.")
+
+            records = collection.run_plan(build_query_plan(query, dbms, collection), owner=transaction_manager.owner)
+            message = f"{len(records)} record(s) found." if records else "No records found."
+            return {"message": message, "records": records}
+
+    elif cmd == "explain":
+        # EXPLAIN [ANALYZE] SHOW <collection> RECORDS|AGGREGATE ...
+        analyze = len(tokens) > 1 and tokens[1].lower() == "analyze"
+        inner = query.split(None, 2 if analyze else 1)[-1]
+        inner_tokens = inner.split()
+        if len(inner_tokens) < 3 or inner_tokens[0].lower() != "show" or inner_tokens[2].lower() not in ("records", "aggregate"):
+            raise SyntaxError("Usage: EXPLAIN [ANALYZE] SHOW <collection_name> RECORDS|AGGREGATE ...")
+        db = dbms.get_current_database()
+        if not db:
+            raise SyntaxError("No database selected")
+        collection = db.get_collection(inner_tokens[1])
+        if not collection:
+            raise SyntaxError("Collection don't exist.")
+
+        if inner_tokens[2].lower() == "aggregate":
+            _, aggregates, group_by, condition = parse_show_aggregate(inner)
+            query_plan = collection.plan_aggregate(aggregates, group_by, condition)
+        else:
+            query_plan = build_query_plan(inner, dbms, collection)
+        if analyze:
+            collection.run_plan(query_plan, analyze=True, owner=transaction_manager.owner)
+        message, operators = explain(query_plan, analyze)
+        print(message)
+        return {"message": message, "records": operators}
+
+    elif cmd == "declare":
+        # DECLARE <cursor_name> CURSOR FOR SHOW <collection> RECORDS ...
+        if len(tokens) < 7 or tokens[2].lower() != "cursor" or tokens[3].lower() != "for" or tokens[4].lower() != "show" or tokens[6].lower() != "records":
+            raise SyntaxError("Usage: DECLARE <cursor_name> CURSOR FOR SHOW <collection_name> RECORDS ...")
+        cursor_name = tokens[1]
+        if cursor_name in dbms.cursors:
+            raise ValueError(f"Cursor '{cursor_name}' already exists.")
+        db = dbms.get_current_database()
+        if not db:
+            raise SyntaxError("No database selected")
+        collection = db.get_collection(tokens[5])
+        if not collection:
+            raise SyntaxError("Collection don't exist.")
+        inner = query.split(None, 4)[4]
+        rows = collection.stream_plan(build_query_plan(inner, dbms, collection), owner=transaction_manager.owner)
+        dbms.cursors[cursor_name] = Cursor(rows, cursor_name, collection.name, collection.lock)
+        return {"message": f"Cursor '{cursor_name}' declared.", "records": []}
+
+    elif cmd == "fetch":
+        # FETCH NEXT [<n>] FROM <cursor_name>
+        match = re.fullmatch(r'fetch\s+next\s+(?:(\d+)\s+)?from\s+(\S+)', " ".join(tokens), re.IGNORECASE)
+        if not match:
+            raise SyntaxError("Usage: FETCH NEXT <n> FROM <cursor_name>")
+        count, cursor_name = int(match.group(1) or 1), match.group(2)
+        cursor = dbms.cursors.get(cursor_name)
+        if cursor is None:
+            raise ValueError(f"Cursor '{cursor_name}' not found.")
+        records = cursor.fetch(count)
+        message = f"{len(records)} record(s) fetched from cursor '{cursor_name}'."
+        if cursor.exhausted:
+            message += " No more records."
+        print(message)
+        return {"message": message, "records": records}
+
+    elif cmd == "close":
+        if len(tokens) != 2:
+            raise SyntaxError("Usage: CLOSE <cursor_name>")
+        cursor = dbms.cursors.pop(tokens[1], None)
+        if cursor is None:
+            raise ValueError(f"Cursor '{tokens[1]}' not found.")
+        cursor.close()
+        return {"message": f"Cursor '{tokens[1]}' closed.", "records": []}
+
+    elif cmd == "update":
+        # UPDATE <collection> SET <field>=<value> ... [WHERE <condition>]
+        collection_name, updates, condition = parse_update(query)
+        db = dbms.get_current_database()
+        if not db:
+            raise SyntaxError("No database selected")
+        collection = db.get_collection(collection_name)
+        if not collection:
+            raise ValueError("Collection not found.")
+        with transaction_manager.writing(collection):
+            message, updated_records = collection.update(condition, updates)
+        return {"message": message, "records": updated_records}
+
+    elif cmd == "delete":
+        if len(tokens) > 1 and tokens[1].lower() == "from":
+            # DELETE FROM <collection> [WHERE <condition>]
+            collection_name, condition = parse_delete(query)
+            db = dbms.get_current_database()
+            if not db:
+                raise SyntaxError("No database selected")
+            collection = db.get_collection(collection_name)
+            if not collection:
+                raise ValueError("Collection not found.")
+            with transaction_manager.writing(collection):
+                message, summary = collection.delete(condition)
+            return {"message": message, "records": summary}
+
+        elif tokens[1].lower() == "database":
+            dbms.delete_database(tokens[2])   
+            
+        elif tokens[1].lower() == "collection":
+            db = dbms.get_current_database()
+            if db:
+                return db.delete_collection(tokens[2])  
+
+    elif cmd == "alter":
+        # ALTER COLLECTION <name> (<field> <type>, ...) -- declares types and converts stored values
+        if len(tokens) < 4 or tokens[1].lower() != "collection":
+            raise SyntaxError("Usage: ALTER COLLECTION <collection_name> (<field> <type>, ...)")
+        db = dbms.get_current_database()
+        if not db:
+            raise SyntaxError("No database selected")
+        collection = db.get_collection(tokens[2])
+        if not collection:
+            raise ValueError("Collection not found.")
+        with transaction_manager.writing(collection, transactional=False):
+            message = collection.set_schema(Schema.parse(query.split(None, 3)[3]))
+        return {"message": message, "records": []}
+
+    elif cmd == "set":
+        # SET PARALLEL_WORKERS <n>
+        match = re.fullmatch(r'set\s+parallel_workers\s*=?\s*(\d+)', " ".join(tokens), re.IGNORECASE)
+        if not match:
+            raise SyntaxError("Usage: SET PARALLEL_WORKERS <n>")
+        return {"message": dbms.set_parallel_workers(int(match.group(1))), "records": []}
+
+    elif cmd == "rename":
+        if tokens[1].lower() == "database":
+            dbms.rename_database(tokens[2], tokens[4])
+        elif tokens[1].lower() == "collection":
+            db = dbms.get_current_database()
+            if db:
+                db.rename_collection(tokens[2], tokens[4])
+    
+    elif cmd == "load":
+        # LOAD <collection_name> FROM '<file.jsonl>' -- one JSON document per line
+        if len(tokens) < 4 or tokens[2].lower() != "from":
+            raise SyntaxError("Usage: LOAD <collection_name> FROM '<file.jsonl>'")
+        collection_name = tokens[1]
+        file_path = query.split(None, 3)[3].strip().strip("'\"")
+        db = dbms.get_current_database()
+        if not db:
+            raise SyntaxError("No database selected")
+        collection = db.get_collection(collection_name)
+        if not collection:
+            raise ValueError("Collection not found.")
+        with open(file_path, "r") as file:
+            documents = [json.loads(line) for line in file if line.strip()]
+        with transaction_manager.writing(collection):
+            message, summary = collection.insert_many(documents)
+        return {"message": message, "records": summary}
+
+    elif cmd == "compact":
+        if len(tokens) < 2:
+            raise SyntaxError("Usage: COMPACT <collection_name>")
+        db = dbms.get_current_database()
+        if not db:
+            raise SyntaxError("No database selected")
+        collection = db.get_collection(tokens[1])
+        if not collection:
+            raise ValueError("Collection not found.")
+        with transaction_manager.writing(collection, transactional=False):
+            message = collection.compact()
+        return {"message": message, "records": []}
+
+    elif cmd == "drop" and tokens[1].lower() == "index":
+        index_name = tokens[2].lower()
+        collection_name = tokens[4]
+
+        db = dbms.get_current_database()
+        if db:
+            collection = db.get_collection(collection_name)
+            if collection:
+                with transaction_manager.writing(collection, transactional=False):
+                    collection.remove_index(index_name)
+                print(f"Index '{index_name}' has been dropped from '{collection_name}'.")
+            else:
+                print(f"Collection '{collection_name}' not found.")
+        else:
+            print("No active database found.")
+   
+
+    return results if results else None
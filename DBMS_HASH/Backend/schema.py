@@ -0,0 +1,193 @@
+import json
+import re
+from datetime import datetime, timezone
+
+# Unquoted literals that look like these are stored as numbers; leading zeros
+# ("007", zip codes) are left as text so nothing is lost
+INT_PATTERN = re.compile(r'-?(?:0|[1-9]\d*)')
+FLOAT_PATTERN = re.compile(r'-?(?:0|[1-9]\d*)?\.\d+(?:[eE][-+]?\d+)?|-?(?:0|[1-9]\d*)[eE][-+]?\d+')
+
+# Types a collection schema may declare
+TYPE_NAMES = ("int", "float", "bool", "string", "timestamp")
+
+SCHEMA_PATTERN = re.compile(r'\(\s*(.*?)\s*\)\s*', re.DOTALL)
+
+
+def infer_value(text):
+    """Type an unquoted literal: true/false become bools, numbers become int or float."""
+    lowered = text.lower()
+    if lowered in ("true", "false"):
+        return lowered == "true"
+    if INT_PATTERN.fullmatch(text):
+        return int(text)
+    if FLOAT_PATTERN.fullmatch(text):
+        return float(text)
+    return text
+
+
+def parse_literal(token):
+    """A value as written in a statement: quoted text stays a string, anything else is inferred."""
+    if len(token) >= 2 and token[0] == token[-1] and token[0] in "\"'":
+        return token[1:-1]
+    return infer_value(token)
+
+
+def sort_key(value):
+    """
+    Total order over stored values: missing < bools < numbers < strings <
+    anything else. Used by sorts and as the B+ tree's internal key, so
+    mixed-type fields never raise on comparison.
+    """
+    if value is None:
+        return (0, 0)
+    if isinstance(value, bool):
+        return (1, value)
+    if isinstance(value, (int, float)):
+        return (2, value)
+    if isinstance(value, str):
+        return (3, value)
+    return (4, json.dumps(value, sort_keys=True))
+
+
+def order_key(value):
+    """
+    The order results are sorted in: sort_key()'s, except that text spelling
+    a number (stored before values were typed) sorts as that number, the way
+    predicates compare it. The B+ trees keep sort_key() order.
+    """
+    if value.__class__ is str:
+        number = coerce_like(value, 0)
+        if number is not None and number == number:  # NaN has no place in an order
+            return (2, number)
+    return sort_key(value)
+
+
+def is_numeric_text(key):
+    """Whether a sort_key() is text that order_key() ranks as a number."""
+    return key[0] == 3 and order_key(key[1])[0] == 2
+
+
+def from_sort_key(key):
+    rank, value = key
+    if rank == 0:
+        return None
+    return json.loads(value) if rank == 4 else value
+
+
+def coerce_like(value, literal):
+    """
+    Convert a stored string to the type of a typed literal, for records
+    written before values were typed. Returns None when it doesn't convert.
+    """
+    if not isinstance(value, str):
+        return None
+    if isinstance(literal, bool):
+        lowered = value.lower()
+        return lowered == "true" if lowered in ("true", "false") else None
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def _to_int(value):
+    if isinstance(value, bool):
+        raise ValueError
+    if isinstance(value, float):
+        if not value.is_integer():
+            raise ValueError
+        return int(value)
+    return int(value.strip()) if isinstance(value, str) else int(value)
+
+
+def _to_float(value):
+    if isinstance(value, bool):
+        raise ValueError
+    return float(value.strip()) if isinstance(value, str) else float(value)
+
+
+def _to_bool(value):
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str) and value.strip().lower() in ("true", "false", "1", "0", "yes", "no"):
+        return value.strip().lower() in ("true", "1", "yes")
+    raise ValueError
+
+
+def _to_string(value):
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    return value if isinstance(value, str) else str(value)
+
+
+def _to_timestamp(value):
+    # Stored as ISO-8601 text, which orders chronologically; numbers are UTC epoch seconds
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return datetime.fromtimestamp(value, timezone.utc).isoformat()
+    if isinstance(value, str):
+        return datetime.fromisoformat(value.strip()).isoformat()
+    raise ValueError
+
+
+CONVERTERS = {
+    "int": _to_int,
+    "float": _to_float,
+    "bool": _to_bool,
+    "string": _to_string,
+    "timestamp": _to_timestamp,
+}
+
+
+class Schema:
+    """Declared field types of a collection; undeclared fields keep whatever type they arrive with."""
+
+    def __init__(self, types=None):
+        self.types = dict(types or {})
+
+    def __bool__(self):
+        return bool(self.types)
+
+    def __repr__(self):
+        return "(" + ", ".join(f"{field} {type_name}" for field, type_name in self.types.items()) + ")"
+
+    @classmethod
+    def parse(cls, text):
+        """Parse a declaration like "(age int, score float, joined timestamp)"."""
+        match = SCHEMA_PATTERN.fullmatch(text.strip())
+        if not match:
+            raise SyntaxError("Schema must look like (<field> <type>, ...)")
+        types = {}
+        for part in filter(None, (part.strip() for part in match.group(1).split(","))):
+            pieces = part.split()
+            if len(pieces) != 2:
+                raise SyntaxError(f"Invalid schema entry: {part!r}")
+            field, type_name = pieces[0], pieces[1].lower()
+            if type_name not in TYPE_NAMES:
+                raise SyntaxError(f"Unknown type {pieces[1]!r}; expected one of {', '.join(TYPE_NAMES)}")
+            types[field] = type_name
+        return cls(types)
+
+    def coerce_value(self, field, value):
+        type_name = self.types.get(field)
+        if type_name is None or value is None:
+            return value
+        try:
+            return CONVERTERS[type_name](value)
+        except (TypeError, ValueError, OverflowError):
+            raise ValueError(f"Field '{field}' expects {type_name}, got {value!r}.") from None
+
+    def coerce(self, attributes):
+        """Return the attributes with every declared field converted to its type."""
+        if not self.types:
+            return attributes
+        return {field: self.coerce_value(field, value) for field, value in attributes.items()}
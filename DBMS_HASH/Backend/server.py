@@ -0,0 +1,198 @@
+"""
+Network server: one DBMS, loaded once, shared by every connected client.
+
+    python -m Backend.server [--host 127.0.0.1] [--port 7433] [--socket PATH] [--root DIR] [--workers N] [--quiet]
+
+Each connection is a session with its own current database, cursors and
+transaction. Its statements run one after another, in the order sent, on a
+thread pool rather than the event loop: a scan can take a while and a write
+may wait on another transaction's lock, and the loop has to keep serving
+the other sessions meanwhile. Requests a client pipelines are read while
+earlier ones run and go to the pool together, one hop for the lot.
+Messages are framed as in protocol.py.
+"""
+import argparse
+import asyncio
+import os
+import signal
+import stat
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from .dbms import DBMS
+from .protocol import DEFAULT_PORT, ProtocolError, encode, read_message
+from .query_processor import close_cursors, process_query
+from .transaction import TransactionManager
+
+
+class Session:
+    """
+    One client's view of the shared DBMS: the current database, open cursors
+    and transaction are its own, everything else is the DBMS's. Passed to
+    process_query in place of the DBMS.
+    """
+
+    def __init__(self, dbms):
+        self.dbms = dbms
+        self.current_database = None
+        self.cursors = {}
+        self.transaction_manager = TransactionManager(dbms.root_path, handle_signals=False)
+
+    def __getattr__(self, name):
+        return getattr(self.dbms, name)
+
+    def set_current_database(self, db_name):
+        database = self.dbms.databases.get(db_name)
+        if database is not None:
+            self.current_database = database
+            print(f"Current database set to '{db_name}'.")
+        else:
+            print(f"Database '{db_name}' does not exist.")
+
+    def get_current_database(self):
+        # Another session may have dropped it since
+        database = self.current_database
+        if database is not None and self.dbms.databases.get(database.name) is not database:
+            self.current_database = None
+        return self.current_database
+
+    def execute(self, query):
+        """Run one statement; the response to send back, less its id."""
+        try:
+            return {"result": process_query(query, self, self.transaction_manager)}
+        except Exception as e:
+            return {"error": {"type": type(e).__name__, "message": str(e)}}
+
+    def respond(self, request):
+        """The response to a request: one statement, or a batch run in order, each with its own result or error."""
+        queries = request.get("queries") if isinstance(request, dict) else None
+        if isinstance(queries, list) and all(isinstance(query, str) for query in queries):
+            response = {"results": [self.execute(query) for query in queries]}
+        elif isinstance(request, dict) and isinstance(request.get("query"), str):
+            response = self.execute(request["query"])
+        else:
+            response = {"error": {"type": "ProtocolError", "message": "A request needs a \"query\" string or a \"queries\" list of them."}}
+        response["id"] = request.get("id") if isinstance(request, dict) else None
+        return response
+
+    def answer(self, requests):
+        """Responses to requests that arrived together, encoded and ready to send."""
+        frames = []
+        for request in requests:
+            response = self.respond(request)
+            try:
+                frames.append(encode(response))
+            except ProtocolError as e:
+                frames.append(encode({"id": response["id"], "error": {"type": "ProtocolError", "message": str(e)}}))
+        return b"".join(frames)
+
+    def close(self):
+        close_cursors(self)
+        self.transaction_manager.close()  # An open transaction is rolled back
+
+
+class Server:
+    # Requests read ahead of the one running; a client pipelining more waits for room
+    MAX_QUEUED = 1024
+
+    def __init__(self, dbms, workers=None):
+        self.dbms = dbms
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="session")
+        self.connections = {}  # Handler task -> its StreamWriter
+
+    async def handle(self, reader, writer):
+        loop = asyncio.get_running_loop()
+        self.connections[asyncio.current_task()] = writer
+        session = Session(self.dbms)
+        requests = asyncio.Queue(self.MAX_QUEUED)
+        receiver = loop.create_task(self._receive(reader, requests))
+        try:
+            finished = False
+            while not finished:
+                # Everything pipelined behind the next request goes to the worker with it
+                batch = [await requests.get()]
+                while not requests.empty():
+                    batch.append(requests.get_nowait())
+                finished = not isinstance(batch[-1], dict)
+                end = batch.pop() if finished else None
+                if batch:
+                    writer.write(await loop.run_in_executor(self.executor, session.answer, batch))
+                if isinstance(end, ProtocolError):
+                    writer.write(encode({"id": None, "error": {"type": "ProtocolError", "message": str(end)}}))
+                await writer.drain()
+        except ConnectionError:
+            pass  # The client went away; its session is cleaned up all the same
+        finally:
+            receiver.cancel()
+            await loop.run_in_executor(self.executor, session.close)
+            writer.close()
+            del self.connections[asyncio.current_task()]
+
+    async def _receive(self, reader, requests):
+        """Read requests while earlier ones run; ends the queue with None, or the ProtocolError that ended it."""
+        try:
+            while True:
+                request = await read_message(reader)
+                if request is None:
+                    break
+                await requests.put(request if isinstance(request, dict) else {"query": None})
+        except ProtocolError as e:
+            await requests.put(e)
+            return
+        except ConnectionError:
+            pass
+        await requests.put(None)
+
+    async def close(self):
+        """Hang up on every client, wait for their sessions to roll back, then stop the workers."""
+        for writer in self.connections.values():
+            writer.transport.abort()
+        if self.connections:
+            await asyncio.wait(list(self.connections))
+        self.executor.shutdown(wait=True)
+
+
+async def serve(dbms, host="127.0.0.1", port=DEFAULT_PORT, socket_path=None, workers=None, quiet=False):
+    server = Server(dbms, workers)
+    if socket_path:
+        if os.path.exists(socket_path) and stat.S_ISSOCK(os.stat(socket_path).st_mode):
+            os.remove(socket_path)  # Left behind by a server that didn't shut down cleanly
+        listener = await asyncio.start_unix_server(server.handle, path=socket_path)
+        print(f"Serving on unix socket {socket_path}")
+    else:
+        listener = await asyncio.start_server(server.handle, host, port)
+        print(f"Serving on {', '.join(str(sock.getsockname()[:2]) for sock in listener.sockets)}")
+    sys.stdout.flush()
+    if quiet:
+        sys.stdout = open(os.devnull, "w")  # The engine prints a line or more for most statements
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+    async with listener:
+        await stop.wait()
+        listener.close()
+        await server.close()
+    if socket_path and os.path.exists(socket_path):
+        os.remove(socket_path)
+    dbms.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m Backend.server", description="Serve the DBMS over TCP or a Unix socket.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--socket", dest="socket_path", help="listen on this Unix socket instead of TCP")
+    parser.add_argument("--root", help="directory holding the databases (default: the current one)")
+    parser.add_argument("--workers", type=int, help="threads statements run on (default: the thread pool's)")
+    parser.add_argument("--quiet", action="store_true", help="don't print the engine's per-statement output")
+    args = parser.parse_args(argv)
+
+    if args.root:
+        os.chdir(args.root)
+    dbms = DBMS()
+    asyncio.run(serve(dbms, args.host, args.port, args.socket_path, args.workers, args.quiet))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,121 +1,211 @@
-import os
-import shutil
-import atexit
-import signal
-import sys
-
-class TransactionManager:
-    def __init__(self, root_path="."):
-        self.root_path = root_path
-        self.backup_path = os.path.join(self.root_path, "__backup")
-        self.transaction_active = False
-        self.transaction_committed = False
-
-        # Register cleanup function for graceful shutdown
-        atexit.register(self.cleanup)
-
-        # Register a handler for abrupt program termination (e.g., Ctrl+C, etc.)
-        signal.signal(signal.SIGTERM, self.handle_termination)
-        signal.signal(signal.SIGINT, self.handle_termination)
-
-    def begin(self):
-        if self.transaction_active:
-            print("Transaction already in progress.")
-            return
-
-        if os.path.exists(self.backup_path):
-            shutil.rmtree(self.backup_path)  # Clean old backup
-
-        # Make deep copy of the root DBMS folder
-        os.makedirs(self.backup_path, exist_ok=True)
-
-        for item in os.listdir(self.root_path):
-            src = os.path.join(self.root_path, item)
-            dest = os.path.join(self.backup_path, item)
-
-            # Skip backup folder itself and Python files
-            if item == "__backup" or item.endswith(".py") or item == "__pycache__":
-                continue
-
-            if os.path.isdir(src):
-                shutil.copytree(src, dest)
-            elif os.path.isfile(src):
-                shutil.copy2(src, dest)
-
-        self.transaction_active = True
-        print("Transaction started.")
-
-    def commit(self):
-        if not self.transaction_active:
-            print("No active transaction to commit.")
-            return
-
-        shutil.rmtree(self.backup_path)
-        self.transaction_active = False
-        print("Transaction committed.")
-        
-        
-    def rollback(self):
-        if not self.transaction_active:
-            print("No active transaction to rollback.")
-            return
-
-        # Delete current data
-        for item in os.listdir(self.root_path):
-            path = os.path.join(self.root_path, item)
-            if item == "__backup" or item.endswith(".py") or item == "__pycache__":
-                continue
-            try:
-                if os.path.isdir(path):
-                    shutil.rmtree(path)
-                elif os.path.isfile(path):
-                    os.remove(path)
-            except Exception as e:
-                print(f"Failed to remove {path}: {e}")
-
-        # Restore backup
-        for item in os.listdir(self.backup_path):
-            src = os.path.join(self.backup_path, item)
-            dest = os.path.join(self.root_path, item)
-            if os.path.isdir(src):
-                shutil.copytree(src, dest)
-            else:
-                shutil.copy2(src, dest)
-
-        shutil.rmtree(self.backup_path)
-        self.transaction_active = False
-        print("Transaction rolled back.")
-
-
-    def create_backup(self):
-        """Create a deep copy (backup) of the database system"""
-        if not os.path.exists(self.backup_path):
-            os.makedirs(self.backup_path)
-        # Create a backup of your DBMS (implement according to your system)
-        print(f"Backup folder created at {self.backup_path}")
-
-    def restore_backup(self):
-        """Restore the backup"""
-        if os.path.exists(self.backup_path):
-            print(f"Restoring backup from {self.backup_path}")
-            # Restore logic (copy data back)
-            shutil.rmtree(self.backup_path)  # Assuming you want to delete after restoring
-
-    def apply_changes(self, dbms):
-        """Apply changes made during the transaction (e.g., commit changes to DBMS)"""
-        print("Changes have been applied to the database.")
-
-    def cleanup(self):
-        """Clean up the backup if no commit or rollback occurred."""
-        if self.transaction_active and not self.transaction_committed:
-            print(f"Transaction ended without commit or rollback. Cleaning up backup folder at {self.backup_path}")
-            shutil.rmtree(self.backup_path, ignore_errors=True)  # Delete the backup folder
-        else:
-            print(f"Transaction committed or rolled back, no need to clean up backup.")
-
-
-    def handle_termination(self, signum, frame):
-        """Handle abrupt program termination (e.g., SIGINT, SIGTERM)."""
-        print("Program is terminating abruptly. Cleaning up backup folder...")
-        self.cleanup()
-        sys.exit(1)  # Exit the program after cleanup
+import atexit
+import glob
+import json
+import os
+import signal
+import sys
+import threading
+import uuid
+from contextlib import contextmanager
+from .locking import write_all
+from .mvcc import CLOCK
+
+class TransactionManager:
+    """
+    BEGIN / COMMIT / ROLLBACK over per-collection undo logs. BEGIN only
+    marks the transaction open; a collection is enlisted by its first write
+    statement inside it and from then on keeps the before-image of every
+    record it changes, so a rollback touches only what was written.
+    Creating or dropping databases, collections and indexes is not undone.
+
+    Writes inside a transaction stay in memory until COMMIT, which first
+    writes them all to a journal (the commit point) and then appends each
+    collection's share to its log in one framed write. A journal left by a
+    crash is finished on the next start, so a transaction is either in
+    every log it touched or in none.
+
+    Other readers don't see the transaction's writes until COMMIT stamps
+    them, in every collection at once, with one commit sequence number; its
+    own statements read them through `owner`.
+
+    A collection the transaction writes belongs to it (its WriteLock) until
+    the transaction ends, so other writers wait while readers go on.
+    """
+
+    def __init__(self, root_path=".", handle_signals=True):
+        self.root_path = root_path
+        self.transaction_active = False
+        self.transaction_committed = False
+        self.enlisted = []  # Collections written to in the current transaction, in first-write order
+        self.owner = None  # Token on the open transaction's uncommitted versions
+        self.journal_pattern = os.path.join(self.root_path, "__transaction_*.journal")  # One per committing transaction
+
+        # Register cleanup function for graceful shutdown
+        atexit.register(self.cleanup)
+
+        # Register a handler for abrupt program termination (e.g., Ctrl+C, etc.)
+        # Only the main thread may; a server's sessions leave the signals to the server
+        if handle_signals and threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, self.handle_termination)
+            signal.signal(signal.SIGINT, self.handle_termination)
+
+    def begin(self):
+        if self.transaction_active:
+            print("Transaction already in progress.")
+            return
+
+        self.enlisted = []
+        self.owner = object()
+        self.transaction_active = True
+        self.transaction_committed = False
+        print("Transaction started.")
+
+    def enlist(self, collection):
+        """
+        Called before a write statement runs against a collection. Inside a
+        transaction, the collection's first write takes it over until the
+        transaction ends and starts its undo log.
+        """
+        if self.transaction_active and all(enlisted is not collection for enlisted in self.enlisted):
+            collection.write_lock.acquire(self.owner)
+            collection.begin_transaction(self.owner)
+            self.enlisted.append(collection)
+
+    @contextmanager
+    def writing(self, collection, transactional=True):
+        """
+        Hold a collection for one write statement: enlisted in the open
+        transaction, or else owned by the statement until it ends (waiting
+        for any transaction writing it). DDL passes transactional=False.
+        """
+        if self.transaction_active and transactional:
+            self.enlist(collection)
+            yield
+            return
+        owner = self.owner if self.transaction_active else object()
+        collection.write_lock.acquire(owner)
+        try:
+            yield
+        finally:
+            collection.write_lock.release(owner)
+
+    def _release(self):
+        for collection in self.enlisted:
+            collection.write_lock.release(self.owner)
+        self.enlisted = []
+        self.owner = None
+        self.transaction_active = False
+
+    def commit(self):
+        if not self.transaction_active:
+            print("No active transaction to commit.")
+            return
+
+        txn = uuid.uuid4().hex
+        journal_path, stamped = None, False
+        try:
+            # Every collection's lock, taken in rank order, before the commit clock's
+            with write_all(collection.lock for collection in self.enlisted):
+                logs = {collection.log_file: collection.pending_log for collection in self.enlisted if collection.pending_log}
+                if logs:
+                    # Once the journal is on disk the transaction counts as committed
+                    journal_path = self._write_journal({"txn": txn, "logs": logs})
+                with CLOCK.committing() as sequence:
+                    for collection in self.enlisted:
+                        collection.stamp(sequence)
+                stamped = True
+                error = None
+                for collection in self.enlisted:
+                    try:
+                        collection.commit_log(txn)
+                    except Exception as e:
+                        # The journal keeps this log's entries for recover() at the next start
+                        print(f"Failed to write the log of collection '{collection.name}': {e}")
+                        error = error or e
+                if error is not None:
+                    raise error
+                if journal_path is not None:
+                    os.remove(journal_path)
+        except Exception:
+            if not stamped:
+                self.rollback()  # Not committed: nothing of it reached the disk
+            raise
+        finally:
+            self._release()
+        self.transaction_committed = True
+        print("Transaction committed.")
+
+
+    def rollback(self):
+        if not self.transaction_active:
+            print("No active transaction to rollback.")
+            return
+
+        restored = 0
+        with write_all(collection.lock for collection in self.enlisted):
+            for collection in reversed(self.enlisted):
+                try:
+                    restored += collection.rollback()
+                except Exception as e:
+                    print(f"Failed to roll back collection '{collection.name}': {e}")
+        self._release()
+        print(f"Transaction rolled back ({restored} record(s) restored).")
+
+    def _write_journal(self, data):
+        journal_path = self.journal_pattern.replace("*", data["txn"])
+        tmp_path = f"{journal_path}.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(data, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, journal_path)
+        return journal_path
+
+    def recover(self):
+        """
+        Finish the commits a crash interrupted: append each journaled
+        transaction to every log that doesn't end with it yet. DBMS runs this
+        once at startup, before any collection is loaded, so the logs then
+        replay as committed.
+        """
+        for journal_path in sorted(glob.glob(self.journal_pattern)):
+            with open(journal_path, "r") as file:
+                data = json.load(file)
+            txn = data["txn"]
+            begin = (json.dumps({"op": "begin", "txn": txn}) + "\n").encode()
+            commit = (json.dumps({"op": "commit", "txn": txn}) + "\n").encode()
+            for log_file, entries in data["logs"].items():
+                if not os.path.exists(os.path.dirname(log_file) or "."):
+                    continue  # The database is gone
+                content = b""
+                if os.path.exists(log_file):
+                    with open(log_file, "rb") as file:
+                        content = file.read()
+                if commit in content:
+                    continue
+                # Drop whatever part of the framed write made it, then write it whole
+                start = content.find(begin)
+                keep = start if start >= 0 else content.rfind(b"\n") + 1
+                with open(log_file, "wb") as file:
+                    file.write(content[:keep] + begin + "".join(json.dumps(entry) + "\n" for entry in entries).encode() + commit)
+                    file.flush()
+                    os.fsync(file.fileno())
+            os.remove(journal_path)
+            print(f"Recovered transaction {txn} from the journal.")
+
+    def cleanup(self):
+        """Roll back a transaction that is still open when the program ends."""
+        if self.transaction_active and not self.transaction_committed:
+            print("Transaction ended without commit or rollback. Rolling it back.")
+            self.rollback()
+
+    def close(self):
+        """Roll back what is still open and stop watching for exit; for managers of short-lived sessions."""
+        self.cleanup()
+        atexit.unregister(self.cleanup)
+
+    def handle_termination(self, signum, frame):
+        """Handle abrupt program termination (e.g., SIGINT, SIGTERM)."""
+        print("Program is terminating abruptly. Rolling back any open transaction...")
+        self.cleanup()
+        sys.exit(1)  # Exit the program after cleanup
@@ -0,0 +1,105 @@
+import sys
+import os
+import asyncio
+import contextlib
+import io
+import re
+import subprocess
+import tempfile
+import threading
+import time
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from Backend.client import AsyncConnection, Connection, ConnectionPool
+from Backend.dbms import DBMS
+from Backend.query_processor import process_query
+
+RECORDS = 10_000
+BATCH = 100  # Statements per pipeline / batch / gather
+POOL_THREADS = 4
+
+
+def point_queries(n):
+    return [f"SHOW bench RECORDS WHERE k={i % RECORDS}" for i in range(n)]
+
+
+def start_server(root):
+    server = subprocess.Popen(
+        [sys.executable, "-m", "Backend.server", "--root", root, "--port", "0", "--quiet"],
+        cwd=os.path.abspath(os.path.join(os.path.dirname(__file__), '..')),
+        stdout=subprocess.PIPE, text=True,
+    )
+    port = int(re.search(r"(\d+)\)", server.stdout.readline()).group(1))
+    return server, port
+
+
+def load(run):
+    run("CREATE DATABASE bench_db")
+    run("USE DATABASE bench_db")
+    run("CREATE COLLECTION bench")
+    run("INSERT MANY INTO bench " + " ".join(f"(k={i} v={i % 97})" for i in range(RECORDS)))
+    run("CREATE INDEX idx_k ON bench (k)")
+
+
+def timed(n, run):
+    start = time.perf_counter()
+    run()
+    return n / (time.perf_counter() - start)
+
+
+def in_process(n):
+    os.chdir(tempfile.mkdtemp())
+    with contextlib.redirect_stdout(io.StringIO()):
+        dbms = DBMS()
+        tm = dbms.transaction_manager
+        load(lambda statement: process_query(statement, dbms, tm))
+        return timed(n, lambda: [process_query(query, dbms, tm) for query in point_queries(n)])
+
+
+def over_network(n, port):
+    results = {}
+    with Connection(port=port) as conn:
+        load(conn.query)
+        queries = point_queries(n)
+        results["one at a time"] = timed(n, lambda: [conn.query(query) for query in queries])
+        results[f"pipelined x{BATCH}"] = timed(n, lambda: [conn.pipeline(queries[i:i + BATCH]) for i in range(0, n, BATCH)])
+        results[f"batched x{BATCH}"] = timed(n, lambda: [conn.execute_many(queries[i:i + BATCH]) for i in range(0, n, BATCH)])
+
+    async def gathered():
+        async with await AsyncConnection.connect(port=port, database="bench_db") as conn:
+            start = time.perf_counter()
+            for i in range(0, n, BATCH):
+                await asyncio.gather(*(conn.query(query) for query in queries[i:i + BATCH]))
+            return n / (time.perf_counter() - start)
+    results[f"asyncio, {BATCH} in flight"] = asyncio.run(gathered())
+
+    with ConnectionPool(size=POOL_THREADS, port=port, database="bench_db") as pool:
+        share = n // POOL_THREADS
+        threads = [threading.Thread(target=lambda: [pool.query(query) for query in queries[:share]]) for _ in range(POOL_THREADS)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        results[f"pool, {POOL_THREADS} threads"] = share * POOL_THREADS / (time.perf_counter() - start)
+    return results
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    server, port = start_server(tempfile.mkdtemp())
+    try:
+        results = over_network(n, port)
+    finally:
+        server.terminate()
+        server.wait()
+    local = in_process(n)
+
+    print(f"{n} indexed point queries over {RECORDS} records, TCP on localhost")
+    print(f"{'':24} {'queries/sec':>12} {'us/query':>9}")
+    print(f"{'in-process':24} {local:>12,.0f} {1e6 / local:>9.1f}")
+    for name, rate in results.items():
+        print(f"{name:24} {rate:>12,.0f} {1e6 / rate:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
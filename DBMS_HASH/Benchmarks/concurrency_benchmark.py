@@ -0,0 +1,76 @@
+import sys
+import os
+import contextlib
+import io
+import random
+import sysconfig
+import tempfile
+import threading
+import time
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from Backend.dbms import DBMS
+from Backend.query_processor import process_query
+from Backend.transaction import TransactionManager
+
+THREADS = (1, 2, 4, 8)
+SECONDS = 2.0
+
+
+def run(dbms, sessions, readers, writer, keys):
+    """Statements per second from `readers` threads (plus one writer) over SECONDS."""
+    stop = threading.Event()
+    counts = [0] * readers
+    writes = [0]
+
+    def read(slot):
+        rnd = random.Random(slot)
+        while not stop.is_set():
+            process_query(f"SHOW bench RECORDS WHERE k={rnd.randrange(keys)}", dbms, sessions[slot])
+            counts[slot] += 1
+
+    def write():
+        rnd = random.Random(-1)
+        while not stop.is_set():
+            process_query(f"UPDATE bench SET v={rnd.randrange(1000)} WHERE k={rnd.randrange(keys)}", dbms, sessions[-1])
+            writes[0] += 1
+
+    threads = [threading.Thread(target=read, args=(slot,)) for slot in range(readers)]
+    if writer:
+        threads.append(threading.Thread(target=write))
+    for thread in threads:
+        thread.start()
+    time.sleep(SECONDS)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return sum(counts) / SECONDS, writes[0] / SECONDS
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    os.chdir(tempfile.mkdtemp())
+    with contextlib.redirect_stdout(io.StringIO()):
+        dbms = DBMS()
+        # Sessions are made here: a TransactionManager registers signal handlers, which only the main thread may
+        sessions = [TransactionManager(dbms.root_path) for _ in range(max(THREADS) + 1)]
+        query = lambda statement: process_query(statement, dbms, sessions[0])
+        query("CREATE DATABASE bench_db")
+        query("USE DATABASE bench_db")
+        query("CREATE COLLECTION bench")
+        dbms.get_current_database().get_collection("bench").insert_many([{"k": i, "v": 0} for i in range(n)])
+        query("CREATE INDEX idx_k ON bench (k)")
+
+    gil = "off" if sysconfig.get_config_var("Py_GIL_DISABLED") and not getattr(sys, "_is_gil_enabled", lambda: True)() else "on"
+    print(f"{n} records, indexed point reads for {SECONDS:g}s per run (GIL {gil})")
+    print(f"{'threads':>7} {'reads/sec':>12} {'scaling':>8} {'+writer reads/sec':>18} {'writes/sec':>11}")
+    base = None
+    for readers in THREADS:
+        with contextlib.redirect_stdout(io.StringIO()):
+            reads, _ = run(dbms, sessions, readers, False, n)
+            mixed_reads, writes = run(dbms, sessions, readers, True, n)
+        base = base or reads
+        print(f"{readers:>7} {reads:>12,.0f} {reads / base:>7.2f}x {mixed_reads:>18,.0f} {writes:>11,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import sys
+import os
+import random
+import time
+import uuid
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from Backend.hashtable import HashTable
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+LOOKUPS = 100_000
+
+
+def bench(n):
+    keys = [str(uuid.uuid4()) for _ in range(n)]
+    table = HashTable()
+
+    start = time.perf_counter()
+    for key in keys:
+        table.insert(key, key)
+    insert_ns = (time.perf_counter() - start) / n * 1e9
+
+    probes = random.choices(keys, k=LOOKUPS)
+    start = time.perf_counter()
+    for key in probes:
+        table.get(key)
+    hit_ns = (time.perf_counter() - start) / LOOKUPS * 1e9
+
+    misses = [str(uuid.uuid4()) for _ in range(LOOKUPS)]
+    start = time.perf_counter()
+    for key in misses:
+        table.get(key)
+    miss_ns = (time.perf_counter() - start) / LOOKUPS * 1e9
+
+    return insert_ns, hit_ns, miss_ns, table.size
+
+
+def main():
+    print(f"{'records':>10} {'insert ns':>10} {'hit ns':>10} {'miss ns':>10} {'slots':>10}")
+    for n in SIZES:
+        insert_ns, hit_ns, miss_ns, slots = bench(n)
+        print(f"{n:>10} {insert_ns:>10.0f} {hit_ns:>10.0f} {miss_ns:>10.0f} {slots:>10}")
+
+
+if __name__ == "__main__":
+    main()
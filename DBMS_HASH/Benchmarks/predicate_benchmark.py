@@ -0,0 +1,50 @@
+import sys
+import os
+import random
+import re
+import time
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from Backend.predicate import compile_condition
+
+CONDITION = "age>=30 AND age<40 OR city=lhr"
+# The documents hold text, as the old eval() path assumed; quoting the literals
+# keeps the compiled side comparing text too instead of typed numbers
+QUOTED_CONDITION = re.sub(r'(\w+\s*(?:==|!=|>=|<=|=|>|<)\s*)(\w+)', r'\1"\2"', CONDITION)
+
+
+def eval_condition(condition_str):
+    """The previous approach: regex-rewrite the clause into Python source for eval()."""
+    normalized = condition_str.replace(" and ", " AND ").replace(" or ", " OR ")
+    normalized = normalized.replace("=", "==").replace("<==", "<=").replace(">==", ">=")
+    normalized = re.sub(r"\bAND\b", "and", normalized)
+    normalized = re.sub(r"\bOR\b", "or", normalized)
+    pattern = re.compile(r'(\w+)\s*(==|!=|>=|<=|>|<)\s*("[^"]*"|[\w@.\-]+)')
+    return pattern.sub(lambda m: f'attributes.get("{m[1]}", "") {m[2]} "{m[3]}"', normalized)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    documents = [
+        {"age": str(random.randint(18, 65)), "city": random.choice(["lhr", "khi", "isb"])}
+        for _ in range(n)
+    ]
+
+    source = eval_condition(CONDITION)
+    start = time.perf_counter()
+    expected = sum(1 for attributes in documents if eval(source, {}, {"attributes": attributes}))
+    eval_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matches = compile_condition(QUOTED_CONDITION).matches
+    found = sum(1 for attributes in documents if matches(attributes))
+    compiled_seconds = time.perf_counter() - start
+
+    assert found == expected
+    print(f"{n} documents, condition: {CONDITION}  ({found} matches)")
+    print(f"eval per record : {eval_seconds:8.3f}s  {n / eval_seconds:>12,.0f} docs/sec")
+    print(f"compiled closure: {compiled_seconds:8.3f}s  {n / compiled_seconds:>12,.0f} docs/sec")
+    print(f"speedup         : {eval_seconds / compiled_seconds:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import atexit
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from Backend.dbms import DBMS
+from Backend.query_processor import close_cursors, process_query
+
+
+@pytest.fixture
+def session(tmp_path, monkeypatch):
+    """
+    Returns a function that opens a DBMS in an empty directory (databases
+    live under the current one) on the given database, and returns a
+    function running statements on it, as the CLI does. Opening it again
+    loads what the earlier sessions left on disk.
+    """
+    monkeypatch.chdir(tmp_path)
+    opened = []
+
+    def open_session(database="test_db"):
+        dbms = DBMS()
+        opened.append(dbms)
+
+        def query(statement):
+            return process_query(statement, dbms, dbms.transaction_manager)
+        query.dbms = dbms
+        if database not in dbms.databases:
+            query(f"CREATE DATABASE {database}")
+        query(f"USE DATABASE {database}")
+        return query
+
+    yield open_session
+    for dbms in opened:
+        close_cursors(dbms)
+        dbms.flush()
+        dbms.transaction_manager.close()
+        atexit.unregister(dbms.flush)  # Its directory is gone by exit
+
+
+@pytest.fixture
+def query(session):
+    return session()
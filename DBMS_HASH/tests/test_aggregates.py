@@ -0,0 +1,101 @@
+import pytest
+
+CITIES = ["Lahore", "Karachi", "Quetta", "Multan", "Sialkot"]
+ROWS = 600
+
+
+@pytest.fixture(params=[False, True], ids=["scan", "indexed"])
+def both(query, request):
+    query("CREATE COLLECTION people")
+    rows = " ".join(f"(n={i} age={i % 45} city={CITIES[i % len(CITIES)]})" for i in range(ROWS))
+    query(f"INSERT MANY INTO people {rows}")
+    query("INSERT INTO people n=-1")  # No age and no city
+    if request.param:
+        query("CREATE INDEX idx_age ON people (age)")
+        query("CREATE INDEX idx_city ON people (city)")
+    return query
+
+
+def people(where=lambda record: True):
+    records = [{"n": i, "age": i % 45, "city": CITIES[i % len(CITIES)]} for i in range(ROWS)] + [{"n": -1}]
+    return [record for record in records if where(record)]
+
+
+def test_ungrouped_aggregates(both):
+    [row] = both("SHOW people AGGREGATE COUNT(*), COUNT(age), SUM(age), AVG(age), MIN(age), MAX(age)")["records"]
+    ages = [record["age"] for record in people() if "age" in record]
+    assert row == {
+        "COUNT(*)": ROWS + 1, "COUNT(age)": ROWS, "SUM(age)": sum(ages),
+        "AVG(age)": pytest.approx(sum(ages) / len(ages)), "MIN(age)": 0, "MAX(age)": 44,
+    }
+
+
+def test_aggregates_under_a_where(both):
+    [row] = both("SHOW people AGGREGATE COUNT(*), SUM(n) WHERE age>=40 AND city=Quetta")["records"]
+    matching = people(lambda record: record.get("age", -1) >= 40 and record.get("city") == "Quetta")
+    assert row == {"COUNT(*)": len(matching), "SUM(n)": sum(record["n"] for record in matching)}
+
+
+def test_group_by(both):
+    rows = both("SHOW people AGGREGATE COUNT(*), AVG(age), MAX(n) GROUP BY city")["records"]
+    expected = {}
+    for record in people():
+        expected.setdefault(record.get("city"), []).append(record)
+    assert {row["city"]: row["COUNT(*)"] for row in rows} == {city: len(group) for city, group in expected.items()}
+    for row in rows:
+        group = expected[row["city"]]
+        ages = [record["age"] for record in group if "age" in record]
+        assert row["AVG(age)"] == (pytest.approx(sum(ages) / len(ages)) if ages else None)
+        assert row["MAX(n)"] == max(record["n"] for record in group)
+
+
+def test_group_count_matches_after_writes(both):
+    both("DELETE FROM people WHERE age=3")
+    both("UPDATE people SET city=Lahore WHERE city=Multan")
+    rows = both("SHOW people AGGREGATE COUNT(*) GROUP BY city")["records"]
+    expected = {}
+    for record in people(lambda record: record.get("age") != 3):
+        city = "Lahore" if record.get("city") == "Multan" else record.get("city")
+        expected[city] = expected.get(city, 0) + 1
+    assert {row["city"]: row["COUNT(*)"] for row in rows} == expected
+
+
+def test_index_only_plans_are_used(query):
+    query("CREATE COLLECTION people")
+    query("INSERT MANY INTO people (n=1 age=3) (n=2 age=9)")
+    query("CREATE INDEX idx_age ON people (age)")
+    plan = query("EXPLAIN SHOW people AGGREGATE COUNT(*), MIN(age), MAX(age)")["records"]
+    assert [operator["operator"] for operator in plan] == ["Index-Only Aggregate"]
+    plan = query("EXPLAIN SHOW people AGGREGATE COUNT(*) GROUP BY age")["records"]
+    assert [operator["operator"] for operator in plan] == ["Index Group Count"]
+
+
+@pytest.mark.parametrize("statement", [
+    "SHOW people AGGREGATE",
+    "SHOW people AGGREGATE SUM(*)",
+    "SHOW people AGGREGATE MEDIAN(age)",
+    "SHOW people AGGREGATE COUNT(*) GROUP BY",
+])
+def test_malformed_aggregates_are_refused(query, statement):
+    query("CREATE COLLECTION people")
+    with pytest.raises(SyntaxError):
+        query(statement)
+
+
+def test_count_reads_the_live_size_unless_the_snapshot_is_behind(both, monkeypatch):
+    from Backend.mvcc import CLOCK, SnapshotRecords, SnapshotView
+
+    collection = both.dbms.get_current_database().get_collection("people")
+    snapshot = CLOCK.snapshot()
+    behind = SnapshotView(collection, snapshot)
+    both("BEGIN")
+    both("DELETE FROM people WHERE age=3")
+    both("INSERT INTO people n=1000 age=50")
+    items = SnapshotRecords.items
+    monkeypatch.setattr(SnapshotRecords, "items", lambda *args: pytest.fail("counted record by record"))
+    [row] = both("SHOW people AGGREGATE COUNT(*)")["records"]  # The transaction's own writes, so still current
+    assert row == {"COUNT(*)": len(people(lambda record: record.get("age") != 3)) + 1}
+    SnapshotRecords.items = items
+    assert len(behind.records) == ROWS + 1  # Uncommitted writes of someone else; counted from the snapshot
+    snapshot.release()
+    both("COMMIT")
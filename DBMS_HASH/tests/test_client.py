@@ -0,0 +1,75 @@
+import asyncio
+import threading
+
+import pytest
+
+from Backend.client import AsyncConnection, Connection, ConnectionPool
+from Backend.server import Server
+
+
+@pytest.fixture
+def port(query):
+    """Serve the test DBMS from a background event loop; yields the port it listens on."""
+    query("CREATE COLLECTION t")
+    query("INSERT MANY INTO t " + " ".join(f"(n={i} v={i % 3})" for i in range(30)))
+    loop = asyncio.new_event_loop()
+    server = Server(query.dbms, workers=4)
+    listener = loop.run_until_complete(asyncio.start_server(server.handle, "127.0.0.1", 0))
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield listener.sockets[0].getsockname()[1]
+
+    async def stop():
+        listener.close()
+        await server.close()
+    asyncio.run_coroutine_threadsafe(stop(), loop).result(10)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(10)
+    loop.close()
+
+
+def numbers(result):
+    return sorted(record["n"] for record in result["records"])
+
+
+def test_connection_runs_statements_and_raises_their_errors(port):
+    with Connection(port=port, database="test_db") as conn:
+        assert numbers(conn.query("SHOW t RECORDS WHERE v=1")) == list(range(1, 30, 3))
+        with pytest.raises(SyntaxError):
+            conn.query("SHOW missing RECORDS")
+        assert numbers(conn.query("SHOW t RECORDS WHERE n<2")) == [0, 1]  # Still usable
+
+
+@pytest.mark.parametrize("send", ["pipeline", "execute_many"])
+def test_several_statements_in_one_round_trip(port, send):
+    with Connection(port=port, database="test_db") as conn:
+        results = getattr(conn, send)(["INSERT INTO t n=100 v=9", "SHOW missing RECORDS", "SHOW t RECORDS WHERE v=9"], raise_errors=False)
+        assert isinstance(results[1], SyntaxError)
+        assert numbers(results[2]) == [100]
+        with pytest.raises(SyntaxError):
+            getattr(conn, send)(["SHOW missing RECORDS"])
+
+
+def test_pool_rolls_back_a_connection_given_back_mid_transaction(port):
+    with ConnectionPool(size=2, port=port, database="test_db") as pool:
+        with pool.connection() as conn:
+            conn.pipeline(["BEGIN", "UPDATE t SET v=7 WHERE n=0"])
+            assert conn.in_transaction
+        assert not pool.query("SHOW t RECORDS WHERE v=7")["records"]
+        pool.query("UPDATE t SET v=8 WHERE n=0")  # Not held up by the abandoned transaction
+        assert numbers(pool.query("SHOW t RECORDS WHERE v=8")) == [0]
+        assert pool.idle.qsize() == 1  # The same connection went back and was reused
+
+
+def test_async_connection_matches_replies_to_requests(port):
+    async def scenario():
+        async with await AsyncConnection.connect(port=port, database="test_db") as conn:
+            results = await asyncio.gather(*(conn.query(f"SHOW t RECORDS WHERE n={i}") for i in range(20)))
+            with pytest.raises(SyntaxError):
+                await conn.query("SHOW missing RECORDS")
+            batch = await conn.execute_many(["SHOW t RECORDS WHERE n=3", "SHOW t RECORDS WHERE n=4"])
+            return results, batch
+
+    results, batch = asyncio.run(scenario())
+    assert [numbers(result) for result in results] == [[i] for i in range(20)]
+    assert [numbers(result) for result in batch] == [[3], [4]]
@@ -0,0 +1,59 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from Backend import planner
+
+ROWS = 500
+
+
+def load(query):
+    query("CREATE COLLECTION m")
+    values = ["{}", "{}.5", "'{}'", "true", "x{}", ""]  # Ints, floats, numeric text, bools, text and missing
+    rows = []
+    for i in range(ROWS):
+        value = values[i % len(values)].format(i % 40)
+        rows.append(f"(n={i} v={value})" if value else f"(n={i})")
+    query("INSERT MANY INTO m " + " ".join(rows))
+
+
+def run(query, monkeypatch, statement, columnar):
+    monkeypatch.setattr(planner, "COLUMNAR_MIN_ROWS", 0 if columnar else 10 ** 9)
+    operators = [operator["operator"] for operator in query("EXPLAIN " + statement)["records"]]
+    return operators, query(statement)["records"]
+
+
+def numbers(records):
+    return sorted(record["n"] for record in records)
+
+
+@pytest.mark.parametrize("condition", ["v>20", "v<=3", "v=7", "v!=7 AND v<3", "v>=10 AND v<15", "v<2 OR v>38", "NOT v>5 AND n<50"])
+def test_columnar_scan_matches_a_full_scan(query, monkeypatch, condition):
+    load(query)
+    statement = f"SHOW m RECORDS WHERE {condition}"
+    operators, vectorized = run(query, monkeypatch, statement, True)
+    assert "Columnar Scan" in operators
+    assert numbers(vectorized) == numbers(run(query, monkeypatch, statement, False)[1])
+
+
+@pytest.mark.parametrize("condition", ["", " WHERE v>10", " WHERE n<100 AND v!=3"])
+def test_columnar_aggregate_matches_the_hash_aggregate(query, monkeypatch, condition):
+    load(query)
+    statement = f"SHOW m AGGREGATE COUNT(*), COUNT(v), SUM(v), AVG(v), MIN(v), MAX(v){condition}"
+    operators, [vectorized] = run(query, monkeypatch, statement, True)
+    assert operators == ["Columnar Aggregate"]
+    [expected] = run(query, monkeypatch, statement, False)[1]
+    assert vectorized == pytest.approx(expected)
+
+
+def test_writes_keep_the_shadow_in_sync(query, monkeypatch):
+    load(query)
+    statement = "SHOW m RECORDS WHERE v>30"
+    run(query, monkeypatch, statement, True)  # Builds the shadow
+    query("INSERT INTO m n=1000 v=35")
+    query("UPDATE m SET v=1 WHERE n=31")
+    query("DELETE FROM m WHERE n=32")
+    operators, vectorized = run(query, monkeypatch, statement, True)
+    assert "Columnar Scan" in operators
+    assert numbers(vectorized) == numbers(run(query, monkeypatch, statement, False)[1])
+    assert 1000 in numbers(vectorized) and 31 not in numbers(vectorized)
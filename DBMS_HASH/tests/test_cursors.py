@@ -0,0 +1,67 @@
+import pytest
+
+from Backend.hashtable import HashTable
+from Backend.mvcc import CLOCK
+
+
+@pytest.fixture
+def loaded(query):
+    query("CREATE COLLECTION t")
+    query("INSERT MANY INTO t " + " ".join(f"(n={i} v={i % 5})" for i in range(100)))
+    return query
+
+
+def test_pages_add_up_to_the_whole_result(loaded):
+    expected = loaded("SHOW t RECORDS WHERE v=1 OR v=2")["records"]
+    loaded("DECLARE c CURSOR FOR SHOW t RECORDS WHERE v=1 OR v=2")
+    pages = [loaded("FETCH NEXT 7 FROM c") for _ in range(6)]
+    assert [len(page["records"]) for page in pages] == [7, 7, 7, 7, 7, 5]
+    assert "No more records" in pages[-1]["message"]
+    assert [record for page in pages for record in page["records"]] == expected
+    assert loaded("FETCH NEXT FROM c")["records"] == []
+    loaded("CLOSE c")
+    with pytest.raises(ValueError):
+        loaded("FETCH NEXT FROM c")
+
+
+def test_cursor_names_are_unique(loaded):
+    loaded("DECLARE c CURSOR FOR SHOW t RECORDS")
+    with pytest.raises(ValueError):
+        loaded("DECLARE c CURSOR FOR SHOW t RECORDS")
+    with pytest.raises(ValueError):
+        loaded("CLOSE other")
+
+
+@pytest.mark.parametrize("end", ["COMMIT", "ROLLBACK"])
+def test_transaction_end_closes_cursors(loaded, end):
+    loaded("BEGIN")
+    loaded("DECLARE c CURSOR FOR SHOW t RECORDS")
+    loaded("FETCH NEXT 5 FROM c")
+    assert CLOCK.readers
+    loaded(end)
+    assert not loaded.dbms.cursors
+    assert not CLOCK.readers  # The cursor's snapshot was released
+    with pytest.raises(ValueError):
+        loaded("FETCH NEXT 5 FROM c")
+
+
+def test_closing_an_unfetched_cursor_releases_its_snapshot(loaded):
+    loaded("DECLARE c CURSOR FOR SHOW t RECORDS")
+    assert CLOCK.readers
+    loaded("CLOSE c")
+    assert not CLOCK.readers
+
+
+def test_scans_copy_the_records_only_once_a_write_intervenes(loaded, monkeypatch):
+    copies = []
+    slots = HashTable.slots
+    monkeypatch.setattr(HashTable, "slots", lambda table, copy=True: copies.append(copy) or slots(table, copy))
+    loaded("DECLARE c CURSOR FOR SHOW t RECORDS")
+    first = loaded("FETCH NEXT 5 FROM c")["records"]
+    assert loaded("SHOW t RECORDS LIMIT 3")["records"]
+    assert copies == [False, False]  # Both read the live arrays
+    loaded("INSERT MANY INTO t " + " ".join(f"(n={i} v=9)" for i in range(100, 400)))  # Resizes the table
+    loaded("DELETE FROM t WHERE v=1")
+    rest = loaded("FETCH NEXT 1000 FROM c")["records"]
+    assert sorted(record["n"] for record in first + rest) == list(range(100))
+    loaded("CLOSE c")
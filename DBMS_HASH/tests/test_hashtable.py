@@ -0,0 +1,64 @@
+import random
+
+from Backend.hashtable import HashTable
+
+
+class Colliding:
+    """A key whose hash every other one shares, so lookups have to probe past it."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __hash__(self):
+        return 42
+
+    def __eq__(self, other):
+        return isinstance(other, Colliding) and other.name == self.name
+
+
+def test_matches_a_dict_under_random_inserts_and_removes():
+    random.seed(7)
+    table, expected = HashTable(), {}
+    for step in range(20000):
+        key = random.randrange(3000)
+        if random.random() < 0.6:
+            table.insert(key, step)
+            expected[key] = step
+        else:
+            assert table.remove(key) == (expected.pop(key, None) is not None)
+    assert len(table) == len(expected)
+    assert dict(table.items()) == expected
+    assert all(table.get(key) == value for key, value in expected.items())
+    assert table.get(-1) is None and -1 not in table
+
+
+def test_grows_and_shrinks():
+    table = HashTable()
+    for key in range(10000):
+        table.insert(key, key)
+    grown = table.size
+    assert grown >= 10000 / table.max_load
+    for key in range(9990):
+        table.remove(key)
+    assert table.size < grown
+    assert sorted(table.keys()) == list(range(9990, 10000))
+
+
+def test_colliding_keys_survive_removals_between_them():
+    table = HashTable()
+    keys = [Colliding(name) for name in "abcdef"]
+    for key in keys:
+        table.insert(key, key.name)
+    table.remove(keys[1])
+    table.remove(keys[3])
+    assert [table.get(key) for key in keys] == ["a", None, "c", None, "e", "f"]
+    table.insert(Colliding("d"), "d again")  # Reuses a tombstone on the probe path
+    assert table.get(Colliding("d")) == "d again"
+    assert len(table) == 5
+
+
+def test_insert_overwrites_an_existing_key():
+    table = HashTable()
+    table.insert("id", 1)
+    table.insert("id", 2)
+    assert table.get("id") == 2 and len(table) == 1
@@ -0,0 +1,125 @@
+import json
+import os
+import random
+
+import pytest
+
+from Backend.collection import Collection
+from Backend.indexing import BPlusTree
+
+
+def collection(query, name="t"):
+    return query.dbms.get_current_database().get_collection(name)
+
+
+def values(query, condition):
+    return sorted((record["n"], record["v"]) for record in query(f"SHOW t RECORDS WHERE {condition}")["records"])
+
+
+def load(query):
+    query("CREATE COLLECTION t")
+    query("INSERT MANY INTO t " + " ".join(f"(n={i} v={i % 5})" for i in range(100)))
+    query("CREATE INDEX idx_v ON t (v)")
+
+
+def index_lsn_on_disk(name="v"):
+    with open(f"test_db/t_{name}_index.json") as file:
+        return json.load(file)["lsn"]
+
+
+def test_index_files_are_stamped_with_the_log_position(query, session, monkeypatch):
+    monkeypatch.setattr(Collection, "INDEX_FLUSH_INTERVAL", 0)
+    load(query)
+    query("INSERT INTO t n=100 v=9")
+    index = collection(query).indexes["v"]
+    assert index.lsn == collection(query).lsn
+    reopened = collection(session())
+    assert reopened.indexes["v"].lsn == reopened.lsn
+
+
+def test_lazily_flushed_indexes_catch_up_on_reopen(query, session, monkeypatch):
+    load(query)
+    monkeypatch.setattr(Collection, "INDEX_FLUSH_INTERVAL", 3600)
+    query("INSERT MANY INTO t (n=1000 v=9) (n=1001 v=9)")
+    query("DELETE FROM t WHERE v=2")
+    assert collection(query).indexes["v"].dirty
+    reopened = session()  # The index file on disk predates both statements
+    assert values(reopened, "v=9") == [(1000, 9), (1001, 9)]
+    assert not values(reopened, "v=2")
+
+
+def test_flush_writes_out_dirty_indexes(query, session, monkeypatch):
+    load(query)
+    monkeypatch.setattr(Collection, "INDEX_FLUSH_INTERVAL", 3600)
+    query("INSERT INTO t n=1000 v=9")
+    query.dbms.flush()
+    index = collection(query).indexes["v"]
+    assert not index.dirty and index.lsn == collection(query).lsn
+    assert values(session(), "v=9") == [(1000, 9)]
+
+
+def test_write_statements_do_not_rewrite_index_files(query):
+    load(query)
+    written = index_lsn_on_disk()
+    query("INSERT INTO t n=1000 v=9")
+    query("DELETE FROM t WHERE n=3")
+    assert collection(query).indexes["v"].dirty and index_lsn_on_disk() == written
+    query("COMPACT t")
+    assert index_lsn_on_disk() == collection(query).lsn
+
+
+def test_a_failed_index_save_leaves_the_old_file(query, session):
+    load(query)
+    query("INSERT INTO t n=1000 v=9")
+    index = collection(query).indexes["v"]
+    written = index_lsn_on_disk()
+
+    def fail():
+        raise OSError("disk full")
+    index.to_dict = fail
+    with pytest.raises(OSError):
+        query.dbms.flush()
+    assert index.dirty and index_lsn_on_disk() == written
+    assert sorted(os.listdir("test_db")) == ["database.json", "t.json", "t.log", "t_indexes.json", "t_v_index.json"]
+    del index.to_dict  # Saves work again
+    assert values(session(), "v=9") == [(1000, 9)]  # Rebuilt, as the file is behind the log
+
+
+def test_unreadable_index_files_are_rebuilt(query, session):
+    load(query)
+    query.dbms.flush()
+    with open("test_db/t_v_index.json", "w") as file:
+        file.write('{"order": 4, "entr')
+    assert values(session(), "v=3") == [(n, 3) for n in range(3, 100, 5)]
+
+
+def leaves(tree):
+    leaf = tree._first_leaf()
+    while leaf is not None:
+        yield leaf
+        leaf = leaf.next
+
+
+def test_deletes_unlink_emptied_leaves():
+    rng = random.Random(6)
+    tree, oracle = BPlusTree(order=4), {}
+    for step in range(3000):
+        key = rng.randrange(300)
+        if rng.random() < 0.45:
+            tree.insert(key, step)
+            oracle.setdefault(key, set()).add(step)
+        elif oracle.get(key):
+            tree.remove(key, oracle[key].pop())
+            if not oracle[key]:
+                del oracle[key]
+        assert (tree.min_key(), tree.max_key()) == (min(oracle, default=None), max(oracle, default=None))
+    assert [(key, set(doc_ids)) for key, doc_ids in tree.items()] == sorted(oracle.items())
+    assert all(leaf.keys for leaf in leaves(tree))
+    assert sorted(tree.range_search(100, 200)) == sorted(doc_id for key in oracle if 100 <= key <= 200 for doc_id in oracle[key])
+
+    for key in list(oracle):
+        tree.remove(key)
+    assert tree.root.is_leaf and tree.min_key() is None and tree.max_key() is None
+    tree.insert(5, "x")
+    assert tree.search(5) == ["x"]
+
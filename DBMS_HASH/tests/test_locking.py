@@ -0,0 +1,113 @@
+import threading
+import time
+
+import pytest
+
+from Backend import locking
+from Backend.collection import Collection
+from Backend.locking import DeadlockError, RWLock, WriteLock
+from Backend.query_processor import process_query
+from Backend.transaction import TransactionManager
+
+
+def in_thread(target):
+    """Run `target` in a thread; returns the thread and a list that receives its result or exception."""
+    outcome = []
+
+    def run():
+        try:
+            outcome.append(target())
+        except Exception as e:
+            outcome.append(e)
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread, outcome
+
+
+def test_readers_share_and_writers_wait():
+    lock = RWLock("t")
+
+    def use(hold):
+        with hold():
+            return "done"
+    lock.acquire_read()
+    reader, read = in_thread(lambda: use(lock.read))
+    reader.join(1)
+    assert read == ["done"]  # A second reader got in
+    writer, written = in_thread(lambda: use(lock.write))
+    writer.join(0.1)
+    assert writer.is_alive()  # Waiting for the first reader
+    lock.release_read()
+    writer.join(1)
+    assert written == ["done"]
+
+
+def test_write_lock_is_reentrant_and_not_upgradable():
+    lock = RWLock("t")
+    with lock.write():
+        with lock.write():
+            with lock.read():
+                pass
+    assert lock.writer is None
+    with lock.read():
+        with pytest.raises(RuntimeError):
+            lock.acquire_write()
+
+
+def test_write_lock_cycle_fails_at_once():
+    first, second = WriteLock("a"), WriteLock("b")
+    a, b = object(), object()
+    first.acquire(a)
+    second.acquire(b)
+    thread, outcome = in_thread(lambda: first.acquire(b, timeout=5))
+    while b not in WriteLock.waiting:
+        time.sleep(0.01)
+    with pytest.raises(DeadlockError):
+        second.acquire(a)
+    first.release(a)  # What a ROLLBACK does; b gets through
+    thread.join(1)
+    assert outcome == [None] and first.owner is b
+    with pytest.raises(ValueError):
+        second.acquire(a, timeout=0.05)
+
+
+def test_a_transaction_holds_its_collections_until_it_ends(query, monkeypatch):
+    monkeypatch.setattr(locking, "LOCK_TIMEOUT", 0.05)
+    query("CREATE COLLECTION t")
+    query("INSERT MANY INTO t (n=1 v=1) (n=2 v=2)")
+    dbms = query.dbms
+    other = TransactionManager(dbms.root_path)
+
+    query("BEGIN")
+    query("UPDATE t SET v=5 WHERE n=1")
+    with pytest.raises(ValueError):
+        process_query("UPDATE t SET v=6 WHERE n=2", dbms, other)
+    assert sorted(record["v"] for record in process_query("SHOW t RECORDS", dbms, other)["records"]) == [1, 2]
+    query("COMMIT")
+    process_query("UPDATE t SET v=6 WHERE n=2", dbms, other)
+    assert sorted(record["v"] for record in query("SHOW t RECORDS")["records"]) == [5, 6]
+    other.close()
+
+
+def test_a_long_read_lets_writers_in_between_chunks(query, monkeypatch):
+    query("CREATE COLLECTION t")
+    query("INSERT MANY INTO t " + " ".join(f"(n={i} v=0)" for i in range(100)))
+    collection = query.dbms.get_current_database().get_collection("t")
+    monkeypatch.setattr(Collection, "RUN_CHUNK", 10)
+    acquire_read, reads, blocked = collection.lock.acquire_read, [], []
+
+    def acquire_between_chunks():
+        reads.append(None)
+        if len(reads) == 3:  # Planning, then the first chunk, are done
+            writer, _ = in_thread(lambda: collection.update("n<100", {"v": 1}))
+            writer.join(5)
+            blocked.append(writer.is_alive())
+        acquire_read()
+    collection.lock.acquire_read = acquire_between_chunks
+    records = query("SHOW t RECORDS")["records"]
+    del collection.lock.acquire_read
+
+    assert blocked == [False]
+    assert len(reads) > 10
+    assert sorted((record["n"], record["v"]) for record in records) == [(n, 0) for n in range(100)]
+    assert {record["v"] for record in query("SHOW t RECORDS")["records"]} == {1}
@@ -0,0 +1,61 @@
+import threading
+
+import pytest
+
+from Backend import parallel, planner
+from Backend.collection import Collection
+from Backend.predicate import compile_condition
+
+ROWS = 3000
+
+
+@pytest.fixture
+def people(query, monkeypatch):
+    monkeypatch.setattr(Collection, "PARALLEL_WORKERS", 1)  # SET PARALLEL_WORKERS changes it for every collection
+    query("CREATE COLLECTION people")
+    query("INSERT MANY INTO people " + " ".join(f"(n={i} age={i % 70})" for i in range(ROWS)))
+    query("DELETE FROM people WHERE age=3")  # Leave tombstones for the workers to skip
+    return query
+
+
+def test_partitions_cover_every_slot():
+    for size, count in [(8, 3), (1024, 16), (10, 10), (5, 8)]:
+        pieces = parallel.partitions(size, count)
+        assert pieces[0][0] == 0 and pieces[-1][1] == size
+        assert all(stop == start for (_, stop), (start, _) in zip(pieces, pieces[1:]))
+
+
+def test_parallel_scan_matches_a_serial_scan(people):
+    records = people.dbms.get_current_database().get_collection("people").records
+    # No record has a nickname: a missing field must still compare as missing in the workers
+    predicate = compile_condition("(age>=60 AND NOT age=65) OR (nickname<b AND age=5)")
+    serial = [doc_id for doc_id, obj in records.items() if predicate.matches(obj.attributes)]
+    assert len(serial) == 9 * (ROWS // 70) + (ROWS // 70 + 1)
+    assert parallel.parallel_scan(records, predicate.node, 3) == serial
+
+
+def test_concurrent_scans_share_one_pool(people):
+    records = people.dbms.get_current_database().get_collection("people").records
+    pool = parallel._pool(2)
+    results = {}
+
+    def scan(age):
+        results[age] = parallel.parallel_scan(records, compile_condition(f"age={age}").node, 2)
+    threads = [threading.Thread(target=scan, args=(age,)) for age in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(60)
+    assert results == {age: [doc_id for doc_id, obj in records.items() if obj.attributes["age"] == age] for age in range(8)}
+    assert parallel._pools[2] is pool
+
+
+def test_planner_picks_a_parallel_scan_with_the_same_results(people, monkeypatch):
+    statement = "SHOW people RECORDS WHERE age=61 OR age=1"
+    serial = people(statement)["records"]
+    monkeypatch.setattr(parallel.os, "cpu_count", lambda: 4)
+    monkeypatch.setattr(planner, "WORKER_COST", 0.0)
+    people("SET PARALLEL_WORKERS 4")
+    operators = [operator["operator"] for operator in people("EXPLAIN " + statement)["records"]]
+    assert "Parallel Scan" in operators
+    assert people(statement)["records"] == serial
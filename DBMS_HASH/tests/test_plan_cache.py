@@ -0,0 +1,27 @@
+from Backend.plan_cache import PlanCache, normalize_query
+
+
+def test_literals_become_parameters():
+    key, params = normalize_query("SHOW t  RECORDS WHERE age>=30 AND city='Lahore' OR (n = \"x y\")")
+    assert key == "SHOW t RECORDS WHERE age>=? AND city=? OR (n = ?)"
+    assert params == [30, "Lahore", "x y"]  # Unquoted literals are typed
+
+
+def test_least_recently_used_plan_is_evicted():
+    cache = PlanCache(capacity=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats()["hits"] == 3 and cache.stats()["misses"] == 1
+
+
+def test_statements_differing_only_in_literals_share_a_plan(query):
+    query("CREATE COLLECTION t")
+    query("INSERT MANY INTO t " + " ".join(f"(n={i} v={i % 5})" for i in range(50)))
+    counts = [len(query(f"SHOW t RECORDS WHERE v={v} AND n!=0")["records"]) for v in range(5)]
+    assert counts == [9, 10, 10, 10, 10]  # Each run binds its own literals into the cached plan
+    stats = query("SHOW CACHE STATS")["records"][0]
+    assert (stats["misses"], stats["hits"], stats["size"]) == (1, 4, 1)
@@ -0,0 +1,119 @@
+import pytest
+
+CITIES = ["lhr", "khi", "isb", "pew", "mux", "qta", "skt"]
+DEPTS = ["cs", "ee", "me", "ce"]
+ROWS = 2000
+
+
+def load(query, name, indexed):
+    query(f"CREATE COLLECTION {name}")
+    query(f"INSERT MANY INTO {name} " + " ".join(
+        f"(n={i} age={i % 60} city={CITIES[i % 7]} dept={DEPTS[i % 4]} score={i * 7919 % ROWS})" for i in range(ROWS)))
+    if indexed:
+        query(f"CREATE INDEX idx_age ON {name} (age)")
+        query(f"CREATE INDEX idx_city ON {name} (city)")
+        query(f"CREATE INDEX idx_dept ON {name} (dept)")
+
+
+@pytest.fixture
+def both(query):
+    """The same records twice: `indexed` with indexes on age, city and dept, `plain` with none."""
+    load(query, "indexed", True)
+    load(query, "plain", False)
+    return query
+
+
+def numbers(result):
+    return sorted(int(record["n"]) for record in result["records"])
+
+
+def values(result, field):
+    return [record.get(field) for record in result["records"]]
+
+
+def operators(query, statement):
+    return [operator["operator"] for operator in query("EXPLAIN " + statement)["records"]]
+
+
+@pytest.mark.parametrize("condition", [
+    "age>=30 AND age<33",
+    "age>57",
+    "age<=2",
+    "age<0",
+    "age=7",
+    "city=isb",
+    "city>=pew",
+    "age>=50 AND age!=55",
+])
+def test_index_results_match_full_scans(both, condition):
+    indexed = numbers(both(f"SHOW indexed RECORDS WHERE {condition}"))
+    assert indexed == numbers(both(f"SHOW plain RECORDS WHERE {condition}"))
+    assert indexed or condition == "age<0"
+
+
+@pytest.mark.parametrize("condition, access", [
+    ("city=isb", "Index Point Lookup"),
+    ("city=lhr AND dept=ee", "Index Intersection"),
+    ("age=1 OR city=skt", "Index Union"),
+    ("(age=7 OR age=8) AND city!=khi", "Index Union"),
+    ("city=lhr OR (dept=cs AND age=3)", "Index Union"),
+])
+def test_and_or_index_plans_match_full_scans(both, condition, access):
+    assert access in operators(both, f"SHOW indexed RECORDS WHERE {condition}")
+    indexed = numbers(both(f"SHOW indexed RECORDS WHERE {condition}"))
+    assert indexed and indexed == numbers(both(f"SHOW plain RECORDS WHERE {condition}"))
+
+
+def test_not_equal_is_checked_outside_the_index(both):
+    # A record without the field satisfies !=, and the index never sees such a record
+    both("INSERT INTO indexed n=-1")
+    both("INSERT INTO plain n=-1")
+    assert "Full Scan" in operators(both, "SHOW indexed RECORDS WHERE age!=5")
+    assert numbers(both("SHOW indexed RECORDS WHERE age!=5")) == numbers(both("SHOW plain RECORDS WHERE age!=5"))
+    plan = both("EXPLAIN SHOW indexed RECORDS WHERE age>=50 AND age!=55")["records"]
+    assert [operator["operator"] for operator in plan][-1] == "Index Range Scan"
+    assert any("age != 55" in operator["detail"] for operator in plan)
+
+
+def test_or_with_an_unindexed_branch_scans(both):
+    assert "Full Scan" in operators(both, "SHOW indexed RECORDS WHERE city=lhr OR n=5")
+    assert numbers(both("SHOW indexed RECORDS WHERE city=lhr OR n=5")) == numbers(both("SHOW plain RECORDS WHERE city=lhr OR n=5"))
+
+
+def test_top_k_matches_a_full_sort(both):
+    statement = "SHOW plain RECORDS WHERE city!=lhr SORTBY score DESC OFFSET 3 LIMIT 5"
+    assert "Top-K Sort" in operators(both, statement)
+    everything = both("SHOW plain RECORDS WHERE city!=lhr SORTBY score DESC")["records"]
+    assert both(statement)["records"] == everything[3:8]
+
+
+@pytest.mark.parametrize("order", ["ASC", "DESC"])
+def test_index_ordered_scan_matches_a_full_sort(both, order):
+    statement = f"SHOW indexed RECORDS SORTBY age {order} OFFSET 20 LIMIT 50"
+    assert "Index Ordered Scan" in operators(both, statement)
+    ordered = [record["age"] for record in both(statement)["records"]]
+    assert ordered == [record["age"] for record in both(f"SHOW plain RECORDS SORTBY age {order}")["records"]][20:70]
+
+
+def test_update_and_delete_agree_with_full_scans(both):
+    for name in ("indexed", "plain"):
+        both(f"UPDATE {name} SET city=zzz flag=1 WHERE age<3 OR city=skt")
+        both(f"DELETE FROM {name} WHERE city=isb AND age>=30")
+    for condition in ("city=zzz", "city=skt", "city=isb", "age<3", "flag=1"):
+        assert numbers(both(f"SHOW indexed RECORDS WHERE {condition}")) == numbers(both(f"SHOW plain RECORDS WHERE {condition}"))
+    assert not both("SHOW indexed RECORDS WHERE city=skt")["records"]
+
+
+def test_legacy_numeric_text_sorts_as_numbers(query):
+    # Values stored before fields were typed keep the text they were written as
+    query("CREATE COLLECTION people")
+    collection = query.dbms.get_current_database().get_collection("people")
+    collection.insert_many([{"n": i, "age": str(age)} for i, age in enumerate([20, 5, 44, 31, 100, 9])])
+    query("UPDATE people SET age=31 WHERE n=3")
+    for indexed in (False, True):
+        if indexed:
+            query("CREATE INDEX idx_age ON people (age)")
+        ages = [int(age) for age in values(query("SHOW people RECORDS SORTBY age DESC"), "age")]
+        assert ages == [100, 44, 31, 20, 9, 5]
+        extremes = query("SHOW people AGGREGATE MIN(age), MAX(age)")["records"][0]
+        assert (int(extremes["MIN(age)"]), int(extremes["MAX(age)"])) == (5, 100)
@@ -0,0 +1,56 @@
+import pytest
+
+from Backend.predicate import Parser, Predicate
+
+
+def matches(condition, attributes):
+    return Predicate(Parser(condition).parse()).matches(attributes)
+
+
+def test_comparisons():
+    record = {"age": "30", "city": "Lahore", "score": "2.5"}
+    assert matches("age=30", record)
+    assert matches("age==30 AND city=Lahore", record)
+    assert matches("age>=30 AND age<31 AND score>2", record)
+    assert not matches("age!=30", record)
+    assert not matches("city='Karachi'", record)
+
+
+def test_and_binds_tighter_than_or():
+    assert matches("a=1 OR a=2 AND b=3", {"a": "1", "b": "0"})
+    assert not matches("(a=1 OR a=2) AND b=3", {"a": "1", "b": "0"})
+
+
+def test_not_and_parentheses():
+    assert matches("NOT (a=1 OR b=2)", {"a": "0", "b": "0"})
+    assert not matches("NOT (a=1 OR b=2)", {"a": "0", "b": "2"})
+    assert matches("not a=1 and (b>1 or c=x)", {"a": "2", "b": "0", "c": "x"})
+
+
+def test_empty_condition_matches_everything():
+    assert matches("", {"a": "1"})
+
+
+@pytest.mark.parametrize("condition", ["a=", "(a=1", "a=1 AND", "a=1 b=2", "a ~ 1"])
+def test_malformed_conditions(condition):
+    with pytest.raises(SyntaxError):
+        Parser(condition).parse()
+
+
+def test_conditions_are_never_run_as_python():
+    for condition in ("a=1 OR __import__('os').getcwd()", "a=len(a)"):
+        with pytest.raises(SyntaxError):
+            Parser(condition).parse()
+
+
+def test_typed_values_compare_as_their_type():
+    assert matches("age>9", {"age": 10})
+    assert not matches('age>"9"', {"age": 10})  # Quoted, so text; only a declared type makes it a number
+    assert matches("active=true", {"active": True})
+    assert matches("code=7", {"code": "7"})  # Text stored before values were typed compares as its number
+    assert not matches("code=7", {"code": "x7"})
+
+
+def test_missing_field_never_matches():
+    assert not matches("age>20", {"name": "x"})
+    assert not matches("age<20", {"name": "x"})
@@ -0,0 +1,68 @@
+import pytest
+
+from Backend.schema import Schema
+
+
+def stored(query, name):
+    return sorted((record["n"], record) for record in query(f"SHOW {name} RECORDS")["records"])
+
+
+def test_parse():
+    schema = Schema.parse("(age int, score FLOAT, joined timestamp)")
+    assert schema.types == {"age": "int", "score": "float", "joined": "timestamp"}
+    for text in ("age int", "(age)", "(age integer)"):
+        with pytest.raises(SyntaxError):
+            Schema.parse(text)
+
+
+def test_declared_fields_are_converted(query):
+    query("CREATE COLLECTION p (n int, score float, active bool, code string, joined timestamp)")
+    query("INSERT INTO p n=1 score=3 active=yes code=007 joined=0 other=5")
+    query("INSERT MANY INTO p (n=2 score=2.5 active=0 code=42 joined=2024-01-02T03:04:05+00:00)")
+    (_, first), (_, second) = stored(query, "p")
+    assert (first["score"], first["active"], first["code"], first["other"]) == (3.0, True, "007", 5)
+    assert type(first["score"]) is float
+    assert first["joined"] == "1970-01-01T00:00:00+00:00"
+    assert (second["active"], second["code"]) == (False, "42")
+
+
+@pytest.mark.parametrize("statement", [
+    "INSERT INTO p n=x",
+    "INSERT INTO p n=1.5",
+    "INSERT INTO p n=1 active=maybe",
+    "UPDATE p SET n=abc WHERE n=1",
+])
+def test_values_that_do_not_fit_are_refused(query, statement):
+    query("CREATE COLLECTION p (n int, active bool)")
+    query("INSERT INTO p n=1 active=true")
+    with pytest.raises(ValueError):
+        query(statement)
+    assert [(record["n"], record["active"]) for _, record in stored(query, "p")] == [(1, True)]
+
+
+def test_typed_comparisons_and_index_agree(query):
+    query("CREATE COLLECTION p (n int)")
+    query("INSERT MANY INTO p " + " ".join(f"(n={i})" for i in range(30)))
+    scanned = sorted(record["n"] for record in query('SHOW p RECORDS WHERE n>"9"')["records"])
+    query("CREATE INDEX idx_n ON p (n)")
+    indexed = sorted(record["n"] for record in query('SHOW p RECORDS WHERE n>"9"')["records"])
+    assert scanned == indexed == list(range(10, 30))
+
+
+def test_alter_converts_stored_values(query, session):
+    query("CREATE COLLECTION p")
+    query("INSERT MANY INTO p (n=1 age='30') (n=2 age='7') (n=3)")
+    query("CREATE INDEX idx_age ON p (age)")
+    query("ALTER COLLECTION p (age int)")
+    assert [record.get("age") for _, record in stored(query, "p")] == [30, 7, None]
+    assert [record["n"] for record in query("SHOW p RECORDS WHERE age<10")["records"]] == [2]
+    assert [record.get("age") for _, record in stored(session(), "p")] == [30, 7, None]
+
+
+def test_alter_changes_nothing_if_a_value_does_not_convert(query):
+    query("CREATE COLLECTION p")
+    query("INSERT MANY INTO p (n=1 age='30') (n=2 age=old)")
+    with pytest.raises(ValueError):
+        query("ALTER COLLECTION p (age int)")
+    assert [record["age"] for _, record in stored(query, "p")] == ["30", "old"]
+    query("INSERT INTO p n=3 age=x")  # Still untyped
@@ -0,0 +1,80 @@
+import asyncio
+
+from Backend.protocol import HEADER, encode, read_message
+from Backend.server import Server
+
+
+def serving(dbms, scenario):
+    """Run `scenario(connect)` against a server on a free local port; connect() opens a client."""
+    async def run():
+        server = Server(dbms, workers=4)
+        listener = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+
+        async def connect():
+            return await asyncio.open_connection("127.0.0.1", port)
+        try:
+            return await scenario(connect)
+        finally:
+            listener.close()
+            await server.close()
+    return asyncio.run(run())
+
+
+async def ask(connection, *queries):
+    reader, writer = connection
+    for number, query in enumerate(queries):
+        writer.write(encode({"id": number, "query": query}))  # All sent before any reply is read
+    await writer.drain()
+    responses = [await read_message(reader) for _ in queries]
+    assert [response["id"] for response in responses] == list(range(len(queries)))
+    return responses
+
+
+def test_requests_are_answered_in_order(query):
+    query("CREATE COLLECTION t")
+
+    async def scenario(connect):
+        client = await connect()
+        return await ask(client, "USE DATABASE test_db", "INSERT INTO t n=1", "SHOW t RECORDS", "SHOW nope RECORDS")
+
+    _, _, shown, missing = serving(query.dbms, scenario)
+    assert [record["n"] for record in shown["result"]["records"]] == [1]
+    assert missing["error"] == {"type": "SyntaxError", "message": "Collection don't exist."}
+
+
+def test_sessions_keep_their_own_transaction(query):
+    query("CREATE COLLECTION t")
+    query("INSERT INTO t n=1 v=1")
+
+    async def scenario(connect):
+        first, second = await connect(), await connect()
+        await ask(first, "USE DATABASE test_db", "BEGIN", "UPDATE t SET v=2 WHERE n=1")
+        [_, during] = await ask(second, "USE DATABASE test_db", "SHOW t RECORDS")
+        first[1].close()  # Hang up mid-transaction
+        await first[1].wait_closed()
+        [after] = await ask(second, "UPDATE t SET v=3 WHERE n=1")  # Waits for the rollback to free t
+        [shown] = await ask(second, "SHOW t RECORDS")
+        return during, after, shown
+
+    during, after, shown = serving(query.dbms, scenario)
+    assert [record["v"] for record in during["result"]["records"]] == [1]
+    assert "result" in after
+    assert [record["v"] for record in shown["result"]["records"]] == [3]
+    assert query.dbms.current_database.name == "test_db"  # Sessions never moved the DBMS's own
+
+
+def test_malformed_requests_get_protocol_errors(query):
+    async def scenario(connect):
+        reader, writer = await connect()
+        writer.write(encode({"id": 7, "sql": "SHOW DATABASES"}))
+        no_query = await read_message(reader)
+        payload = b"{not json"
+        writer.write(HEADER.pack(len(payload)) + payload)
+        garbled = await read_message(reader)
+        closed = await read_message(reader)
+        return no_query, garbled, closed
+
+    no_query, garbled, closed = serving(query.dbms, scenario)
+    assert no_query["id"] == 7 and no_query["error"]["type"] == "ProtocolError"
+    assert garbled["error"]["type"] == "ProtocolError" and closed is None
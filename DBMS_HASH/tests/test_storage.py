@@ -0,0 +1,70 @@
+import json
+import os
+
+from Backend.collection import Collection
+
+
+def records(query):
+    return sorted((record["n"], record["v"]) for record in query("SHOW t RECORDS")["records"])
+
+
+def load(query):
+    query("CREATE COLLECTION t")
+    for n in range(5):
+        query(f"INSERT INTO t n={n} v=a")
+    query("UPDATE t SET v=b WHERE n=1")
+    query("DELETE FROM t WHERE n=2")
+
+
+def test_writes_survive_a_reopen(query, session):
+    load(query)
+    expected = [(0, "a"), (1, "b"), (3, "a"), (4, "a")]
+    assert records(query) == expected
+    assert records(session()) == expected
+
+
+def test_compaction_keeps_every_record(query, session):
+    load(query)
+    query("COMPACT t")
+    with open("test_db/t.log") as file:
+        assert [json.loads(line)["op"] for line in file] == ["base"]  # Only the LSN the snapshot was taken at
+    query("INSERT INTO t n=5 v=c")
+    assert records(session()) == [(0, "a"), (1, "b"), (3, "a"), (4, "a"), (5, "c")]
+
+
+def test_long_logs_are_compacted(query, session, monkeypatch):
+    monkeypatch.setattr(Collection, "COMPACT_MIN_ENTRIES", 10)
+    load(query)
+    for step in range(30):
+        query(f"UPDATE t SET v=s{step} WHERE n=3")
+    with open("test_db/t.log") as file:
+        assert len(file.readlines()) <= 10  # Rewritten into the snapshot once past 10 entries
+    assert records(session()) == [(0, "a"), (1, "b"), (3, "s29"), (4, "a")]
+
+
+def test_torn_log_tail_is_dropped(query, session):
+    load(query)
+    with open("test_db/t.log", "a") as file:
+        file.write('{"op": "put", "id": "torn", "doc": {"n": 10')  # A crash mid-append
+    reopened = session()
+    assert len(records(reopened)) == 4
+    reopened("INSERT INTO t n=5 v=c")  # Appends after the cut, not onto the torn line
+    assert len(records(session())) == 5
+
+
+def test_renames_keep_the_index_files_in_use(query, session):
+    load(query)
+    query("CREATE INDEX idx_v ON t (v)")
+    query("RENAME COLLECTION t TO u")
+    query("INSERT INTO u n=7 v=b")
+    query.dbms.flush()
+    assert sorted(os.listdir("test_db")) == ["database.json", "u.json", "u.log", "u_indexes.json", "u_v_index.json"]
+
+    query("RENAME DATABASE test_db TO other_db")
+    query("USE DATABASE other_db")
+    query("DELETE FROM u WHERE n=1")
+    query.dbms.flush()
+    with open("other_db/u_v_index.json") as file:
+        assert json.load(file)["lsn"] == query.dbms.databases["other_db"].get_collection("u").lsn
+    reopened = session("other_db")
+    assert sorted(record["n"] for record in reopened("SHOW u RECORDS WHERE v=b")["records"]) == [7]
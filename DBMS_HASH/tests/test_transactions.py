@@ -0,0 +1,115 @@
+import glob
+
+import pytest
+
+
+def records(query, condition=""):
+    where = f" WHERE {condition}" if condition else ""
+    return sorted((record["n"], record.get("v")) for record in query(f"SHOW t RECORDS{where}")["records"])
+
+
+@pytest.fixture
+def loaded(query):
+    query("CREATE COLLECTION t")
+    query("INSERT MANY INTO t " + " ".join(f"(n={i} v={i % 5})" for i in range(100)))
+    query("CREATE INDEX idx_v ON t (v)")
+    return query
+
+
+def test_rollback_restores_memory_and_disk(loaded, session):
+    before = records(loaded)
+    loaded("BEGIN")
+    loaded("INSERT INTO t n=1000 v=9")
+    loaded("INSERT MANY INTO t (n=1001 v=9) (n=1002 v=1)")
+    loaded("UPDATE t SET v=7 WHERE n<10")
+    loaded("DELETE FROM t WHERE v=3")
+    assert records(loaded) != before
+    loaded("ROLLBACK")
+
+    assert records(loaded) == before
+    assert records(loaded, "v=1") == [(n, 1) for n in range(1, 100, 5)]
+    assert not records(loaded, "v=7") and not records(loaded, "v=9")
+    reopened = session()
+    assert records(reopened) == before
+    assert records(reopened, "v=3") == [(n, 3) for n in range(3, 100, 5)]
+
+
+def test_commit_survives_a_reopen(loaded, session):
+    loaded("BEGIN")
+    loaded("UPDATE t SET v=7 WHERE n<10")
+    loaded("DELETE FROM t WHERE n>=90")
+    loaded("COMMIT")
+    expected = records(loaded)
+    assert len(expected) == 90
+    assert records(session()) == expected
+
+
+def test_transaction_writes_are_invisible_until_commit(loaded, session):
+    loaded("BEGIN")
+    loaded("UPDATE t SET v=7 WHERE n<10")
+    assert not records(session(), "v=7")  # Still only buffered in memory
+    loaded("COMMIT")
+    assert len(records(session(), "v=7")) == 10
+
+
+def test_cursor_reads_the_snapshot_it_was_declared_at(loaded):
+    loaded("DECLARE c CURSOR FOR SHOW t RECORDS WHERE n<20")
+    first = loaded("FETCH NEXT 5 FROM c")["records"]
+    loaded("UPDATE t SET v=7 WHERE n<20")
+    loaded("DELETE FROM t WHERE n>=10")
+    loaded("INSERT INTO t n=5 v=8")
+    rest = loaded("FETCH NEXT 100 FROM c")["records"]
+    seen = sorted((record["n"], record["v"]) for record in first + rest)
+    assert seen == [(n, n % 5) for n in range(20)]
+    assert records(loaded) == sorted([(n, 7) for n in range(10)] + [(5, 8)])
+    loaded("CLOSE c")
+
+
+def test_failed_batch_insert_inserts_nothing(query, session):
+    query("CREATE COLLECTION t (n int, v int)")
+    query("INSERT INTO t n=0 v=0")
+    query("CREATE INDEX idx_v ON t (v)")
+    with pytest.raises(ValueError):
+        query("INSERT MANY INTO t (n=1 v=1) (n=2 v=2) (n=3 v=abc) (n=4 v=4)")
+    collection = query.dbms.get_current_database().get_collection("t")
+    with pytest.raises(ValueError):
+        collection.insert_many([{"n": 1, "v": 1}, {"n": 2, "v": "abc"}])  # Outside any statement's undo
+    query("INSERT INTO t n=5 v=5")  # Would commit anything the failed batches left behind
+    assert records(query) == [(0, 0), (5, 5)]
+    assert records(query, "v>0") == [(5, 5)]
+    assert records(session()) == [(0, 0), (5, 5)]
+
+
+def test_a_commit_that_fails_to_log_releases_its_locks_and_keeps_its_journal(loaded, session, monkeypatch):
+    manager = loaded.dbms.transaction_manager
+    collection = loaded.dbms.get_current_database().get_collection("t")
+    loaded("BEGIN")
+    loaded("UPDATE t SET v=7 WHERE n<10")
+
+    def fail(entries, txn=None):
+        raise OSError("disk full")
+    monkeypatch.setattr(collection, "_append_log", fail)
+    with pytest.raises(OSError):
+        loaded("COMMIT")
+    assert not manager.transaction_active
+    assert collection.write_lock.owner is None
+    assert glob.glob(manager.journal_pattern)  # The transaction counts as committed
+    assert len(records(loaded, "v=7")) == 10
+    assert len(records(session(), "v=7")) == 10  # recover() wrote the log from the journal
+    assert not glob.glob(manager.journal_pattern)
+
+
+def test_a_commit_that_fails_to_journal_rolls_back(loaded, session, monkeypatch):
+    manager = loaded.dbms.transaction_manager
+    loaded("BEGIN")
+    loaded("UPDATE t SET v=7 WHERE n<10")
+
+    def fail(data):
+        raise OSError("disk full")
+    monkeypatch.setattr(manager, "_write_journal", fail)
+    with pytest.raises(OSError):
+        loaded("COMMIT")
+    assert not manager.transaction_active
+    assert not records(loaded, "v=7")
+    loaded("UPDATE t SET v=8 WHERE n=0")  # Not held up by the failed transaction
+    assert records(session(), "v=8") == [(0, 8)]